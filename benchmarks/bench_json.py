@@ -0,0 +1,104 @@
+"""
+Benchmark of `get_json_list_by_file` and `iter_json_list_by_file` against the previous `json.load(open(file_name))`, or
+`json.loads` of every line for JSON Lines. It generates a roster by `roster_generator` with a fixed seed in both
+formats, and reports the best time of every loader, the speedup of `JSON_BACKEND`, and the peak memory traced by
+`tracemalloc` with and without `use_mmap`. `iter_json_list_by_file` is the one used by the loaders of
+`employee_service`, so its speedup is the one seen by `get_employee_list`.
+
+    python3 benchmarks/bench_json.py --size 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from bench_load import get_roster_file_name  # noqa: E402
+from utils import JSON_BACKEND, RESOURCES_DIR, get_json_list_by_file, iter_json_list_by_file  # noqa: E402
+
+
+def load_by_stdlib(file_name: str):
+    with open(RESOURCES_DIR + file_name, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def load_lines_by_stdlib(file_name: str):
+    with open(RESOURCES_DIR + file_name, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def load_by_stream(file_name: str):
+    return list(iter_json_list_by_file(file_name))
+
+
+def measure(load, file_name: str, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        load(file_name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def trace_peak_bytes(load, file_name: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    load(file_name)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak_bytes
+
+
+def load_by_mmap(file_name: str):
+    return get_json_list_by_file(file_name, use_mmap=True)
+
+
+def load_by_read(file_name: str):
+    return get_json_list_by_file(file_name, use_mmap=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000000, help='number of employees')
+    parser.add_argument('--shape', default='balanced', help='shape of the hierarchy, see roster_generator')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the roster generator')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    file_name = get_roster_file_name(args.size, args.shape, 8, args.seed, 'json')
+    lines_file_name = get_roster_file_name(args.size, args.shape, 8, args.seed, 'jsonl')
+    assert get_json_list_by_file(file_name) == load_by_stdlib(file_name) == load_by_stream(file_name)
+    assert load_by_stream(lines_file_name) == load_lines_by_stdlib(lines_file_name)
+
+    stdlib_seconds = measure(load_by_stdlib, file_name, args.repeat)
+    backend_seconds = measure(load_by_read, file_name, args.repeat)
+    stream_seconds = measure(load_by_stream, file_name, args.repeat)
+    lines_stdlib_seconds = measure(load_lines_by_stdlib, lines_file_name, args.repeat)
+    lines_stream_seconds = measure(load_by_stream, lines_file_name, args.repeat)
+    result = {
+        'size': args.size,
+        'backend': JSON_BACKEND,
+        'json_seconds': stdlib_seconds,
+        'backend_seconds': backend_seconds,
+        'mmap_seconds': measure(load_by_mmap, file_name, args.repeat),
+        'speedup': stdlib_seconds / backend_seconds,
+        'stream_seconds': stream_seconds,
+        'stream_speedup': stdlib_seconds / stream_seconds,
+        'json_lines_seconds': lines_stdlib_seconds,
+        'json_lines_stream_seconds': lines_stream_seconds,
+        'json_lines_speedup': lines_stdlib_seconds / lines_stream_seconds,
+        'json_peak_bytes': trace_peak_bytes(load_by_stdlib, file_name),
+        'backend_peak_bytes': trace_peak_bytes(load_by_read, file_name),
+        'mmap_peak_bytes': trace_peak_bytes(load_by_mmap, file_name),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
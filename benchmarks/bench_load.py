@@ -0,0 +1,224 @@
+"""
+Stage-by-stage benchmark of the load path. For every combination of size and shape, it generates a roster by
+`roster_generator` with a fixed seed, and measures the stages of `get_employee_list` separately:
+
+    - read: `iter_json_list_by_file`, the reader of `get_employee_list` for both formats
+    - validate: `iter_employee_json`
+    - dedupe: the duplicate id check of the `EmployeeJson` dict
+    - hierarchy: `validate_hierarchy`
+    - map: `EmployeeMapper.map_to_employee_list`
+    - sort: `sort_employee_list`
+    - total_salary: `get_total_salary`
+    - end_to_end: `get_employee_list` as a whole
+
+The time of a stage is the best of `--repeat` runs. The peak memory of a stage is traced by `tracemalloc` in another
+run, since tracing slows everything down. The results are written as json, and `--baseline` compares them with the
+output of a previous run, the exit code is 1 if any stage is slower than the baseline by more than `--tolerance`.
+
+    python3 benchmarks/bench_load.py --size 1000 100000 --shape flat balanced deep --output results.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from roster_generator import FORMATS, SHAPES, write_roster  # noqa: E402
+from conf.employee_definition import iter_employee_json  # noqa: E402
+from service.employee_service import (EmployeeMapper, get_employee_list, get_total_salary,  # noqa: E402
+                                      sort_employee_list)
+from service.hierarchy_validator import validate_hierarchy  # noqa: E402
+from utils import CACHE_DIR, RESOURCES_DIR, iter_json_list_by_file  # noqa: E402
+
+ROSTER_DIR = os.path.join(CACHE_DIR, 'benchmarks')
+STAGES = ('read', 'validate', 'dedupe', 'hierarchy', 'map', 'sort', 'total_salary', 'end_to_end')
+
+
+def get_roster_file_name(size: int, shape: str, fan_out: int, seed: int, output_format: str) -> str:
+    """
+    Generate the roster once and reuse it in later runs.
+
+    :return: file name relative to `/resources/` path, which is what the loaders expect
+    """
+    os.makedirs(ROSTER_DIR, exist_ok=True)
+    path = os.path.join(ROSTER_DIR, f"roster-{shape}-{size}-{fan_out}-{seed}.{output_format}")
+    if not os.path.exists(path):
+        temp_path = path + '.tmp'
+        write_roster(temp_path, size, shape, fan_out, seed, output_format)
+        os.replace(temp_path, path)
+    return os.path.relpath(path, RESOURCES_DIR)
+
+
+def run_stages(file_name: str, measure: Callable[[str, Callable], object]):
+    """
+    Run the stages of `get_employee_list` one by one, every stage is wrapped by `measure`.
+
+    :param file_name: file name relative to `/resources/` path
+    :param measure: takes the stage name and the stage function, returns the result of the function
+    :return: None
+    """
+    # the same reader as `get_employee_list`, for both json arrays and JSON Lines
+    record_list = measure('read', lambda: list(iter_json_list_by_file(file_name)))
+    employee_json_list = measure('validate', lambda: list(iter_employee_json(record_list)))
+    del record_list
+
+    def dedupe():
+        employee_json_dict = {}
+        for employee_json in employee_json_list:
+            if employee_json.get_id() in employee_json_dict:
+                raise ValueError(f"found duplicate id: {employee_json.get_id()}")
+            employee_json_dict[employee_json.get_id()] = employee_json
+        return employee_json_dict
+
+    employee_json_dict = measure('dedupe', dedupe)
+    del employee_json_list
+
+    def get_manager_id(eid: int) -> Optional[int]:
+        manager_id = employee_json_dict[eid].get_manager()
+        return manager_id if manager_id and manager_id in employee_json_dict else None
+
+    measure('hierarchy', lambda: validate_hierarchy(employee_json_dict, get_manager_id))
+    employee_list = measure('map', lambda: EmployeeMapper().map_to_employee_list(employee_json_dict))
+    del employee_json_dict
+
+    measure('sort', lambda: sort_employee_list(employee_list))
+    measure('total_salary', lambda: get_total_salary(employee_list))
+    del employee_list
+
+    measure('end_to_end', lambda: get_employee_list(file_name))
+
+
+def time_stages(file_name: str, repeat: int) -> Dict[str, float]:
+    seconds = {}
+
+    def measure(stage: str, function: Callable):
+        gc.collect()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        seconds[stage] = min(elapsed, seconds.get(stage, elapsed))
+        return result
+
+    for _ in range(repeat):
+        run_stages(file_name, measure)
+    return seconds
+
+
+def trace_stages(file_name: str) -> Dict[str, int]:
+    """
+    :return: the peak of the bytes allocated by every stage on top of what's already allocated before the stage
+    """
+    peak_bytes = {}
+
+    def measure(stage: str, function: Callable):
+        gc.collect()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = function()
+        _, stage_peak_bytes = tracemalloc.get_traced_memory()
+        peak_bytes[stage] = stage_peak_bytes - start_bytes
+        return result
+
+    tracemalloc.start()
+    try:
+        run_stages(file_name, measure)
+    finally:
+        tracemalloc.stop()
+    return peak_bytes
+
+
+def get_metadata() -> dict:
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        revision = None
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'revision': revision,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+
+
+def find_regressions(result_list: list, baseline_list: list, tolerance: float) -> list:
+    """
+    :return: messages of the stages slower than the same stage of the same roster in the baseline
+    """
+    baseline_dict = {_get_roster_key(result): result for result in baseline_list}
+    message_list = []
+    for result in result_list:
+        baseline = baseline_dict.get(_get_roster_key(result))
+        if not baseline:
+            continue
+        for stage, seconds in result['seconds'].items():
+            baseline_seconds = baseline['seconds'].get(stage)
+            if baseline_seconds and seconds > baseline_seconds * (1 + tolerance):
+                message_list.append(f"{stage} of {result['shape']} roster of {result['size']} employees: "
+                                    f"{baseline_seconds:.4f}s -> {seconds:.4f}s")
+    return message_list
+
+
+def _get_roster_key(result: dict) -> tuple:
+    return result['size'], result['shape'], result['fan_out'], result['seed'], result['format']
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, nargs='+', default=[1000, 100000], help='numbers of employees')
+    parser.add_argument('--shape', choices=SHAPES, nargs='+', default=['flat', 'balanced', 'deep'],
+                        help='shapes of the hierarchy')
+    parser.add_argument('--fan-out', type=int, default=8, help='average number of members of the balanced shape')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the roster generator')
+    parser.add_argument('--format', choices=FORMATS, default='json', help='format of the roster files')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs, the best one is reported')
+    parser.add_argument('--no-memory', action='store_true', help='skip the traced run of peak memory')
+    parser.add_argument('--output', help='path of the json results, stdout by default')
+    parser.add_argument('--baseline', help='path of the json results of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown ratio against the baseline')
+    args = parser.parse_args()
+
+    result_list = []
+    for size in args.size:
+        for shape in args.shape:
+            file_name = get_roster_file_name(size, shape, args.fan_out, args.seed, args.format)
+            result = {
+                'size': size,
+                'shape': shape,
+                'fan_out': args.fan_out,
+                'seed': args.seed,
+                'format': args.format,
+                'seconds': time_stages(file_name, args.repeat),
+            }
+            if not args.no_memory:
+                result['peak_bytes'] = trace_stages(file_name)
+            result_list.append(result)
+            print(f"{shape} roster of {size} employees: {result['seconds']['end_to_end']:.4f}s", file=sys.stderr)
+
+    output = json.dumps({'metadata': get_metadata(), 'results': result_list}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            message_list = find_regressions(result_list, json.load(file)['results'], args.tolerance)
+        for message in message_list:
+            print(f"regression: {message}", file=sys.stderr)
+        return 1 if message_list else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
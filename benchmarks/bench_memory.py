@@ -0,0 +1,80 @@
+"""
+Memory benchmark of a loaded hierarchy. It generates a roster with a fixed seed, maps it by `EmployeeMapper` to
+`Employee` and `Manager` instances and to `EmployeeTable`, and reports the bytes per employee traced by `tracemalloc`.
+The records are generated before tracing starts, so only the hierarchy itself is counted.
+
+    python3 benchmarks/bench_memory.py --size 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from collections import namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from service.employee_service import EmployeeMapper  # noqa: E402
+
+FIRST_NAMES = ('Allen', 'Bill', 'Carter', 'Dave', 'Eureka', 'Fox', 'Jeff', 'Joy', 'Michael', 'Peter', 'Ted')
+
+
+class _Record(namedtuple('_Record', 'id first_name manager salary')):
+    """
+    A light-weight stand-in of `EmployeeJson` with the same getters, so the generated roster doesn't cost the memory of
+    pydantic models.
+    """
+    __slots__ = ()
+
+    def get_id(self):
+        return self.id
+
+    def get_first_name(self):
+        return self.first_name
+
+    def get_manager(self):
+        return self.manager
+
+    def get_salary(self):
+        return self.salary
+
+
+def generate_records(size: int, seed: int) -> dict:
+    randomizer = random.Random(seed)
+    return {
+        eid: _Record(eid, randomizer.choice(FIRST_NAMES), randomizer.randrange(1, eid) if eid > 1 else None,
+                     randomizer.randrange(10000, 200000))
+        for eid in range(1, size + 1)
+    }
+
+
+def measure(build, size: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    traced_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return traced_bytes / size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000000, help='number of employees')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the roster generator')
+    args = parser.parse_args()
+
+    records = generate_records(args.size, args.seed)
+    result = {
+        'size': args.size,
+        'employee_bytes_per_employee': measure(lambda: EmployeeMapper().map_to_employee_list(records), args.size),
+        'table_bytes_per_employee': measure(lambda: EmployeeMapper().map_to_employee_table(records), args.size),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
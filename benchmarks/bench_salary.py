@@ -0,0 +1,132 @@
+"""
+Benchmark of `SalaryAnalytics` against Python loops over the `Employee` list. It generates a roster by
+`roster_generator` with a fixed seed, loads it by `get_employee_list` and `get_employee_table`, and reports the best
+time of every way to get the same numbers:
+
+    - total: `get_total_salary`, against `SalaryAnalytics.get_total_salary` of the prepared arrays
+    - grouped: the statistics by manager and by depth, grouped in dicts and sorted per group in Python, against
+      `get_stats_by_manager` and `get_stats_by_depth`
+    - from_list and from_table: the time to pull the arrays out of the `Employee` list or the `EmployeeTable`
+
+    python3 benchmarks/bench_salary.py --size 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from bench_load import get_roster_file_name  # noqa: E402
+from service.employee_service import get_employee_list, get_employee_table, get_total_salary  # noqa: E402
+from service.salary_analytics import DEFAULT_PERCENTILES, SalaryAnalytics  # noqa: E402
+
+
+def measure(function: Callable, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def get_stats_by_loop(employee_list: List, get_key: Callable) -> Dict[int, tuple]:
+    """
+    :return: headcount, missing count, total, mean and percentiles by the key of every employee with a key
+    """
+    salary_list_dict: Dict[int, list] = {}
+    for employee in employee_list:
+        key = get_key(employee)
+        if key is not None:
+            salary_list_dict.setdefault(key, []).append(employee.get_salary())
+
+    stats_dict = {}
+    for key, salary_list in salary_list_dict.items():
+        present_list = sorted(salary for salary in salary_list if salary is not None)
+        percentile_list = []
+        for percentile in DEFAULT_PERCENTILES:
+            if not present_list:
+                percentile_list.append(None)
+                continue
+            position = (len(present_list) - 1) * percentile / 100
+            lower, upper = int(position), min(int(position) + 1, len(present_list) - 1)
+            percentile_list.append(present_list[lower]
+                                   + (present_list[upper] - present_list[lower]) * (position - lower))
+        stats_dict[key] = (len(salary_list), len(salary_list) - len(present_list), sum(present_list),
+                           sum(present_list) / len(present_list) if present_list else None, percentile_list)
+    return stats_dict
+
+
+def get_stats_by_manager_loop(employee_list: List) -> Dict[int, tuple]:
+    return get_stats_by_loop(employee_list, lambda e: e.get_manager().get_eid() if e.get_manager() else None)
+
+
+def get_stats_by_depth_loop(employee_list: List) -> Dict[int, tuple]:
+    depth_dict = {}
+
+    def get_depth(employee) -> int:
+        # walk up to the first manager whose depth is known, and fill in the chain on the way back
+        chain = []
+        while employee is not None and employee.get_eid() not in depth_dict:
+            chain.append(employee)
+            employee = employee.get_manager()
+        depth = depth_dict[employee.get_eid()] if employee is not None else -1
+        for member in reversed(chain):
+            depth += 1
+            depth_dict[member.get_eid()] = depth
+        return depth_dict[chain[0].get_eid()] if chain else depth
+
+    return get_stats_by_loop(employee_list, get_depth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000000, help='number of employees')
+    parser.add_argument('--shape', default='balanced', help='shape of the hierarchy, see roster_generator')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the roster generator')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    file_name = get_roster_file_name(args.size, args.shape, 8, args.seed, 'json')
+    employee_list = get_employee_list(file_name)
+    employee_table = get_employee_table(file_name)
+    salary_analytics = SalaryAnalytics.from_employee_table(employee_table)
+    assert salary_analytics.get_total_salary() == get_total_salary(employee_list)
+    for stats, stats_dict in ((salary_analytics.get_stats_by_manager(), get_stats_by_manager_loop(employee_list)),
+                              (salary_analytics.get_stats_by_depth(), get_stats_by_depth_loop(employee_list))):
+        assert dict(zip(stats.get_keys().tolist(), stats.get_totals().tolist())) == \
+               {key: value[2] for key, value in stats_dict.items()}
+
+    def get_stats_by_vector():
+        # the depths are cached by the instance, a new one is created every time to measure them as well
+        analytics = SalaryAnalytics.from_employee_table(employee_table)
+        return analytics.get_stats_by_manager(), analytics.get_stats_by_depth()
+
+    total_seconds = measure(lambda: get_total_salary(employee_list), args.repeat)
+    vector_total_seconds = measure(salary_analytics.get_total_salary, args.repeat)
+    grouped_seconds = measure(lambda: (get_stats_by_manager_loop(employee_list),
+                                       get_stats_by_depth_loop(employee_list)), args.repeat)
+    vector_grouped_seconds = measure(get_stats_by_vector, args.repeat)
+    result = {
+        'size': args.size,
+        'shape': args.shape,
+        'total_seconds': total_seconds,
+        'vector_total_seconds': vector_total_seconds,
+        'total_speedup': total_seconds / vector_total_seconds,
+        'grouped_seconds': grouped_seconds,
+        'vector_grouped_seconds': vector_grouped_seconds,
+        'grouped_speedup': grouped_seconds / vector_grouped_seconds,
+        'from_list_seconds': measure(lambda: SalaryAnalytics.from_employee_list(employee_list), args.repeat),
+        'from_table_seconds': measure(lambda: SalaryAnalytics.from_employee_table(employee_table), args.repeat),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Seeded generator of synthetic rosters for the benchmarks. The same size, shape, fan-out and seed always produce the same
+roster, so results from different versions are comparable. The shapes of the hierarchy are:
+
+    - flat: one employee without a manager, and all the others report to it
+    - balanced: managers are filled breadth-first, each one gets a random number of members around `fan_out`
+    - deep: one reporting chain, every employee is managed by the previous one
+    - random: every employee is managed by a random employee with a smaller id
+
+    python3 benchmarks/roster_generator.py --size 100000 --shape balanced --output roster.json
+"""
+import argparse
+import json
+import random
+from collections import deque
+from typing import Iterator
+
+SHAPES = ('flat', 'balanced', 'deep', 'random')
+FORMATS = ('json', 'jsonl')
+
+_SYLLABLES = ('al', 'an', 'bel', 'car', 'da', 'el', 'fin', 'jo', 'ka', 'li', 'mar', 'ne', 'ol', 'pe', 'ra', 'sa',
+              'te', 'vi', 'wen', 'zo')
+
+
+def get_first_names(count: int, seed: int) -> list:
+    """
+    :param count: number of names
+    :param seed: seed of the names
+    :return: distinct capitalized names made of english letters only, so they pass `EmployeeJson` validation
+    """
+    randomizer = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        names.add(''.join(randomizer.choice(_SYLLABLES) for _ in range(randomizer.randint(2, 4))).capitalize())
+    return sorted(names)
+
+
+def generate_roster(size: int, shape: str = 'balanced', fan_out: int = 8, seed: int = 0) -> Iterator[dict]:
+    """
+    Generate the json records of a valid roster, ids are from 1 to `size` and the employee with id 1 is the only one
+    without a manager.
+
+    :param size: number of employees
+    :param shape: one of `SHAPES`
+    :param fan_out: average number of members of a manager for the balanced shape
+    :param seed: seed of the generator
+    :return: iterator of json records in the format of `EmployeeJson`
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"unknown shape: {shape}")
+    if fan_out < 1:
+        raise ValueError(f"fan_out must be positive: {fan_out}")
+
+    randomizer = random.Random(seed)
+    first_names = get_first_names(1000, seed)
+    manager_queue = deque([1])
+    remaining_members = randomizer.randint(1, 2 * fan_out - 1)
+
+    for eid in range(1, size + 1):
+        if eid == 1:
+            manager = None
+        elif shape == 'flat':
+            manager = 1
+        elif shape == 'deep':
+            manager = eid - 1
+        elif shape == 'random':
+            manager = randomizer.randrange(1, eid)
+        else:
+            if not remaining_members:
+                manager_queue.popleft()
+                remaining_members = randomizer.randint(1, 2 * fan_out - 1)
+            manager = manager_queue[0]
+            manager_queue.append(eid)
+            remaining_members -= 1
+
+        yield {
+            'id': eid,
+            'first_name': randomizer.choice(first_names),
+            'manager': manager,
+            'salary': randomizer.randrange(10000, 200000),
+        }
+
+
+def write_roster(path: str, size: int, shape: str = 'balanced', fan_out: int = 8, seed: int = 0,
+                 output_format: str = 'json'):
+    """
+    Write the roster of `generate_roster` to the input path one record at a time, so even 10M employees don't have to
+    fit in memory.
+
+    :param path: output path
+    :param output_format: `json` for a top-level json array, `jsonl` for JSON Lines
+    :return: None
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"unknown format: {output_format}")
+
+    with open(path, 'w', encoding='utf-8') as file:
+        if output_format == 'json':
+            file.write('[\n')
+        for index, record in enumerate(generate_roster(size, shape, fan_out, seed)):
+            if output_format == 'json' and index:
+                file.write(',\n')
+            file.write(json.dumps(record))
+            if output_format == 'jsonl':
+                file.write('\n')
+        if output_format == 'json':
+            file.write('\n]\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000, help='number of employees')
+    parser.add_argument('--shape', choices=SHAPES, default='balanced', help='shape of the hierarchy')
+    parser.add_argument('--fan-out', type=int, default=8, help='average number of members of the balanced shape')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generator')
+    parser.add_argument('--format', choices=FORMATS, default='json', help='format of the output file')
+    parser.add_argument('--output', required=True, help='output path')
+    args = parser.parse_args()
+
+    write_roster(args.output, args.size, args.shape, args.fan_out, args.seed, args.format)
+
+
+if __name__ == '__main__':
+    main()
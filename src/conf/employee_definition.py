@@ -1,21 +1,31 @@
 import re
 from abc import abstractmethod, ABC
-from typing import List, Optional
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from pydantic import BaseModel, validator
 
+from conf.name_table import name_table
+
 pattern = re.compile("[A-Za-z]+")
+# `pattern` repeated over names joined by a line feed, it validates a whole column of names in one sweep
+batch_pattern = re.compile("[A-Za-z]+(?:\n[A-Za-z]+)*")
+
+VALIDATION_BATCH_SIZE = 10000
 
 
 class EmployeeBase(ABC):
     """
     This abstract class defines some intrinsic fields, like `eid`, `first_name`. In general, all the employees will
-    have these fields. The only abstract method is `print_info`.
+    have these fields. The only abstract method is `print_info`. All the classes in the hierarchy declare their fields
+    in `__slots__`, so the instances don't allocate a `__dict__`. `first_name` is interned to `name_table`, so the
+    employees named the same share one string.
     """
+    __slots__ = ('_eid', '_first_name')
 
     def __init__(self, eid: int, first_name: str):
         self._eid = eid
-        self._first_name = first_name
+        self._first_name = name_table.intern(first_name)
 
     def get_eid(self):
         return self._eid
@@ -36,8 +46,14 @@ class Employee(EmployeeBase):
     """
     This class extends `EmployeeBase` and has two more fields, `salary` and `manager`. If an employee has to set up
     a manager, invoke `set_manager` to bind the relation, `set_manager` will invoke `Manager.register(Employee)` as well
-    . About `Manager.register(Employee)`, the input employee will be regarded as one of the members of the Manager.
+    . About `Manager.register(Employee)`, the input employee will be regarded as one of the members of the Manager. If
+    the employee has had another manager, it'll be unregistered from the previous one, `remove_manager` unbinds the
+    relation.
+
+    The slots of `Manager` are declared here as well and left unset for an `Employee`, so `Employee` and `Manager`
+    share the same memory layout.
     """
+    __slots__ = ('_salary', '_manager', '_member_dict', '_sorted_member_list')
 
     def __init__(self, eid: int, first_name: str, salary: int):
         super(Employee, self).__init__(eid, first_name)
@@ -53,9 +69,36 @@ class Employee(EmployeeBase):
     def set_manager(self, manager: 'Manager'):
         if not manager:
             raise ValueError('manager shouldn\'t be None')
+        if self._manager is manager:
+            # registered already, the order among the members with the same first_name is kept
+            return
+        if self._manager is not None:
+            self._manager.unregister(self)
         self._manager = manager
         manager.register(self)
 
+    def remove_manager(self):
+        if self._manager is not None:
+            self._manager.unregister(self)
+            self._manager = None
+
+    def update(self, first_name: str, salary: int):
+        """
+        Update `first_name` and `salary` in place. Only if `first_name` is changed, it registers to the `Manager`
+        again, since the order of the members might be changed, and it's moved after the members with the same
+        first_name, so the ties among the renamed members follow the order of the delta. A salary change keeps the
+        order of the members as it is.
+
+        :param first_name: new first_name
+        :param salary: new salary
+        :return: None
+        """
+        is_renamed = first_name != self._first_name
+        self._first_name = name_table.intern(first_name)
+        self._salary = salary
+        if is_renamed and self._manager is not None:
+            self._manager.register(self)
+
     def has_manager(self):
         return self._manager is not None
 
@@ -66,9 +109,11 @@ class Employee(EmployeeBase):
 
 class Manager(Employee):
     """
-    This class extends `Employee` and has one more field, `_member_list`. `register` allows to add the input
-    `Employee` to be one of the members it has.
+    This class extends `Employee` and has one more field, `_member_dict`, the key would be id, value would be the
+    member. `register` allows to add the input `Employee` to be one of the members it has. The sorted result of
+    `get_member_list` is cached in `_sorted_member_list` until the next `register`.
     """
+    __slots__ = ()
 
     def __init__(self, employee: Employee):
         """
@@ -79,43 +124,90 @@ class Manager(Employee):
         :param employee:  reference for the `Manager`
         """
         super().__init__(employee.get_eid(), employee.get_first_name(), employee.get_salary())
-        self._member_list: List[Employee] = []
+        self._member_dict: Dict[int, Employee] = {}
+        self._sorted_member_list: Optional[List[Employee]] = None
 
         if employee.has_manager():
             manager = employee.get_manager()
             self.set_manager(manager)
 
+    @classmethod
+    def promote(cls, employee: Employee) -> 'Manager':
+        """
+        Unlike `__init__`, it turns the input `Employee` itself into a `Manager`. Since `Employee` and `Manager` share
+        the same memory layout, only the class of the instance is switched and the member fields are initialized, so
+        nothing is copied, the identity is preserved and the instance stays registered to its own `Manager` as it is.
+        The input is returned as it is if it's already a `Manager`.
+
+        :param employee: the `Employee` to be promoted
+        :return: the same instance as a `Manager`
+        """
+        if type(employee) is not cls:
+            employee.__class__ = cls
+            employee._member_dict = {}
+            employee._sorted_member_list = None
+
+        return employee
+
+    @classmethod
+    def demote(cls, manager: 'Manager') -> Employee:
+        """
+        The reverse of `promote`, it turns the input `Manager` itself back into an `Employee` in place. It's only
+        allowed if the `Manager` doesn't have any member.
+
+        :param manager: the `Manager` to be demoted
+        :return: the same instance as an `Employee`
+        """
+        if manager.has_members():
+            raise ValueError(f"manager still has members: {manager.get_eid()}")
+
+        del manager._member_dict
+        del manager._sorted_member_list
+        manager.__class__ = Employee
+        return manager
+
     def register(self, member: Employee):
         """
         Assume an `Employee` suddenly has a new identity, it has to manage a new member, so the `Employee` should be
         a `Manager`. But the new `Manager` might have a `Manager` already. During the construction time in `__init__`,
         the new `Manager` will invoke `set_manager`, then here comes a problem, **duplicate register** to the same
-        `Manager`. To deal with this case, before the input `Employee` add to the `_member_list`, it'll scan the current
-        `_member_list` to check if there's the same id exists in the list. If so, remove the instance. Lastly, the input
-        `Employee` will be added to the `_member_list`.
+        `Manager`. To deal with this case, `_member_dict` is keyed by id, if the same id exists in the dict, the
+        instance is removed in constant time. Lastly, the input `Employee` will be added to the end of `_member_dict`.
 
         :param member: the input Employee is one of the members the manager has
         :return: None
         """
 
-        for m in self._member_list:
-            if m.get_eid() == member.get_eid():
-                self._member_list.remove(m)
-                break
+        self._member_dict.pop(member.get_eid(), None)
+        self._member_dict[member.get_eid()] = member
+        self._sorted_member_list = None
+
+    def unregister(self, member: Employee):
+        """
+        Remove the input `Employee` from the members, it's ignored if the id isn't one of the members.
+
+        :param member: one of the members the manager has
+        :return: None
+        """
+        if self._member_dict.pop(member.get_eid(), None) is not None:
+            self._sorted_member_list = None
 
-        self._member_list.append(member)
+    def has_members(self):
+        return bool(self._member_dict)
 
     def get_member_list(self) -> List['Employee']:
-        if self._member_list:
-            # Based on the requirement, here will sort the members by their `first_name` before it returns
-            self._member_list.sort(key=lambda e: e.get_first_name())
+        if self._sorted_member_list is None:
+            # Based on the requirement, here will sort the members by their `first_name` before it returns, the names
+            # are interned, so their ranks in `name_table` are compared instead of the strings
+            rank_dict = name_table.get_rank_dict()
+            self._sorted_member_list = sorted(self._member_dict.values(), key=lambda e: rank_dict[e.get_first_name()])
 
-        return self._member_list
+        return self._sorted_member_list
 
     def print_info(self):  # pragma: no cover
         # just for printing object information, no need to take care about in coverage report
         super().print_info()
-        if self._member_list:
+        if self._member_dict:
             print('Employees of ' + self.get_first_name())
             for member in self.get_member_list():
                 print('\t' + member.get_first_name())
@@ -155,3 +247,75 @@ class EmployeeJson(BaseModel):
 
     def get_salary(self):
         return self.salary
+
+
+def iter_employee_json(employee_json_data_iterable: Iterable[dict],
+                       batch_size: int = VALIDATION_BATCH_SIZE) -> Iterator[EmployeeJson]:
+    """
+    Bulk validation of json records, it's equivalent to `EmployeeJson(**employee_json_data)` for every record, but the
+    records are validated by batch of `batch_size`. In a batch, `id`, `manager` and `salary` are checked column by
+    column with exact `int` types and `first_name` is checked by one `batch_pattern` sweep. The records passed the
+    checks are created like `EmployeeJson.construct`, which skips pydantic validation. The others fall back to
+    `EmployeeJson(**employee_json_data)`, so pydantic coerces them or raises the same `ValidationError` as before. The
+    records are yielded in order, an error is raised only when the invalid record is reached.
+
+    :param employee_json_data_iterable: json records
+    :param batch_size: number of records validated at a time
+    :return: Iterator[EmployeeJson]
+    """
+    iterator = iter(employee_json_data_iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+
+        invalid_indexes = _get_invalid_indexes(batch)
+        if not invalid_indexes:
+            yield from map(_construct_employee_json, batch)
+            continue
+
+        for index, employee_json_data in enumerate(batch):
+            if index in invalid_indexes:
+                yield EmployeeJson(**employee_json_data)
+            else:
+                yield _construct_employee_json(employee_json_data)
+
+
+def _construct_employee_json(employee_json_data: dict) -> EmployeeJson:
+    # the same as `EmployeeJson.construct`, without its generic handling of defaults and aliases
+    employee_json = EmployeeJson.__new__(EmployeeJson)
+    object.__setattr__(employee_json, '__dict__', {
+        'id': employee_json_data['id'],
+        'first_name': employee_json_data['first_name'],
+        'manager': employee_json_data.get('manager'),
+        'salary': employee_json_data.get('salary'),
+    })
+    object.__setattr__(employee_json, '__fields_set__', {'id', 'first_name', 'manager', 'salary'})
+    return employee_json
+
+
+def _get_invalid_indexes(batch: List[dict]) -> set:
+    invalid_indexes = {index for index, data in enumerate(batch) if type(data) is not dict}
+    records = [{} if index in invalid_indexes else data for index, data in enumerate(batch)]
+
+    for index, eid in enumerate([data.get('id') for data in records]):
+        if type(eid) is not int:
+            invalid_indexes.add(index)
+
+    for field in ('manager', 'salary'):
+        for index, value in enumerate([data.get(field) for data in records]):
+            if value is not None and type(value) is not int:
+                invalid_indexes.add(index)
+
+    names = [data.get('first_name') for data in records]
+    for index, name in enumerate(names):
+        if type(name) is not str:
+            invalid_indexes.add(index)
+            names[index] = ''
+
+    joined_names = '\n'.join(names)
+    # a name containing a line feed could pass the sweep, so the number of line feeds has to be checked as well
+    if not (batch_pattern.fullmatch(joined_names) and joined_names.count('\n') == len(names) - 1):
+        invalid_indexes.update(index for index, name in enumerate(names) if not pattern.fullmatch(name))
+
+    return invalid_indexes
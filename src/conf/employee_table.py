@@ -0,0 +1,255 @@
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from conf.name_table import name_table
+
+NO_ROW = -1
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# row count, distinct first_name count and byte length of the encoded first names
+_HEADER = struct.Struct('=qqq')
+
+
+class OutOfRangeError(ValueError):
+    """
+    It's raised if an id or a salary doesn't fit in the signed 64-bit columns of `EmployeeTable`, the roster can still
+    be loaded as `Employee` and `Manager` instances, which don't have the limit.
+    """
+    pass
+
+
+class EmployeeTable:
+    """
+    This class is a columnar alternative to `Employee` and `Manager` instances. Every employee is a row, and the fields
+    are kept in typed arrays instead of per-instance attributes:
+
+        - `_eids`: id of the row
+        - `_manager_rows`: row of the manager, `NO_ROW` if the row doesn't have a manager
+        - `_salaries` and `_has_salaries`: salary of the row, `_has_salaries` tells a salary of 0 from null
+        - `_name_indexes`: index to `_names`, every distinct first_name is stored only once and interned to `name_table`
+        - `_sorted_eids` and `_sorted_rows`: ids in ascending order and their rows, for the lookup by id
+
+    The members of all the managers are stored in one array, `_member_rows`, and the members of row `r` are
+    `_member_rows[_member_offsets[r]:_member_offsets[r + 1]]`, sorted by their `first_name` in advance, and the members
+    with the same first_name in the order of their records, the same as the members of a `Manager`. Use
+    `get_employee` or `get_employee_list` to get `EmployeeView`, which has the same interface as `Employee`.
+
+    `to_bytes` and `from_buffer` convert the table to and from a flat binary format. `from_buffer` doesn't copy the
+    columns, they're `memoryview` of the input buffer, so a table can be loaded from a memory-mapped file.
+    """
+
+    def __init__(self, eids: Sequence[int], first_names: Sequence[str], manager_eids: Sequence[Optional[int]],
+                 salaries: Sequence[Optional[int]], record_positions: Optional[Sequence[int]] = None):
+        """
+        The input sequences are the columns of the rows in order, the row of every manager id in `manager_eids` must be
+        in `eids` as well. The ids and the salaries are stored as signed 64-bit integers, an `OutOfRangeError` is raised
+        if any of them is out of [`INT64_MIN`, `INT64_MAX`], use `Employee` and `Manager` instances for such a roster.
+        The rows might not be in the order of their records, e.g. a manager is mapped on the first reference, so
+        `record_positions` tells the order of the records, which the members with the same first_name are sorted by.
+
+        :param eids: id of every row
+        :param first_names: first_name of every row
+        :param manager_eids: manager id of every row, None if the row doesn't have a manager
+        :param salaries: salary of every row, None is allowed
+        :param record_positions: position of the record of every row in the input, from 0 to the row count - 1, the
+            rows are in the order of their records if None
+        """
+        self._eids = _get_int64_array(eids, 'id')
+        row_dict: Dict[int, int] = {eid: row for row, eid in enumerate(eids)}
+        self._sorted_rows = array('q', sorted(range(len(eids)), key=lambda r: eids[r]))
+        self._sorted_eids = array('q', (eids[row] for row in self._sorted_rows))
+
+        name_index_dict: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._name_indexes = array('i')
+        for first_name in first_names:
+            if first_name not in name_index_dict:
+                name_index_dict[first_name] = len(self._names)
+                self._names.append(name_table.intern(first_name))
+            self._name_indexes.append(name_index_dict[first_name])
+
+        self._manager_rows = array('q', (NO_ROW if eid is None else row_dict[eid] for eid in manager_eids))
+        self._salaries = _get_int64_array([salary or 0 for salary in salaries], 'salary')
+        self._has_salaries = bytearray(salary is not None for salary in salaries)
+        self._build_member_rows(record_positions)
+
+    def _build_member_rows(self, record_positions: Optional[Sequence[int]]):
+        member_counts = [0] * (len(self._eids) + 1)
+        for manager_row in self._manager_rows:
+            if manager_row != NO_ROW:
+                member_counts[manager_row + 1] += 1
+
+        self._member_offsets = array('q', member_counts)
+        for row in range(len(self._eids)):
+            self._member_offsets[row + 1] += self._member_offsets[row]
+
+        # sort the rows by first_name and then the position of their records once, so the members of every manager are
+        # placed in order, both are combined into one int, and the ranks of the interned names are compared instead of
+        # the strings
+        row_count = len(self._eids)
+        rank_dict = name_table.get_rank_dict()
+        name_ranks = [rank_dict[name] * row_count for name in self._names]
+        name_indexes = self._name_indexes
+        if record_positions is None:
+            record_positions = range(row_count)
+        positions = array('q', self._member_offsets[:-1])
+        self._member_rows = array('q', bytes(8 * row_count))
+        for row in sorted(range(row_count), key=lambda r: name_ranks[name_indexes[r]] + record_positions[r]):
+            manager_row = self._manager_rows[row]
+            if manager_row != NO_ROW:
+                self._member_rows[positions[manager_row]] = row
+                positions[manager_row] += 1
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'EmployeeTable':
+        """
+        Load a table from the binary format of `to_bytes`, the buffer has to be kept unchanged as long as the table is
+        in use.
+
+        :param buffer: bytes, mmap or any object supports the buffer protocol
+        :return: EmployeeTable
+        """
+        view = memoryview(buffer)
+        row_count, name_count, names_length = _HEADER.unpack_from(view)
+        offset = _HEADER.size
+
+        def take(type_code, length):
+            nonlocal offset
+            size = length * array(type_code).itemsize
+            column = view[offset:offset + size].cast(type_code)
+            offset += size
+            return column
+
+        table = cls.__new__(cls)
+        table._eids = take('q', row_count)
+        table._sorted_rows = take('q', row_count)
+        table._sorted_eids = take('q', row_count)
+        table._manager_rows = take('q', row_count)
+        table._salaries = take('q', row_count)
+        table._member_offsets = take('q', row_count + 1)
+        table._member_rows = take('q', row_count)
+        name_offsets = take('q', name_count + 1)
+        table._name_indexes = take('i', row_count)
+        table._has_salaries = take('B', row_count)
+
+        names = bytes(take('B', names_length)).decode('utf-8')
+        table._names = [name_table.intern(names[name_offsets[index]:name_offsets[index + 1]])
+                        for index in range(name_count)]
+        return table
+
+    def to_bytes(self) -> bytes:
+        """
+        Convert the table to a flat binary format, a header of the counts followed by the columns in native byte order.
+
+        :return: bytes of the table
+        """
+        name_offsets = array('q', [0])
+        for name in self._names:
+            name_offsets.append(name_offsets[-1] + len(name))
+        names = ''.join(self._names).encode('utf-8')
+
+        chunks = [_HEADER.pack(len(self._eids), len(self._names), len(names))]
+        for column in (self._eids, self._sorted_rows, self._sorted_eids, self._manager_rows, self._salaries,
+                       self._member_offsets, self._member_rows, name_offsets, self._name_indexes, self._has_salaries):
+            chunks.append(bytes(column))
+        chunks.append(names)
+        return b''.join(chunks)
+
+    def __len__(self):
+        return len(self._eids)
+
+    def get_employee(self, eid: int) -> 'EmployeeView':
+        index = bisect_left(self._sorted_eids, eid)
+        if index == len(self._sorted_eids) or self._sorted_eids[index] != eid:
+            raise ValueError(f"can't find the employee with id: {eid}")
+        return EmployeeView(self, self._sorted_rows[index])
+
+    def get_employee_list(self) -> List['EmployeeView']:
+        return [EmployeeView(self, row) for row in range(len(self._eids))]
+
+    def get_total_salary(self) -> int:
+        return sum(self._salaries)
+
+    def get_salary_columns(self) -> Tuple[Sequence[int], Sequence[int], Sequence[int], Sequence[int]]:
+        """
+        The columns of the table as they are, for the analytics which read them in bulk, e.g. by `numpy.frombuffer`.
+        Don't change them.
+
+        :return: ids, manager rows (`NO_ROW` if the row doesn't have a manager), salaries (0 if the salary is null) and
+            whether the salary isn't null, one value per row
+        """
+        return self._eids, self._manager_rows, self._salaries, self._has_salaries
+
+
+class EmployeeView:
+    """
+    A thin view of a row in `EmployeeTable`. It has the same interface as `Employee` and `Manager`, and
+    `get_class_name` tells if the row is a `Manager`, which has at least one member.
+    """
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: EmployeeTable, row: int):
+        self._table = table
+        self._row = row
+
+    def __eq__(self, other):
+        return isinstance(other, EmployeeView) and self._table is other._table and self._row == other._row
+
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+
+    def get_row(self):
+        return self._row
+
+    def get_eid(self):
+        return self._table._eids[self._row]
+
+    def get_first_name(self):
+        return self._table._names[self._table._name_indexes[self._row]]
+
+    def get_salary(self):
+        if self._table._has_salaries[self._row]:
+            return self._table._salaries[self._row]
+        return None
+
+    def get_manager(self) -> Optional['EmployeeView']:
+        manager_row = self._table._manager_rows[self._row]
+        if manager_row == NO_ROW:
+            return None
+        return EmployeeView(self._table, manager_row)
+
+    def has_manager(self):
+        return self._table._manager_rows[self._row] != NO_ROW
+
+    def get_member_list(self) -> List['EmployeeView']:
+        offsets = self._table._member_offsets
+        member_rows = self._table._member_rows[offsets[self._row]:offsets[self._row + 1]]
+        return [EmployeeView(self._table, row) for row in member_rows]
+
+    def get_member_count(self) -> int:
+        offsets = self._table._member_offsets
+        return offsets[self._row + 1] - offsets[self._row]
+
+    def get_class_name(self):
+        offsets = self._table._member_offsets
+        return 'Manager' if offsets[self._row] != offsets[self._row + 1] else 'Employee'
+
+    def print_info(self):  # pragma: no cover
+        # just for printing object information, no need to take care about in coverage report
+        print(self.get_first_name())
+        member_list = self.get_member_list()
+        if member_list:
+            print('Employees of ' + self.get_first_name())
+            for member in member_list:
+                print('\t' + member.get_first_name())
+
+
+def _get_int64_array(values: Sequence[int], field: str) -> array:
+    try:
+        return array('q', values)
+    except OverflowError:
+        value = next(value for value in values if not INT64_MIN <= value <= INT64_MAX)
+        raise OutOfRangeError(f"{field} is out of the 64-bit range of EmployeeTable: {value}") from None
@@ -0,0 +1,134 @@
+from typing import Dict, List
+
+from conf.employee_definition import Employee, Manager
+from conf.employee_table import EmployeeTable, EmployeeView
+
+
+class LazyEmployeeHierarchy:
+    """
+    A hierarchy kept in one `EmployeeTable`, the compact id-indexed form of the validated records, which creates the
+    `Employee` and `Manager` instances only when they are accessed:
+
+        - `get_employee`: the instance of an id, its managers up to the top are created as well, but nobody else
+        - `Manager.get_member_list`: the members of a `Manager` are created on the first access of its members
+
+    Every row is created at most once, so the same id always returns the same instance, and the instances behave the
+    same as the ones from `get_employee_list`. `get_total_salary`, `__len__` and `get_member_count` are computed
+    straight from the table, they don't create any instance.
+    """
+
+    def __init__(self, employee_table: EmployeeTable):
+        self._table = employee_table
+        self._employee_dict: Dict[int, Employee] = {}
+
+    def __len__(self):
+        return len(self._table)
+
+    def get_employee_table(self) -> EmployeeTable:
+        return self._table
+
+    def get_total_salary(self) -> int:
+        return self._table.get_total_salary()
+
+    def get_member_count(self, eid: int) -> int:
+        """
+        :param eid: id of the employee
+        :return: number of the members of the employee, 0 if it isn't a `Manager`
+        """
+        return self._table.get_employee(eid).get_member_count()
+
+    def get_materialized_count(self) -> int:
+        """
+        :return: number of the instances created so far
+        """
+        return len(self._employee_dict)
+
+    def get_employee(self, eid: int) -> Employee:
+        """
+        :param eid: id of the employee
+        :return: `Employee`, or `LazyManager` if the employee has at least one member
+        """
+        return self._get_instance(self._table.get_employee(eid))
+
+    def get_employee_list(self) -> List[Employee]:
+        """
+        Create the instances of all the rows, sort the list by `sort_employee_list` to get the same order as
+        `get_employee_list`.
+
+        :return: unsorted List[Employee]
+        """
+        return [self._get_instance(view) for view in self._table.get_employee_list()]
+
+    def _get_instance(self, view: EmployeeView) -> Employee:
+        # walk up to the first manager which has been created, the chain is created from the top down afterward, so a
+        # deep hierarchy doesn't recurse
+        view_list = []
+        while view is not None and view.get_row() not in self._employee_dict:
+            view_list.append(view)
+            view = view.get_manager()
+
+        manager = self._employee_dict[view.get_row()] if view is not None else None
+        for view in reversed(view_list):
+            if view.get_class_name() == 'Manager':
+                employee = LazyManager(view.get_eid(), view.get_first_name(), view.get_salary(), self, view.get_row())
+            else:
+                employee = Employee(view.get_eid(), view.get_first_name(), view.get_salary())
+            # the employee isn't registered to its manager here, the manager finds the same instance from the table
+            # once its members are loaded, so the siblings aren't created by the way
+            employee._manager = manager
+            self._employee_dict[view.get_row()] = employee
+            manager = employee
+
+        return self._employee_dict[view_list[0].get_row()] if view_list else manager
+
+    def _get_member_list(self, row: int) -> List[Employee]:
+        return [self._get_instance(view) for view in EmployeeView(self._table, row).get_member_list()]
+
+
+class LazyManager(Manager):
+    """
+    A `Manager` of `LazyEmployeeHierarchy`, its members are created from the table on the first call of any method
+    reading or changing the members. It's a `Manager` in every other way, `get_class_name` returns 'Manager' as well.
+    It can't be demoted by `Manager.demote`, since it has two more slots than an `Employee`.
+    """
+    __slots__ = ('_hierarchy', '_row')
+
+    def __init__(self, eid: int, first_name: str, salary: int, hierarchy: LazyEmployeeHierarchy, row: int):
+        Employee.__init__(self, eid, first_name, salary)
+        self._member_dict: Dict[int, Employee] = {}
+        self._sorted_member_list = None
+        self._hierarchy = hierarchy
+        self._row = row
+
+    def _load_members(self):
+        hierarchy = self._hierarchy
+        if hierarchy is not None:
+            self._hierarchy = None
+            member_list = hierarchy._get_member_list(self._row)
+            self._member_dict = {member.get_eid(): member for member in member_list}
+            # the table has sorted the members by first_name in advance
+            self._sorted_member_list = member_list
+
+    def register(self, member: Employee):
+        self._load_members()
+        super().register(member)
+
+    def unregister(self, member: Employee):
+        self._load_members()
+        super().unregister(member)
+
+    def has_members(self):
+        self._load_members()
+        return super().has_members()
+
+    def get_member_list(self) -> List[Employee]:
+        self._load_members()
+        return super().get_member_list()
+
+    def get_class_name(self):
+        return 'Manager'
+
+    def print_info(self):  # pragma: no cover
+        # just for printing object information, no need to take care about in coverage report
+        self._load_members()
+        super().print_info()
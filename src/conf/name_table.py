@@ -0,0 +1,59 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+
+class NameTable:
+    """
+    A shared table of the first names of all the loaded rosters. `intern` returns one canonical string per distinct
+    name, so the employees named the same share one string instead of one copy per record. Every interned name has a
+    sort rank, the index of the name in the sorted distinct names, so an ordering by name compares ints instead of
+    strings. The ranks are computed lazily, and computed again only after a new name is interned.
+
+    It's safe to be shared by threads, e.g. the loaders of `AsyncEmployeeLoader` or `HierarchyWatcher`. A new name and
+    the ranks are only written under a lock, so a rank dict computed before a name is interned is never cached after it.
+    The table only grows, it keeps every distinct first name it has seen for the lifetime of the process, since the
+    loaded hierarchies keep referring to the interned strings and their ranks, so a long-running process, e.g. one
+    reloading rosters by `HierarchyWatcher`, holds the union of the first names of all the rosters it has ever loaded.
+    """
+
+    def __init__(self):
+        self._name_dict: Dict[str, str] = {}
+        self._rank_dict: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._name_dict)
+
+    def intern(self, name: str) -> str:
+        """
+        :param name: first name
+        :return: the canonical string equal to the input
+        """
+        interned = self._name_dict.get(name)
+        if interned is None:
+            with self._lock:
+                interned = self._name_dict.setdefault(name, name)
+                if interned is name:
+                    self._rank_dict = None
+        return interned
+
+    def intern_all(self, name_iterable: Iterable[str]):
+        for name in name_iterable:
+            self.intern(name)
+
+    def get_rank_dict(self) -> Dict[str, int]:
+        """
+        :return: the sort rank of every interned name, ranks compare the same way as the names do. Don't keep it
+            across `intern`, the ranks are reassigned once a new name is interned
+        """
+        rank_dict = self._rank_dict
+        if rank_dict is None:
+            with self._lock:
+                rank_dict = {name: rank for rank, name in enumerate(sorted(self._name_dict))}
+                # no name is interned under the lock, the count is checked anyway, so a stale dict is never cached
+                if len(rank_dict) == len(self._name_dict):
+                    self._rank_dict = rank_dict
+        return rank_dict
+
+
+name_table = NameTable()
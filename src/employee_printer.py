@@ -1,72 +1,183 @@
+import argparse
 import glob
+import sys
+from functools import lru_cache
+from itertools import chain
 from json import JSONDecodeError
+from typing import Iterable, List, Optional
 
 from pydantic import ValidationError
 
-from service.employee_service import get_employee_list, print_employee_list
+from conf.employee_table import OutOfRangeError
+from service.employee_service import OUTPUT_FORMATS, get_employee_list, print_employee_list, render_employee_list
+from service.snapshot_cache import SnapshotCache
 from utils import RESOURCES_DIR
 
+# the hierarchy of a file is only loaded again if the file is changed since the last report
+snapshot_cache = SnapshotCache()
+
+# exit codes of the batch mode, they're combined by bitwise or if more than one type of failure happens
+EXIT_OK = 0
+EXIT_FILE_NOT_FOUND = 1
+EXIT_JSON_DECODE_ERROR = 2
+EXIT_INVALID_DATA = 4
+EXIT_UNEXPECTED_ERROR = 8
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Without any argument, it launches the interactive application. Otherwise, it's the batch mode, the reports of the
+    files in the arguments, or read from stdin line by line with `--stdin`, are written to stdout one after another,
+    and the errors are written to stderr. The returned exit code tells which types of failure happened.
+
+    :param argv: command line arguments, `sys.argv[1:]` by default
+    :return: exit code
+    """
+    parser = argparse.ArgumentParser(description='print the reports of the files stored in /resources path')
+    parser.add_argument('files', nargs='*', help='file names relative to /resources path')
+    parser.add_argument('--stdin', action='store_true', help='read file names from stdin, one per line')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text', help='output format of the reports')
+    args = parser.parse_args(argv)
+
+    if not args.files and not args.stdin:
+        _run_interactive()
+        return EXIT_OK
+
+    file_names = chain(args.files, _iter_stdin_file_names()) if args.stdin else args.files
+    return _run_batch(file_names, args.format)
+
+
+def _run_batch(file_names: Iterable[str], output_format: str) -> int:
+    exit_code = EXIT_OK
+    for file_name in file_names:
+        try:
+            employee_list = _get_employee_list(file_name)
+            render_employee_list(employee_list, sys.stdout, output_format)
+        except FileNotFoundError:
+            print(f"file not found: {file_name}", file=sys.stderr)
+            exit_code |= EXIT_FILE_NOT_FOUND
+        except JSONDecodeError:
+            print(f"the json file has wrong format: {file_name}", file=sys.stderr)
+            exit_code |= EXIT_JSON_DECODE_ERROR
+        except (ValueError, ValidationError) as error:
+            print(f"something went wrong: {error}", file=sys.stderr)
+            exit_code |= EXIT_INVALID_DATA
+        except Exception as error:
+            # e.g. TypeError of a record which isn't an object, one bad file mustn't stop the others from being printed
+            print(f"unexpected error of {file_name}: {type(error).__name__}: {error}", file=sys.stderr)
+            exit_code |= EXIT_UNEXPECTED_ERROR
+
+    sys.stdout.flush()
+    return exit_code
+
+
+def _get_employee_list(file_name: str) -> List:
+    try:
+        return snapshot_cache.get_employee_list(file_name)
+    except OutOfRangeError:
+        # an id or a salary doesn't fit in `EmployeeTable`, the instances don't have the limit and sort the same
+        return get_employee_list(file_name)
 
-def main():
-    _print_file()
 
+def _iter_stdin_file_names() -> Iterable[str]:
+    for line in sys.stdin:
+        if line.strip():
+            yield line.strip()
 
-def _print_file():
-    print('\nplease input one of the following stored in /resources path or press N to exit\n')
 
-    json_files = glob.glob(RESOURCES_DIR + '/*.json')
-    json_files.sort(key=lambda file_name: file_name)
+def _run_interactive():
+    """
+    The interactive application, every round asks for a file and prints its report until the user presses N. It's a
+    loop rather than recursive calls, so a long session doesn't grow the stack.
+    """
+    while True:
+        input_file_name = _print_file()
+        if input_file_name is None or not _proceed_with_printer():
+            _exit()
+            return
 
-    for index, file in enumerate(json_files):
-        print(str(index + 1) + '. ' + file.replace(RESOURCES_DIR, ''))
+        print("********************")
 
-    _print_separated_line()
 
-    input_file_name = str(input())
-    if input_file_name.upper() == 'N':
-        _exit()
+def _print_file() -> Optional[str]:
+    """
+    Ask for a file until one of them is printed successfully.
 
-    print('\nstart generating report...\n')
-    try:
-        employee_list = get_employee_list(input_file_name)
-        _print_separated_line()
+    :return: the printed file name, None if the user presses N
+    """
+    while True:
+        print('\nplease input one of the following stored in /resources path or press N to exit\n')
+
+        for index, file in enumerate(_get_json_file_list()):
+            print(str(index + 1) + '. ' + file)
 
-        print_employee_list(employee_list)
         _print_separated_line()
-    except FileNotFoundError:
-        print(f"file not found: {input_file_name}\n")
-        _print_file()
-    except JSONDecodeError:
-        print(f"the json file has wrong format: {input_file_name}\n")
-        _print_file()
-    except (ValueError, ValidationError) as error:
-        print(f"something went wrong: {error}\n")
-        _print_file()
 
-    print(f"the above is {input_file_name} report\n")
-    _proceed_with_printer()
+        input_file_name = _input()
+        if input_file_name is None or input_file_name.upper() == 'N':
+            return None
+
+        print('\nstart generating report...\n')
+        try:
+            employee_list = _get_employee_list(input_file_name)
+            _print_separated_line()
+
+            print_employee_list(employee_list)
+            _print_separated_line()
+        except FileNotFoundError:
+            print(f"file not found: {input_file_name}\n")
+            continue
+        except JSONDecodeError:
+            print(f"the json file has wrong format: {input_file_name}\n")
+            continue
+        except (ValueError, ValidationError) as error:
+            print(f"something went wrong: {error}\n")
+            continue
+        except Exception as error:
+            print(f"unexpected error of {input_file_name}: {type(error).__name__}: {error}\n")
+            continue
+
+        print(f"the above is {input_file_name} report\n")
+        return input_file_name
+
+
+@lru_cache(maxsize=None)
+def _get_json_file_list() -> List[str]:
+    # the listing is only globbed once per process
+    json_files = glob.glob(RESOURCES_DIR + '/*.json')
+    json_files.sort(key=lambda file_name: file_name)
+    return [file.replace(RESOURCES_DIR, '') for file in json_files]
 
 
 def _print_separated_line():
     print('\n--------------------\n')
 
 
-def _proceed_with_printer():
-    print("continue ? Y/N")
-    is_continue = str(input()).upper()
-    if 'Y' == is_continue:
-        print("********************")
-        _print_file()
-    elif 'N' == is_continue:
-        _exit()
-    else:
-        _proceed_with_printer()
+def _proceed_with_printer() -> bool:
+    while True:
+        print("continue ? Y/N")
+        is_continue = _input()
+        if is_continue is None:
+            return False
+
+        is_continue = is_continue.upper()
+        if 'Y' == is_continue:
+            return True
+        elif 'N' == is_continue:
+            return False
+
+
+def _input() -> Optional[str]:
+    # the end of a piped input is regarded as N
+    try:
+        return str(input())
+    except EOFError:
+        return None
 
 
 def _exit():
     print("bye bye")
-    exit()
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,248 @@
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_listener: Optional[Callable[['StageSpan'], None]] = None
+_trace_memory = False
+_local = threading.local()
+
+
+class StageSpan:
+    """
+    The measurement of one stage of a load, it's delivered to the listener of `instrument` when the stage is finished.
+
+        - `get_seconds`: wall time spent in the stage itself, the time of the nested stages is excluded, e.g. parse
+          doesn't include the time of reading the file
+        - `get_count`: number of records processed by the stage, or characters for the read stage
+        - `get_peak_bytes`: peak of the traced memory while the stage was running, on top of the traced memory when it
+          started, None if memory isn't traced
+    """
+    __slots__ = ('_name', '_seconds', '_count', '_peak_bytes')
+
+    def __init__(self, name: str, seconds: float, count: int, peak_bytes: Optional[int]):
+        self._name = name
+        self._seconds = seconds
+        self._count = count
+        self._peak_bytes = peak_bytes
+
+    def get_name(self):
+        return self._name
+
+    def get_seconds(self):
+        return self._seconds
+
+    def get_count(self):
+        return self._count
+
+    def get_peak_bytes(self):
+        return self._peak_bytes
+
+    def to_dict(self) -> dict:
+        return {'stage': self._name, 'seconds': self._seconds, 'count': self._count, 'peak_bytes': self._peak_bytes}
+
+
+def log_stage_span(span: StageSpan):
+    """
+    The default listener of `instrument`, every span is logged as one json line at INFO level.
+
+    :param span: finished stage
+    :return: None
+    """
+    logger.info(json.dumps(span.to_dict()))
+
+
+@contextmanager
+def instrument(listener: Callable[[StageSpan], None] = log_stage_span, trace_memory: bool = False):
+    """
+    Enable the instrumentation of the loads in the block, e.g. `get_employee_list`, every finished stage is delivered to
+    `listener` as a `StageSpan`. The stages are read, parse, validate, dedupe, hierarchy, map, link_managers and sort,
+    read, parse and validate are streamed, so they run interleaved and finish together. Out of the block, every stage
+    is a no-op and the streamed records aren't wrapped at all, so the overhead is a few function calls per load.
+
+    :param listener: called with every finished `StageSpan`
+    :param trace_memory: trace the peak memory of every stage by `tracemalloc`, it's started if it isn't tracing yet.
+        Noted that the peak is process-wide, the loads in other threads are counted as well
+    :return: None
+    """
+    global _listener, _trace_memory
+    previous_listener, previous_trace_memory = _listener, _trace_memory
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    _listener, _trace_memory = listener, trace_memory
+    try:
+        yield
+    finally:
+        _listener, _trace_memory = previous_listener, previous_trace_memory
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    return _listener is not None
+
+
+def measure_stage(name: str) -> '_Stage':
+    """
+    :param name: name of the stage
+    :return: a new stage if the instrumentation is enabled, otherwise the shared no-op stage. Use it as a context
+        manager around a block, or `start` and `stop` it around every piece of work, and `close` it once finished
+    """
+    if _listener is None:
+        return _NULL_STAGE
+    return _Stage(name, _listener, _trace_memory)
+
+
+def iter_stage(name: str, iterable: Iterable) -> Iterable:
+    """
+    :param name: name of the stage
+    :param iterable: records produced by the stage
+    :return: the input as it is if the instrumentation is disabled, otherwise an iterator which measures every `next`
+        of the input and finishes the stage once the input is exhausted
+    """
+    if _listener is None:
+        return iterable
+    return _iter_stage(measure_stage(name), iterable)
+
+
+def _iter_stage(stage: '_Stage', iterable: Iterable) -> Iterator:
+    iterator = iter(iterable)
+    try:
+        while True:
+            stage.start()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                stage.stop()
+            stage.add_count(1)
+            yield item
+    finally:
+        stage.close()
+
+
+def _get_frame_stack() -> List[list]:
+    if not hasattr(_local, 'frame_stack'):
+        _local.frame_stack = []
+    return _local.frame_stack
+
+
+class _Stage:
+    """
+    A stage might be started and stopped many times, e.g. once per record. The running stages of a thread form a stack
+    of frames `[stage, start time, nested seconds]`, a stopped frame adds its elapsed time to the nested seconds of
+    the frame below, so every stage only accumulates its own time. With memory tracing, the traced peak is folded into
+    every running stage before it's reset by a new frame.
+    """
+    __slots__ = ('_name', '_listener', '_trace_memory', '_seconds', '_count', '_start_bytes', '_max_bytes', '_closed')
+
+    def __init__(self, name: str, listener: Callable[[StageSpan], None], trace_memory: bool):
+        self._name = name
+        self._listener = listener
+        self._trace_memory = trace_memory
+        self._seconds = 0.0
+        self._count = 0
+        self._start_bytes = None
+        self._max_bytes = 0
+        self._closed = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        self.close()
+
+    def start(self):
+        frame_stack = _get_frame_stack()
+        if self._trace_memory:
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            for frame in frame_stack:
+                frame[0]._fold_peak(peak_bytes)
+            tracemalloc.reset_peak()
+            if self._start_bytes is None:
+                self._start_bytes = current_bytes
+            self._fold_peak(current_bytes)
+
+        frame_stack.append([self, time.perf_counter(), 0.0])
+
+    def stop(self):
+        frame_stack = _get_frame_stack()
+        _, start, nested_seconds = frame_stack.pop()
+        elapsed = time.perf_counter() - start
+        self._seconds += elapsed - nested_seconds
+        if frame_stack:
+            frame_stack[-1][2] += elapsed
+
+        if self._trace_memory:
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            self._fold_peak(peak_bytes)
+            for frame in frame_stack:
+                frame[0]._fold_peak(peak_bytes)
+
+    def add_count(self, count: int):
+        self._count += count
+
+    def wrap(self, function: Callable) -> Callable:
+        """
+        :param function: a read function, e.g. `read` of a file
+        :return: the function measured by this stage, the length of every result is counted
+        """
+        def measured_function(*args):
+            self.start()
+            try:
+                result = function(*args)
+            finally:
+                self.stop()
+            self._count += len(result)
+            return result
+
+        return measured_function
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        peak_bytes = self._max_bytes - self._start_bytes if self._start_bytes is not None else None
+        self._listener(StageSpan(self._name, self._seconds, self._count, peak_bytes))
+
+    def _fold_peak(self, peak_bytes: int):
+        if peak_bytes > self._max_bytes:
+            self._max_bytes = peak_bytes
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def add_count(self, count: int):
+        pass
+
+    def wrap(self, function: Callable) -> Callable:
+        return function
+
+    def close(self):
+        pass
+
+
+_NULL_STAGE = _NullStage()
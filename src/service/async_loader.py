@@ -0,0 +1,70 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from conf.employee_definition import Employee
+from service.employee_service import get_employee_list
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class AsyncEmployeeLoader:
+    """
+    The asyncio counterpart of `get_employee_list` for the services running in an event loop. The whole load, reading,
+    parsing, validating and mapping, runs in `executor`, the default executor of the event loop if it's None, so the
+    event loop is never blocked by a load.
+
+        - at most `max_concurrency` loads run at the same time, the other requests wait for a free slot
+        - concurrent requests of the same file share one load, e.g. ten requests of `employees1.json` at the same time
+          only load the file once, and all of them get the same list, or the same error
+
+    A finished load isn't cached, the next request of the same file loads it again. Cancelling one of the requests
+    doesn't cancel the shared load for the others. An instance must be used in one event loop only.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, executor: Optional[Executor] = None,
+                 load: Callable[[str, Optional[bool]], List[Employee]] = get_employee_list):
+        """
+        :param max_concurrency: max number of loads running at the same time
+        :param executor: executor of the loads, a thread pool is preferred since the result isn't pickled
+        :param load: load function, e.g. `get_employee_list` or `get_employee_table_list`
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be positive: {max_concurrency}")
+
+        self._max_concurrency = max_concurrency
+        self._executor = executor
+        self._load = load
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight_dict: Dict[Tuple[str, Optional[bool]], asyncio.Future] = {}
+
+    async def get_employee_list(self, file_name: str, json_lines: Optional[bool] = None) -> List[Employee]:
+        """
+        :param file_name: file name
+        :param json_lines: see `utils.iter_json_list_by_file`
+        :return: the result of the load function, it raises the same errors as the load function
+        """
+        key = (file_name, json_lines)
+        future = self._in_flight_dict.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run_load(file_name, json_lines))
+            self._in_flight_dict[key] = future
+            future.add_done_callback(lambda _: self._remove_in_flight(key, future))
+
+        return await asyncio.shield(future)
+
+    def get_in_flight_count(self) -> int:
+        return len(self._in_flight_dict)
+
+    def _remove_in_flight(self, key: Tuple[str, Optional[bool]], future: asyncio.Future):
+        if self._in_flight_dict.get(key) is future:
+            del self._in_flight_dict[key]
+
+    async def _run_load(self, file_name: str, json_lines: Optional[bool]) -> List[Employee]:
+        # the semaphore is created in the running event loop, older versions of asyncio bind it to the loop on creation
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._load, file_name, json_lines)
@@ -1,7 +1,21 @@
-from typing import List
-
-from conf.employee_definition import Employee, EmployeeJson, Manager
-from utils import get_json_list_by_file
+import csv
+import heapq
+import io
+import json
+import sys
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from conf.employee_definition import Employee, EmployeeJson, Manager, iter_employee_json
+from conf.employee_table import EmployeeTable, EmployeeView
+from conf.lazy_hierarchy import LazyEmployeeHierarchy
+from conf.name_table import name_table
+from instrumentation import is_enabled, iter_stage, measure_stage
+from service.hierarchy_validator import validate_hierarchy
+from utils import get_json_list_by_file, iter_json_list_by_file
+
+OUTPUT_FORMATS = ('text', 'csv', 'jsonl')
+RENDER_BUFFER_SIZE = 1 << 16
 
 
 class EmployeeMapper:
@@ -33,18 +47,9 @@ class EmployeeMapper:
         if not employee_json:
             raise ValueError('employee_json shouldn\'t be None')
 
-        # create a new manager if the id doesn't exit in the dict
-        if employee_json.get_id() not in self._employee_dict:
-            self._employee_dict[employee_json.get_id()] = Manager(self.map_to_employee(employee_json))
-            return self._employee_dict[employee_json.get_id()]
-
-        # consider if the id exits, and the employee should be converted to a manager
-        employee = self._employee_dict[employee_json.get_id()]
-        if type(employee) == Employee:
-            manager = Manager(employee)
-            self._employee_dict[employee_json.get_id()] = manager
-
-        return self._employee_dict[employee_json.get_id()]
+        # create a new employee if the id doesn't exit in the dict, and promote it to a manager in place, any member
+        # or manager which has already referred to the employee keeps referring to the same instance
+        return Manager.promote(self.map_to_employee(employee_json))
 
     def get_employee_list(self) -> List[Employee]:
         if self._employee_dict:
@@ -52,12 +57,172 @@ class EmployeeMapper:
 
         return []
 
+    def map_to_employee_list(self, employee_json_dict: Dict[int, EmployeeJson]) -> List[Employee]:
+        """
+        Map all the `EmployeeJson` to `Employee` and set up manager if `EmployeeJson.get_manager()` is not None. It
+        checks if manager id couldn't be found with the dict.
+
+        :param employee_json_dict: key would be id, value would be `EmployeeJson`
+        :return: all the `Employee` which are created by the mapper
+        """
+        if is_enabled():
+            return self._map_to_employee_list_by_stage(employee_json_dict)
+
+        for employee_json in employee_json_dict.values():
+            employee = self.map_to_employee(employee_json)
+            manager_id = employee_json.get_manager()
+            if manager_id:
+                if manager_id not in employee_json_dict:
+                    raise ValueError(f"can't find the manager with id: {manager_id}")
+
+                manager = self.map_to_manager(employee_json_dict[manager_id])
+                employee.set_manager(manager)
+
+        return self.get_employee_list()
+
+    def _map_to_employee_list_by_stage(self, employee_json_dict: Dict[int, EmployeeJson]) -> List[Employee]:
+        # the instrumented counterpart of `map_to_employee_list`, the instances are created in the same order by the
+        # map stage, and then linked to their managers by the link_managers stage, so the two are measured apart
+        with measure_stage('map') as stage:
+            for employee_json in employee_json_dict.values():
+                self.map_to_employee(employee_json)
+                manager_id = employee_json.get_manager()
+                if manager_id:
+                    if manager_id not in employee_json_dict:
+                        raise ValueError(f"can't find the manager with id: {manager_id}")
+                    self.map_to_employee(employee_json_dict[manager_id])
+            stage.add_count(len(self._employee_dict))
+
+        with measure_stage('link_managers') as stage:
+            for employee_json in employee_json_dict.values():
+                manager_id = employee_json.get_manager()
+                if manager_id:
+                    manager = Manager.promote(self._employee_dict[manager_id])
+                    self._employee_dict[employee_json.get_id()].set_manager(manager)
+                    stage.add_count(1)
+
+        return self.get_employee_list()
+
+    def apply_delta(self, added_list: List[EmployeeJson], changed_list: List[EmployeeJson],
+                    removed_list: List[EmployeeJson]):
+        """
+        Apply a delta to the mapped hierarchy in place. The checks of `get_employee_list` are only run on the touched
+        ids, and nothing is changed if any of them fails:
+            - duplicate id: an added id has already existed, or an id is touched more than once
+            - an id to be changed or removed couldn't be found
+            - manager id couldn't be found after the delta, including a removed manager which still has members
+            - the managers of the added and changed ids run into a cycle, see `validate_hierarchy`
+
+        Afterward, the removed employees are unregistered from their managers, the changed ones are updated in place and
+        re-parented by `set_manager` or `remove_manager`, and a `Manager` without any member left is demoted to an
+        `Employee`. Only the sorted member lists of the touched managers are invalidated.
+
+        :param added_list: new records
+        :param changed_list: records of existing ids, manager moves included
+        :param removed_list: records of existing ids, only the id is used
+        :return: None
+        """
+        touched_dict: Dict[int, EmployeeJson] = {}
+        for employee_json in chain(added_list, changed_list, removed_list):
+            if employee_json.get_id() in touched_dict:
+                raise ValueError(f"found duplicate id: {employee_json.get_id()}")
+            touched_dict[employee_json.get_id()] = employee_json
+
+        for employee_json in added_list:
+            if employee_json.get_id() in self._employee_dict:
+                raise ValueError(f"found duplicate id: {employee_json.get_id()}")
+
+        for employee_json in chain(changed_list, removed_list):
+            if employee_json.get_id() not in self._employee_dict:
+                raise ValueError(f"can't find the employee with id: {employee_json.get_id()}")
+
+        removed_id_set = {employee_json.get_id() for employee_json in removed_list}
+        for employee_json in chain(added_list, changed_list):
+            manager_id = employee_json.get_manager()
+            if manager_id and (manager_id in removed_id_set or (
+                    manager_id not in self._employee_dict and manager_id not in touched_dict)):
+                raise ValueError(f"can't find the manager with id: {manager_id}")
 
-def get_employee_list(file_name: str) -> List[Employee]:
+        for employee_json in removed_list:
+            employee = self._employee_dict[employee_json.get_id()]
+            if type(employee) == Manager:
+                for member in employee.get_member_list():
+                    # a member left behind without being changed or removed
+                    if member.get_eid() not in touched_dict:
+                        raise ValueError(f"can't find the manager with id: {employee.get_eid()}")
+
+        def get_manager_id(eid: int) -> Optional[int]:
+            if eid in touched_dict:
+                return touched_dict[eid].get_manager() or None
+            manager = self._employee_dict[eid].get_manager()
+            return manager.get_eid() if manager else None
+
+        # the hierarchy has been valid, a new cycle must go through one of the added or changed ids
+        validate_hierarchy((employee_json.get_id() for employee_json in chain(added_list, changed_list)),
+                           get_manager_id)
+
+        previous_manager_list = []
+        for employee_json in removed_list:
+            employee = self._employee_dict.pop(employee_json.get_id())
+            previous_manager_list.append(employee.get_manager())
+            employee.remove_manager()
+
+        for employee_json in added_list:
+            self.map_to_employee(employee_json)
+
+        for employee_json in chain(added_list, changed_list):
+            employee = self._employee_dict[employee_json.get_id()]
+            employee.update(employee_json.get_first_name(), employee_json.get_salary())
+            previous_manager_list.append(employee.get_manager())
+
+            manager_id = employee_json.get_manager()
+            if manager_id:
+                employee.set_manager(Manager.promote(self._employee_dict[manager_id]))
+            else:
+                employee.remove_manager()
+
+        for manager in previous_manager_list:
+            if type(manager) == Manager and manager.get_eid() in self._employee_dict and not manager.has_members():
+                Manager.demote(manager)
+
+    def map_to_employee_table(self, employee_json_dict: Dict[int, EmployeeJson]) -> EmployeeTable:
+        """
+        Map all the `EmployeeJson` to one `EmployeeTable` instead of `Employee` and `Manager` instances. The rows are
+        in the same order as the dict of `map_to_employee` and `map_to_manager` would be, an employee comes first and
+        then its manager if the manager hasn't been seen yet. The members with the same first_name are in the order of
+        the dict, the same as the members of a `Manager`. Like `get_employee_list`, it checks if manager id couldn't be
+        found with the dict.
+
+        :param employee_json_dict: key would be id, value would be `EmployeeJson`
+        :return: EmployeeTable
+        """
+        row_json_dict: Dict[int, EmployeeJson] = {}
+        for employee_json in employee_json_dict.values():
+            row_json_dict.setdefault(employee_json.get_id(), employee_json)
+            manager_id = employee_json.get_manager()
+            if manager_id:
+                if manager_id not in employee_json_dict:
+                    raise ValueError(f"can't find the manager with id: {manager_id}")
+                row_json_dict.setdefault(manager_id, employee_json_dict[manager_id])
+
+        record_position_dict = {eid: position for position, eid in enumerate(employee_json_dict)}
+        row_json_list = list(row_json_dict.values())
+        return EmployeeTable(
+            [employee_json.get_id() for employee_json in row_json_list]
+            , [employee_json.get_first_name() for employee_json in row_json_list]
+            , [employee_json.get_manager() or None for employee_json in row_json_list]
+            , [employee_json.get_salary() for employee_json in row_json_list]
+            , [record_position_dict[employee_json.get_id()] for employee_json in row_json_list])
+
+
+def get_employee_list(file_name: str, json_lines: Optional[bool] = None) -> List[Employee]:
     """
-    This is the main function of this module. In the beginning, it'll get json list by the input file name and transfer
-    each json data to `EmployeeJson`, and then store the data by `EmployeeJson.get_id()` with a dict. Duplicate id might
-    be found here and raise a ValueError.
+    This is the main function of this module. In the beginning, it'll iterate json records by the input file name and
+    transfer each json data to `EmployeeJson` by `iter_employee_json` as soon as it's read, and then store the data by
+    `EmployeeJson.get_id()` with a dict. The raw json records are never kept as a whole list. Duplicate id might be
+    found here and raise a ValueError. Then `validate_hierarchy` makes sure the managers of every `EmployeeJson` can
+    be found and traced up without running into a cycle, or a `HierarchyError` is raised with all the offending ids,
+    every manager id which couldn't be found included.
 
     Afterward, `EmployeeMapper` will be leveraged and does the following:
         - map every `EmployeeJson` to `Employee`
@@ -70,61 +235,319 @@ def get_employee_list(file_name: str) -> List[Employee]:
         2. if the `Employee` is also a `Manager, move to the top
         3. if the `Employee` doesn't have a 'Manager', move to the top
 
+    The rules are combined into one composite key, see `get_employee_order_key`, so the list is sorted only once, and
+    the key is compared as one int by `sort_employee_list`.
+
     :param file_name: file name
+    :param json_lines: see `utils.iter_json_list_by_file`
     :return: sorted List[Employee]
     """
+    employee_list = _map_employee_list(file_name, json_lines)
+    with measure_stage('sort') as stage:
+        sort_employee_list(employee_list)
+        stage.add_count(len(employee_list))
 
-    employee_json_list = get_json_list_by_file(file_name)
-    if not employee_json_list:
-        return []
+    return employee_list
 
-    employee_json_dict = {}
+
+def iter_employee_list(file_name: str, json_lines: Optional[bool] = None) -> Iterator[Employee]:
+    """
+    The lazy counterpart of `get_employee_list`, the hierarchy is built and validated before it returns, but the order
+    is produced on demand. The `Employee` list is heapified in linear time and every `next` pops the next `Employee`
+    in O(log n), so taking the first N rows costs O(n + N log n) instead of a full sort.
+
+    :param file_name: file name
+    :param json_lines: see `utils.iter_json_list_by_file`
+    :return: Iterator[Employee] in the same order as `get_employee_list`
+    """
+    employee_list = _map_employee_list(file_name, json_lines)
+    heap = [(get_employee_order_key(employee), index, employee) for index, employee in enumerate(employee_list)]
+    heapq.heapify(heap)
+
+    return (heapq.heappop(heap)[2] for _ in range(len(heap)))
+
+
+def get_employee_mapper(file_name: str, json_lines: Optional[bool] = None) -> EmployeeMapper:
+    """
+    Load the input file with the same validations as `get_employee_list`, but return the `EmployeeMapper` which keeps
+    the whole hierarchy by id, so the hierarchy can be updated by `apply_employee_delta` later.
+
+    :param file_name: file name
+    :param json_lines: see `utils.iter_json_list_by_file`
+    :return: EmployeeMapper, `EmployeeMapper.get_employee_list` returns the unsorted `Employee` list
+    """
+    employee_json_dict = _get_employee_json_dict(file_name, json_lines)
     employee_mapper = EmployeeMapper()
+    employee_mapper.map_to_employee_list(employee_json_dict)
+
+    return employee_mapper
+
+
+def apply_employee_delta(employee_mapper: EmployeeMapper, file_name: str):
+    """
+    Apply a delta file to the hierarchy loaded by `get_employee_mapper` in place, instead of loading the whole file
+    again. The delta file is a json object with `added`, `changed` and `removed`, each of them is an optional list of
+    records in the same shape as `EmployeeJson`, see `EmployeeMapper.apply_delta` for the details. Sort
+    `employee_mapper.get_employee_list()` by `get_employee_order_key` to get the same order as `get_employee_list`.
+
+    :param employee_mapper: generated by get_employee_mapper
+    :param file_name: file name of the delta
+    :return: None
+    """
+    delta = get_json_list_by_file(file_name)
+    if not isinstance(delta, dict):
+        raise ValueError(f"delta must be a json object: {file_name}")
+
+    employee_mapper.apply_delta(*(list(iter_employee_json(delta.get(key) or []))
+                                  for key in ('added', 'changed', 'removed')))
 
-    for employee_json_data in employee_json_list:
-        employee_json = EmployeeJson(**employee_json_data)
-        if employee_json.get_id() in employee_json_dict:
-            raise ValueError(f"found duplicate id: {employee_json.get_id()}")
-        employee_json_dict[employee_json.get_id()] = employee_json
-
-    for employee_json in employee_json_dict.values():
-        employee = employee_mapper.map_to_employee(employee_json)
-        manager_id = employee_json.get_manager()
-        if manager_id:
-            if manager_id not in employee_json_dict:
-                raise ValueError(f"can't find the manager with id: {manager_id}")
 
-            manager = employee_mapper.map_to_manager(employee_json_dict[manager_id])
-            employee.set_manager(manager)
+def get_employee_table_list(file_name: str, json_lines: Optional[bool] = None) -> List[EmployeeView]:
+    """
+    The columnar counterpart of `get_employee_list`, the validations and the order are the same, but the hierarchy is
+    stored in one `EmployeeTable` by `EmployeeMapper.map_to_employee_table`. The returned `EmployeeView` has the same
+    interface as `Employee`, so `print_employee_list` and `get_total_salary` work with it as well.
 
-    employee_list = employee_mapper.get_employee_list()
-    employee_list.sort(key=lambda e: e.get_first_name())
-    employee_list.sort(key=lambda e: type(e) == Manager, reverse=True)
-    employee_list.sort(key=lambda e: e.has_manager())
+    :param file_name: file name
+    :param json_lines: see `utils.iter_json_list_by_file`
+    :return: sorted List[EmployeeView]
+    """
+    employee_list = get_employee_table(file_name, json_lines).get_employee_list()
+    sort_employee_list(employee_list)
 
     return employee_list
 
 
+def get_employee_table(file_name: str, json_lines: Optional[bool] = None) -> EmployeeTable:
+    """
+    Load the input file to one `EmployeeTable` with the same validations as `get_employee_list`.
+
+    :param file_name: file name
+    :param json_lines: see `utils.iter_json_list_by_file`
+    :return: EmployeeTable, the rows aren't sorted
+    """
+    employee_json_dict = _get_employee_json_dict(file_name, json_lines)
+    with measure_stage('map') as stage:
+        employee_table = EmployeeMapper().map_to_employee_table(employee_json_dict)
+        stage.add_count(len(employee_table))
+
+    return employee_table
+
+
+def get_lazy_employee_hierarchy(file_name: str, json_lines: Optional[bool] = None) -> LazyEmployeeHierarchy:
+    """
+    Load the input file with the same validations as `get_employee_list`, but keep the hierarchy in one
+    `EmployeeTable` and create the `Employee` and `Manager` instances only when they are accessed, see
+    `LazyEmployeeHierarchy`. A run which only needs the total salary or the headcount never creates any of them.
+    Unlike `get_employee_table`, every validated `EmployeeJson` is written to the columns of the table as soon as it's
+    validated, rather than kept in a dict until the whole file is read, and the errors are raised in the same order as
+    `get_employee_list`: duplicate id and then `HierarchyError`, including the manager ids which couldn't be found.
+    The rows are in the same order as `EmployeeMapper.map_to_employee_list` creates the instances, an employee comes
+    first and then its manager if the manager hasn't been seen yet, so employees which tie in `get_employee_order_key`
+    keep the same order as `get_employee_list` after they're sorted.
+
+    :param file_name: file name
+    :param json_lines: see `utils.iter_json_list_by_file`
+    :return: LazyEmployeeHierarchy
+    """
+    eids, first_names, manager_eids, salaries, record_positions = [], [], [], [], []
+    # row of every id, a manager referred to before its own record gets a row which is filled in when the record is read
+    row_dict: Dict[int, int] = {}
+    # ids of the records which have been read, in the order of the file
+    record_dict: Dict[int, None] = {}
+
+    def get_row(eid: int) -> int:
+        if eid not in row_dict:
+            row_dict[eid] = len(eids)
+            eids.append(eid)
+            first_names.append(None)
+            manager_eids.append(None)
+            salaries.append(None)
+            record_positions.append(None)
+        return row_dict[eid]
+
+    employee_json_iterable = iter_stage('validate', iter_employee_json(
+        iter_stage('parse', iter_json_list_by_file(file_name, json_lines))))
+    with measure_stage('dedupe') as stage:
+        for employee_json in employee_json_iterable:
+            if employee_json.get_id() in record_dict:
+                raise ValueError(f"found duplicate id: {employee_json.get_id()}")
+            row = get_row(employee_json.get_id())
+            record_positions[row] = len(record_dict)
+            record_dict[employee_json.get_id()] = None
+            first_names[row] = employee_json.get_first_name()
+            manager_eids[row] = employee_json.get_manager() or None
+            salaries[row] = employee_json.get_salary()
+            if manager_eids[row]:
+                get_row(manager_eids[row])
+        stage.add_count(len(record_dict))
+
+    def get_manager_id(eid: int) -> Optional[int]:
+        return manager_eids[row_dict[eid]]
+
+    with measure_stage('hierarchy') as stage:
+        # a row which is never filled in is a missing manager, it's reported here
+        validate_hierarchy(record_dict, get_manager_id, record_dict.__contains__)
+        stage.add_count(len(record_dict))
+
+    with measure_stage('map') as stage:
+        employee_table = EmployeeTable(eids, first_names, manager_eids, salaries, record_positions)
+        stage.add_count(len(employee_table))
+
+    return LazyEmployeeHierarchy(employee_table)
+
+
+def get_employee_order_key(employee: Employee) -> Tuple[bool, bool, str]:
+    """
+    Composite sort key of the rules in `get_employee_list`, the most significant rule comes first.
+
+    :param employee: `Employee`, `Manager` or `EmployeeView`
+    :return: sort key
+    """
+    return employee.has_manager(), employee.get_class_name() != 'Manager', employee.get_first_name()
+
+
+def sort_employee_list(employee_list: List[Employee]):
+    """
+    Sort the input list in place in the order of `get_employee_order_key`. Instead of a tuple, every employee is keyed
+    by one int, the rank of its first_name in `name_table` plus an offset for each of the two flags, so the sort
+    compares ints rather than tuples of strings.
+
+    :param employee_list: `Employee`, `Manager` or `EmployeeView` list
+    :return: None
+    """
+    try:
+        employee_list.sort(key=_get_rank_order_key_function(name_table.get_rank_dict()))
+    except KeyError:
+        # a name isn't interned, e.g. an employee-like object created elsewhere, the keys are computed before anything
+        # is moved, so the list is still in its original order
+        name_table.intern_all(employee.get_first_name() for employee in employee_list)
+        employee_list.sort(key=_get_rank_order_key_function(name_table.get_rank_dict()))
+
+
+def _get_rank_order_key_function(rank_dict: Dict[str, int]):
+    name_count = len(rank_dict)
+
+    def get_rank_order_key(employee: Employee) -> int:
+        return (rank_dict[employee.get_first_name()]
+                + (2 * name_count if employee.has_manager() else 0)
+                + (name_count if employee.get_class_name() != 'Manager' else 0))
+
+    return get_rank_order_key
+
+
+def _get_employee_json_dict(file_name: str, json_lines: Optional[bool]) -> Dict[int, EmployeeJson]:
+    employee_json_dict = {}
+    employee_json_iterable = iter_stage('validate', iter_employee_json(
+        iter_stage('parse', iter_json_list_by_file(file_name, json_lines))))
+    with measure_stage('dedupe') as stage:
+        for employee_json in employee_json_iterable:
+            if employee_json.get_id() in employee_json_dict:
+                raise ValueError(f"found duplicate id: {employee_json.get_id()}")
+            employee_json_dict[employee_json.get_id()] = employee_json
+        stage.add_count(len(employee_json_dict))
+
+    validate_employee_json_dict(employee_json_dict)
+    return employee_json_dict
+
+
+def validate_employee_json_dict(employee_json_dict: Dict[int, EmployeeJson]):
+    """
+    Make sure the managers of every `EmployeeJson` can be found and traced up without running into a cycle by
+    `validate_hierarchy`, or a `HierarchyError` is raised with all the offending ids, the missing managers included.
+
+    :param employee_json_dict: key would be id, value would be `EmployeeJson`
+    :return: None
+    """
+    def get_manager_id(eid: int) -> Optional[int]:
+        return employee_json_dict[eid].get_manager() or None
+
+    with measure_stage('hierarchy') as stage:
+        validate_hierarchy(employee_json_dict, get_manager_id, employee_json_dict.__contains__)
+        stage.add_count(len(employee_json_dict))
+
+
+def _map_employee_list(file_name: str, json_lines: Optional[bool]) -> List[Employee]:
+    return get_employee_mapper(file_name, json_lines).get_employee_list()
+
+
 def print_employee_list(employee_list: List[Employee]):  # pragma: no cover
     """
-    It'll for loop the input `Employee` list and invoke `Employee.print_info()`. Firstly, print the name. Secondly,
-    if the `Employee` is also a `Manager`, print the members it has. Lastly, invoke `get_total_salary` to print the
-    total salary.
+    Print the report of the input `Employee` list to stdout by `render_employee_list`. Firstly, print the name.
+    Secondly, if the `Employee` is also a `Manager`, print the members it has. Lastly, invoke `get_total_salary` to
+    print the total salary.
 
     :param employee_list: generated by get_employee_list
     :return: None
     """
     # just for printing object information, no need to take care about in coverage report
+    render_employee_list(employee_list, sys.stdout)
+
+
+def render_employee_list(employee_list: List[Employee], output: TextIO, output_format: str = 'text'):
+    """
+    Write the report of the input `Employee` list into the output, e.g. a file, a pipe or `io.StringIO`. The report is
+    rendered into a buffer and written in chunks of about `RENDER_BUFFER_SIZE` characters, rather than one `print` per
+    line. It's a flat loop over the list, the members of a `Manager` are only listed by name, not visited recursively.
+    The formats are:
+        - text: the same as `Employee.print_info` and `Manager.print_info`, the total salary is in the end
+        - csv: a header and one row of id, first_name, manager, salary and class_name per `Employee`
+        - jsonl: one json object of the same fields per `Employee`
+
+    :param employee_list: generated by get_employee_list
+    :param output: text stream to be written
+    :param output_format: one of `OUTPUT_FORMATS`
+    :return: None
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
+
+    buffer = io.StringIO()
+    if output_format == 'text':
+        _render_text(employee_list, buffer, output)
+    else:
+        csv_writer = csv.writer(buffer, lineterminator='\n')
+        if output_format == 'csv':
+            csv_writer.writerow(('id', 'first_name', 'manager', 'salary', 'class_name'))
+
+        for employee in employee_list:
+            manager = employee.get_manager()
+            row = (employee.get_eid(), employee.get_first_name(), manager.get_eid() if manager else None,
+                   employee.get_salary(), employee.get_class_name())
+            if output_format == 'csv':
+                csv_writer.writerow(row)
+            else:
+                buffer.write(json.dumps(dict(zip(('id', 'first_name', 'manager', 'salary', 'class_name'), row))))
+                buffer.write('\n')
+            _flush_render_buffer(buffer, output)
+
+    output.write(buffer.getvalue())
+
+
+def _render_text(employee_list: List[Employee], buffer: io.StringIO, output: TextIO):
     if not employee_list:
-        print('input employee list is empty')
+        buffer.write('input employee list is empty\n')
         return
 
     for employee in employee_list:
-        employee.print_info()
-        print('----------')
-
-    total_salary = get_total_salary(employee_list)
-    print('\ntotal_salary = ' + str(total_salary))
+        buffer.write(employee.get_first_name())
+        buffer.write('\n')
+        if employee.get_class_name() == 'Manager':
+            member_list = employee.get_member_list()
+            if member_list:
+                buffer.write('Employees of ' + employee.get_first_name() + '\n')
+                buffer.write(''.join('\t' + member.get_first_name() + '\n' for member in member_list))
+        buffer.write('----------\n')
+        _flush_render_buffer(buffer, output)
+
+    buffer.write('\ntotal_salary = ' + str(get_total_salary(employee_list)) + '\n')
+
+
+def _flush_render_buffer(buffer: io.StringIO, output: TextIO):
+    if buffer.tell() >= RENDER_BUFFER_SIZE:
+        output.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
 
 
 def get_total_salary(employee_list: List[Employee]):
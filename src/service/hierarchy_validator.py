@@ -0,0 +1,106 @@
+from typing import Callable, Dict, Iterable, List, Optional
+
+_VISITING = 0
+_REACHABLE = 1
+_UNREACHABLE = 2
+
+
+class HierarchyError(ValueError):
+    """
+    It's raised if the reporting lines can't be traced up to an employee without a manager. All the offending ids are
+    reported at once:
+
+        - `get_cycle_list`: every cycle of managers, e.g. [1, 2] if 1 is managed by 2 and 2 is managed by 1
+        - `get_self_managed_id_list`: ids managed by themselves
+        - `get_unreachable_id_list`: ids not in a cycle, but one of their managers is
+        - `get_missing_manager_id_list`: manager ids which couldn't be found, in the order they're first seen
+
+    If only missing managers are found, the message is the same as the one of a single missing manager before, e.g.
+    "can't find the manager with id: 3", otherwise the missing managers follow the cycles.
+    """
+
+    def __init__(self, cycle_list: List[List[int]], self_managed_id_list: List[int], unreachable_id_list: List[int],
+                 missing_manager_id_list: Optional[List[int]] = None):
+        missing_manager_id_list = missing_manager_id_list or []
+        message_list = []
+        if cycle_list or self_managed_id_list or unreachable_id_list:
+            message_list.append(f"found invalid hierarchy, cycles: {cycle_list}, "
+                                f"self-managed ids: {self_managed_id_list}, unreachable ids: {unreachable_id_list}")
+        if missing_manager_id_list:
+            message_list.append(f"can't find the manager with id: {', '.join(map(str, missing_manager_id_list))}")
+        super().__init__(', '.join(message_list))
+        self._cycle_list = cycle_list
+        self._self_managed_id_list = self_managed_id_list
+        self._unreachable_id_list = unreachable_id_list
+        self._missing_manager_id_list = missing_manager_id_list
+
+    def __reduce__(self):
+        return HierarchyError, (self._cycle_list, self._self_managed_id_list, self._unreachable_id_list,
+                                self._missing_manager_id_list)
+
+    def get_cycle_list(self):
+        return self._cycle_list
+
+    def get_self_managed_id_list(self):
+        return self._self_managed_id_list
+
+    def get_unreachable_id_list(self):
+        return self._unreachable_id_list
+
+    def get_missing_manager_id_list(self):
+        return self._missing_manager_id_list
+
+
+def validate_hierarchy(eid_iterable: Iterable[int], get_manager_id: Callable[[int], Optional[int]],
+                       has_eid: Optional[Callable[[int], bool]] = None):
+    """
+    Trace the managers up from every input id, and raise a `HierarchyError` if any of them ends in a cycle, or in a
+    manager id which couldn't be found if `has_eid` is given. Every id is visited only once in total, the result of a
+    traced chain is memorized for all the ids in the chain, so it's O(n) for a whole hierarchy, and O(number of visited
+    ids) if only a few ids are traced. It's iterative, a chain as deep as the hierarchy doesn't hit the recursion limit.
+
+    :param eid_iterable: ids to be traced
+    :param get_manager_id: returns the manager id of the input id, None if the id doesn't have a manager
+    :param has_eid: returns False if the input manager id couldn't be found, None if every manager id is found
+    :return: None
+    """
+    state_dict: Dict[int, int] = {}
+    cycle_list = []
+    self_managed_id_list = []
+    unreachable_id_list = []
+    # dict rather than set, so the missing managers are reported in the order they're first seen
+    missing_manager_id_dict: Dict[int, None] = {}
+
+    for eid in eid_iterable:
+        path = []
+        current = eid
+        while current is not None and current not in state_dict:
+            state_dict[current] = _VISITING
+            path.append(current)
+            current = get_manager_id(current)
+            if current is not None and has_eid is not None and current not in state_dict and not has_eid(current):
+                # the chain ends at a missing manager, the ids under it aren't reported as unreachable again
+                missing_manager_id_dict[current] = None
+                current = None
+
+        cycle_start = len(path)
+        if current is None:
+            result = _REACHABLE
+        elif state_dict[current] == _VISITING:
+            # the chain runs into itself, the ids from `current` on are the cycle
+            cycle_start = path.index(current)
+            if cycle_start == len(path) - 1:
+                self_managed_id_list.append(current)
+            else:
+                cycle_list.append(path[cycle_start:])
+            result = _UNREACHABLE
+        else:
+            result = state_dict[current]
+
+        for visited_id in path:
+            state_dict[visited_id] = result
+        if result == _UNREACHABLE:
+            unreachable_id_list.extend(path[:cycle_start])
+
+    if cycle_list or self_managed_id_list or unreachable_id_list or missing_manager_id_dict:
+        raise HierarchyError(cycle_list, self_managed_id_list, unreachable_id_list, list(missing_manager_id_dict))
@@ -0,0 +1,187 @@
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from conf.employee_definition import Employee
+from service.employee_service import get_employee_list
+from service.report_service import get_resource_file_list
+from utils import RESOURCES_DIR
+
+DEFAULT_INTERVAL = 1.0
+
+# size and mtime of a resource file, the file is loaded again once it's changed
+Signature = Tuple[int, int]
+
+
+class _Entry(NamedTuple):
+    signature: Signature
+    employee_list: Optional[List[Employee]]
+    version: int
+    error: Optional[Exception]
+
+
+class HierarchyWatcher:
+    """
+    It keeps the hierarchies of the resource files listed by `get_resource_file_list` in memory and refreshes them
+    once the files are changed. `refresh` polls the size and mtime of every file, and loads only the new or changed
+    ones again, `start` runs `refresh` every `interval` seconds in a background thread.
+
+    The readers never wait on a reload. The loaded hierarchies are kept in one dict which is never changed in place,
+    every reload builds and validates the new hierarchy first, and then replaces the whole dict by a copy with the new
+    version, so a reader always gets either the previous version or the new one. If the new content of a file can't be
+    loaded, whatever the error is, the previous version is kept and `get_error` returns the error until the file is
+    changed again.
+    """
+
+    def __init__(self, pattern: str = '', interval: float = DEFAULT_INTERVAL,
+                 load: Callable[[str], List[Employee]] = get_employee_list):
+        """
+        :param pattern: glob pattern or directory relative to `/resources/` path, see `get_resource_file_list`, all the
+            files in `/resources/` by default
+        :param interval: seconds between two polls of the background thread
+        :param load: loads the hierarchy of a file name, e.g. `get_employee_list` or `get_employee_table_list`
+        """
+        self._pattern = pattern
+        self._interval = interval
+        self._load = load
+        self._entry_dict: Dict[str, _Entry] = {}
+        # only one refresh at a time, the readers don't take it
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def get_file_list(self) -> List[str]:
+        """
+        :return: sorted file names which have been loaded successfully
+        """
+        return sorted(file_name for file_name, entry in self._entry_dict.items() if entry.employee_list is not None)
+
+    def get_employee_list(self, file_name: str) -> List[Employee]:
+        """
+        :param file_name: file name relative to `/resources/` path
+        :return: the latest version of the hierarchy which has been loaded successfully, don't change it
+        """
+        entry = self._entry_dict.get(file_name)
+        if entry is None:
+            raise FileNotFoundError(f"file isn't loaded: {file_name}")
+        if entry.employee_list is None:
+            # the file has never been loaded successfully
+            raise entry.error
+
+        return entry.employee_list
+
+    def get_version(self, file_name: str) -> int:
+        """
+        :param file_name: file name relative to `/resources/` path
+        :return: number of the successful loads of the file, 0 if it isn't loaded yet
+        """
+        entry = self._entry_dict.get(file_name)
+        return entry.version if entry else 0
+
+    def get_error(self, file_name: str) -> Optional[Exception]:
+        """
+        :param file_name: file name relative to `/resources/` path
+        :return: the error of loading the current content of the file, None if it's loaded successfully
+        """
+        entry = self._entry_dict.get(file_name)
+        return entry.error if entry else None
+
+    def refresh(self) -> List[str]:
+        """
+        Poll the files once, load the new and changed files, and drop the removed ones. Every file is switched over as
+        soon as it's loaded, so the files loaded earlier don't wait for the others.
+
+        :return: file names loaded in this call, including the ones which couldn't be loaded
+        """
+        with self._refresh_lock:
+            signature_dict = {}
+            for file_name in get_resource_file_list(self._pattern):
+                signature = _get_signature(file_name)
+                if signature is not None:
+                    signature_dict[file_name] = signature
+
+            removed_set = self._entry_dict.keys() - signature_dict.keys()
+            if removed_set:
+                self._entry_dict = {file_name: entry for file_name, entry in self._entry_dict.items()
+                                    if file_name not in removed_set}
+
+            loaded_list = []
+            for file_name, signature in signature_dict.items():
+                entry = self._entry_dict.get(file_name)
+                if entry is not None and entry.signature == signature:
+                    continue
+
+                try:
+                    employee_list, error = self._load(file_name), None
+                except Exception as load_error:
+                    # e.g. FileNotFoundError, JSONDecodeError, ValidationError, HierarchyError, or TypeError of a
+                    # record which isn't an object, one bad file mustn't stop the others from being refreshed
+                    employee_list, error = None, load_error
+
+                # the file might be changed during the loading, the result is dropped and it's loaded in the next poll
+                if _get_signature(file_name) != signature:
+                    continue
+
+                if error is None:
+                    new_entry = _Entry(signature, employee_list, (entry.version if entry else 0) + 1, None)
+                elif entry is not None:
+                    new_entry = entry._replace(signature=signature, error=error)
+                else:
+                    new_entry = _Entry(signature, None, 0, error)
+
+                self._entry_dict = {**self._entry_dict, file_name: new_entry}
+                loaded_list.append(file_name)
+
+            return loaded_list
+
+    def start(self):
+        """
+        Start the background thread, it refreshes at once and then every `interval` seconds until `stop`.
+
+        :return: None
+        """
+        if self._thread is not None:
+            raise ValueError('watcher has been started')
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='hierarchy-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background thread, a reload in progress is finished before the thread exits.
+
+        :param timeout: seconds to wait for the thread, None to wait until it exits
+        :return: None
+        """
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # e.g. the directory is removed, keep the loaded versions and poll again later, the thread never dies
+                pass
+            self._stop_event.wait(self._interval)
+
+
+def _get_signature(file_name: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(RESOURCES_DIR + file_name)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,56 @@
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, List
+
+from conf.employee_definition import Employee
+
+
+class FirstNameIndex:
+    """
+    An index of the ids by first_name on top of a loaded roster, e.g. the list from `get_employee_list` or
+    `get_employee_table_list`, so looking employees up by name doesn't scan the list:
+
+        - `get_id_list`: the ids of an exact first_name, O(1) plus the size of the result
+        - `get_prefix_id_list`: the ids of all the first names starting with a prefix, the distinct names are kept
+          sorted, so the matching names are found by a binary search, O(log k + size of result log k)
+
+    The ids of every name are sorted. The index is a snapshot, build a new one after the roster is changed.
+    """
+
+    def __init__(self, employee_list: List[Employee]):
+        id_list_dict: Dict[str, List[int]] = {}
+        for employee in employee_list:
+            id_list_dict.setdefault(employee.get_first_name(), []).append(employee.get_eid())
+
+        for id_list in id_list_dict.values():
+            id_list.sort()
+        self._id_list_dict = id_list_dict
+        self._sorted_names = sorted(id_list_dict)
+
+    def __len__(self):
+        return len(self._sorted_names)
+
+    def get_id_list(self, first_name: str) -> List[int]:
+        """
+        :param first_name: exact first_name, case-sensitive
+        :return: sorted ids of the employees named `first_name`, empty if there's none
+        """
+        return list(self._id_list_dict.get(first_name, ()))
+
+    def get_prefix_name_list(self, prefix: str) -> List[str]:
+        """
+        :param prefix: prefix of first_name, case-sensitive
+        :return: sorted distinct first names starting with `prefix`
+        """
+        start = bisect_left(self._sorted_names, prefix)
+        end = start
+        while end < len(self._sorted_names) and self._sorted_names[end].startswith(prefix):
+            end += 1
+        return self._sorted_names[start:end]
+
+    def get_prefix_id_list(self, prefix: str) -> List[int]:
+        """
+        :param prefix: prefix of first_name, case-sensitive
+        :return: sorted ids of the employees whose first_name starts with `prefix`
+        """
+        return list(merge(*(self._id_list_dict[name] for name in self.get_prefix_name_list(prefix))))
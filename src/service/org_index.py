@@ -0,0 +1,102 @@
+from array import array
+from typing import Dict, List
+
+from conf.employee_definition import Employee
+
+
+class OrgIndex:
+    """
+    An index of the reporting lines on top of a mapped hierarchy, e.g. the list from `get_employee_list`. It's built by
+    one iterative depth-first pass from every `Employee` without a `Manager`, the members are visited in the order of
+    `get_member_list`. The pass assigns every `Employee` an entry index in visiting order and an exit index after all
+    its reports are visited, which is an Euler tour of the hierarchy:
+
+        - the reports of an `Employee` are exactly the ones whose entry index is between its entry and exit index
+        - headcount, subtree salary and depth are materialized per `Employee` when it exits
+
+    Therefore "is X under Y", headcount, depth and subtree salary are O(1), and "all reports of Y" is O(size of result).
+    The index is a snapshot, build a new one after the hierarchy is changed.
+    """
+
+    def __init__(self, employee_list: List[Employee]):
+        self._entry_dict: Dict[int, int] = {}
+        self._employee_list: List[Employee] = []
+        self._exits = array('q')
+        self._depths = array('q')
+        # the salaries are Python ints, which never overflow, unlike the int64 of the other columns
+        self._subtree_salaries: List[int] = []
+
+        prefix_salaries = [0]
+        for root in employee_list:
+            if root.has_manager():
+                continue
+
+            stack = [(root, 0, False)]
+            while stack:
+                employee, depth, is_exiting = stack.pop()
+                if is_exiting:
+                    entry = self._entry_dict[employee.get_eid()]
+                    exit_index = len(self._employee_list)
+                    self._exits[entry] = exit_index
+                    self._subtree_salaries[entry] = prefix_salaries[exit_index] - prefix_salaries[entry]
+                    continue
+
+                entry = len(self._employee_list)
+                self._entry_dict[employee.get_eid()] = entry
+                self._employee_list.append(employee)
+                self._exits.append(entry + 1)
+                self._depths.append(depth)
+                self._subtree_salaries.append(0)
+                prefix_salaries.append(prefix_salaries[-1] + (employee.get_salary() or 0))
+
+                stack.append((employee, depth, True))
+                if employee.get_class_name() == 'Manager':
+                    stack.extend((member, depth + 1, False) for member in reversed(employee.get_member_list()))
+
+    def __len__(self):
+        return len(self._employee_list)
+
+    def is_under(self, eid: int, manager_eid: int) -> bool:
+        """
+        :param eid: id of the employee
+        :param manager_eid: id of the manager
+        :return: True if the employee is a direct or indirect report of the manager
+        """
+        entry = self._get_entry(eid)
+        manager_entry = self._get_entry(manager_eid)
+        return manager_entry < entry < self._exits[manager_entry]
+
+    def get_report_list(self, eid: int) -> List[Employee]:
+        """
+        :param eid: id of the manager
+        :return: all the direct and indirect reports in depth-first order
+        """
+        entry = self._get_entry(eid)
+        return self._employee_list[entry + 1:self._exits[entry]]
+
+    def get_headcount(self, eid: int) -> int:
+        """
+        :param eid: id of the manager
+        :return: number of the employees in the org, including the manager
+        """
+        entry = self._get_entry(eid)
+        return self._exits[entry] - entry
+
+    def get_org_salary(self, eid: int) -> int:
+        """
+        :param eid: id of the manager
+        :return: total salary of the org, including the manager, None salary is regarded as 0
+        """
+        return self._subtree_salaries[self._get_entry(eid)]
+
+    def get_depth(self, eid: int) -> int:
+        """
+        :param eid: id of the employee
+        :return: number of managers above the employee, 0 if the employee doesn't have a manager
+        """
+        return self._depths[self._get_entry(eid)]
+
+    def _get_entry(self, eid: int) -> int:
+        if eid not in self._entry_dict:
+            raise ValueError(f"can't find the employee with id: {eid}")
+        return self._entry_dict[eid]
@@ -0,0 +1,105 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from json import JSONDecodeError
+from typing import Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from service.employee_service import get_employee_list, get_total_salary
+from utils import JSON_LINES_SUFFIX, RESOURCES_DIR
+
+
+class EmployeeReport:
+    """
+    The report of one roster file generated by `generate_reports`. If the file couldn't be loaded, `get_error_type`
+    returns the name of the exception, e.g. `FileNotFoundError`, `JSONDecodeError`, `ValidationError` or `ValueError`,
+    and `get_error` returns the same message as `employee_printer` prints. Only plain values are kept, so the report can
+    be sent back from a worker process.
+    """
+
+    def __init__(self, file_name: str, employee_count: int = 0, total_salary: int = 0,
+                 error_type: Optional[str] = None, error: Optional[str] = None):
+        self._file_name = file_name
+        self._employee_count = employee_count
+        self._total_salary = total_salary
+        self._error_type = error_type
+        self._error = error
+
+    def get_file_name(self):
+        return self._file_name
+
+    def get_employee_count(self):
+        return self._employee_count
+
+    def get_total_salary(self):
+        return self._total_salary
+
+    def get_error_type(self):
+        return self._error_type
+
+    def get_error(self):
+        return self._error
+
+    def is_successful(self):
+        return self._error_type is None
+
+
+def get_resource_file_list(pattern: str) -> List[str]:
+    """
+    List the files under `/resources/` path by the input glob pattern, e.g. `test/*.json`. If the pattern is a
+    directory, all the `.json` and `.jsonl` files in the directory will be listed. The file names are relative to
+    `/resources/` path and sorted, so they can be passed to `get_employee_list` directly.
+
+    :param pattern: glob pattern or directory relative to `/resources/` path
+    :return: sorted file names
+    """
+    path = os.path.join(RESOURCES_DIR, pattern)
+    if os.path.isdir(path):
+        file_list = glob.glob(os.path.join(path, '*.json')) + glob.glob(os.path.join(path, '*' + JSON_LINES_SUFFIX))
+    else:
+        file_list = glob.glob(path)
+
+    return sorted(file_name.replace(RESOURCES_DIR, '') for file_name in file_list)
+
+
+def generate_reports(pattern: str, max_workers: Optional[int] = None) -> Iterator[EmployeeReport]:
+    """
+    Generate the reports of all the files listed by `get_resource_file_list` across a process pool. Every file is
+    loaded by `get_employee_list` and summed up by `get_total_salary` in a worker process, and the reports are
+    yielded in the order of the file names as soon as they're ready, no matter which worker finishes first. A file
+    which couldn't be loaded doesn't stop the others, its error is kept in the report instead.
+
+    :param pattern: glob pattern or directory relative to `/resources/` path
+    :param max_workers: number of worker processes, None to use the number of processors
+    :return: Iterator[EmployeeReport] in the order of the file names
+    """
+    file_list = get_resource_file_list(pattern)
+    if not file_list:
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(generate_report, file_list)
+
+
+def generate_report(file_name: str) -> EmployeeReport:
+    """
+    Generate the report of one file, the errors are handled in the same way as `employee_printer`.
+
+    :param file_name: file name
+    :return: EmployeeReport
+    """
+    try:
+        employee_list = get_employee_list(file_name)
+        return EmployeeReport(file_name, len(employee_list), get_total_salary(employee_list))
+    except FileNotFoundError:
+        return EmployeeReport(file_name, error_type=FileNotFoundError.__name__, error=f"file not found: {file_name}")
+    except JSONDecodeError:
+        return EmployeeReport(file_name, error_type=JSONDecodeError.__name__,
+                              error=f"the json file has wrong format: {file_name}")
+    except (ValueError, ValidationError) as error:
+        return EmployeeReport(file_name, error_type=type(error).__name__, error=f"something went wrong: {error}")
+    except Exception as error:
+        # e.g. TypeError of a record which isn't an object, like `EXIT_UNEXPECTED_ERROR` of `employee_printer`
+        return EmployeeReport(file_name, error_type=type(error).__name__,
+                              error=f"unexpected error of {file_name}: {type(error).__name__}: {error}")
@@ -0,0 +1,250 @@
+from typing import List, Optional, Sequence
+
+from conf.employee_definition import Employee
+from conf.employee_table import INT64_MAX, INT64_MIN, EmployeeTable, OutOfRangeError
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+class SalaryStats:
+    """
+    The salary statistics of groups of employees generated by `SalaryAnalytics`, kept as numpy arrays of one value per
+    group, the groups are sorted by their keys:
+
+        - `get_keys`: key of every group, e.g. id of the manager or depth
+        - `get_headcounts`: number of the employees, including the ones without a salary
+        - `get_missing_counts`: number of the employees whose salary is null
+        - `get_totals`: total salary, the same as `get_total_salary` of the group, an array of Python ints rather than
+          int64 if a total might not fit in int64, see `SalaryAnalytics`
+        - `get_means`: mean of the salaries which aren't null, nan if there's none
+        - `get_percentiles`: one row per group, one column per percentile, linearly interpolated like `numpy.percentile`
+          over the salaries which aren't null, nan if there's none
+    """
+
+    def __init__(self, keys, headcounts, missing_counts, totals, means, percentile_values,
+                 percentiles: Sequence[float]):
+        self._keys = keys
+        self._headcounts = headcounts
+        self._missing_counts = missing_counts
+        self._totals = totals
+        self._means = means
+        self._percentile_values = percentile_values
+        self._percentiles = tuple(percentiles)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get_keys(self):
+        return self._keys
+
+    def get_headcounts(self):
+        return self._headcounts
+
+    def get_missing_counts(self):
+        return self._missing_counts
+
+    def get_totals(self):
+        return self._totals
+
+    def get_means(self):
+        return self._means
+
+    def get_percentiles(self):
+        return self._percentile_values
+
+    def to_dict_list(self) -> List[dict]:
+        """
+        :return: one dict of plain values per group, nan is converted to None, so the list can be dumped as json
+        """
+        return [{
+            'key': int(self._keys[index]),
+            'headcount': int(self._headcounts[index]),
+            'missing_count': int(self._missing_counts[index]),
+            'total': int(self._totals[index]),
+            'mean': _to_float(self._means[index]),
+            'percentiles': {percentile: _to_float(value)
+                            for percentile, value in zip(self._percentiles, self._percentile_values[index])},
+        } for index in range(len(self._keys))]
+
+
+class SalaryAnalytics:
+    """
+    Vectorized salary analytics of a loaded hierarchy, it requires numpy. The salaries and the managers are pulled into
+    numpy arrays once, and then every statistic is computed by numpy over the whole arrays rather than a Python loop
+    per employee. Every employee is a row:
+
+        - `_salaries`: salary of the row as int64, 0 if the salary is null
+        - `_has_salaries`: False if the salary is null
+        - `_manager_rows`: row of the manager, -1 if the row doesn't have a manager
+        - `_depths`: number of the managers above the row, computed lazily by pointer jumping, O(n log depth)
+
+    Create it by `from_employee_list` or `from_employee_table`, the latter shares the columns of the table without
+    creating any `Employee`. The salaries are summed up as int64 only if no total can overflow, that is, the largest
+    absolute salary times the number of rows fits in int64, otherwise they're summed up as Python ints, which numpy
+    never wraps around silently, so the totals are always exact.
+    """
+
+    def __init__(self, eids, manager_rows, salaries, has_salaries):
+        """
+        :param eids: id of every row
+        :param manager_rows: row of the manager of every row, -1 if the row doesn't have a manager
+        :param salaries: salary of every row, 0 if the salary is null
+        :param has_salaries: False if the salary of the row is null
+        """
+        if numpy is None:
+            raise ImportError('numpy is required by SalaryAnalytics')
+
+        self._eids = numpy.asarray(eids, dtype=numpy.int64)
+        self._manager_rows = numpy.asarray(manager_rows, dtype=numpy.int64)
+        self._salaries = numpy.asarray(salaries, dtype=numpy.int64)
+        self._has_salaries = numpy.asarray(has_salaries, dtype=numpy.bool_)
+        self._depths = None
+        # the bound of any total, the absolute values are taken as Python ints, since abs of the int64 minimum overflows
+        self._may_overflow = bool(len(self._salaries)) and max(
+            abs(int(self._salaries.max())), abs(int(self._salaries.min()))) * len(self._salaries) > INT64_MAX
+
+    @classmethod
+    def from_employee_list(cls, employee_list: List[Employee]) -> 'SalaryAnalytics':
+        """
+        The ids and the salaries are pulled into int64 arrays like the columns of `EmployeeTable`, an `OutOfRangeError`
+        is raised if any of them is out of [`INT64_MIN`, `INT64_MAX`].
+
+        :param employee_list: `Employee`, `Manager` or `EmployeeView` list, e.g. generated by get_employee_list, the
+            manager of every employee must be in the list as well
+        :return: SalaryAnalytics
+        """
+        row_dict = {employee.get_eid(): row for row, employee in enumerate(employee_list)}
+        salary_list = [employee.get_salary() for employee in employee_list]
+        manager_list = [employee.get_manager() for employee in employee_list]
+        size = len(employee_list)
+
+        return cls(_get_int64_array([employee.get_eid() for employee in employee_list], 'id'),
+                   numpy.fromiter((row_dict[manager.get_eid()] if manager is not None else -1
+                                   for manager in manager_list), dtype=numpy.int64, count=size),
+                   _get_int64_array([salary or 0 for salary in salary_list], 'salary'),
+                   numpy.fromiter((salary is not None for salary in salary_list), dtype=numpy.bool_, count=size))
+
+    @classmethod
+    def from_employee_table(cls, employee_table: EmployeeTable) -> 'SalaryAnalytics':
+        """
+        :param employee_table: e.g. generated by get_employee_table, or `LazyEmployeeHierarchy.get_employee_table`
+        :return: SalaryAnalytics sharing the columns of the table
+        """
+        eids, manager_rows, salaries, has_salaries = employee_table.get_salary_columns()
+        return cls(numpy.frombuffer(eids, dtype=numpy.int64), numpy.frombuffer(manager_rows, dtype=numpy.int64),
+                   numpy.frombuffer(salaries, dtype=numpy.int64),
+                   numpy.frombuffer(has_salaries, dtype=numpy.uint8).view(numpy.bool_))
+
+    def __len__(self):
+        return len(self._eids)
+
+    def get_total_salary(self) -> int:
+        """
+        :return: the same total as `get_total_salary`
+        """
+        if self._may_overflow:
+            return sum(self._salaries.tolist())
+        return int(self._salaries.sum())
+
+    def get_missing_salary_count(self) -> int:
+        return int(len(self._has_salaries) - numpy.count_nonzero(self._has_salaries))
+
+    def get_depths(self):
+        """
+        :return: int64 array of the number of the managers above every row, 0 if the row doesn't have a manager
+        """
+        if self._depths is None:
+            # every row jumps to the manager of its current ancestor and adds up the distance in every round, so the
+            # distance to the top is found in O(log depth) rounds
+            ancestors = self._manager_rows.copy()
+            depths = (ancestors >= 0).astype(numpy.int64)
+            rows = numpy.flatnonzero(ancestors >= 0)
+            while len(rows):
+                jumps = ancestors[rows]
+                depths[rows] += depths[jumps]
+                ancestors[rows] = ancestors[jumps]
+                rows = rows[ancestors[rows] >= 0]
+            self._depths = depths
+
+        return self._depths
+
+    def get_summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> dict:
+        """
+        :param percentiles: percentiles in [0, 100]
+        :return: the statistics of all the employees, a dict in the same shape as `SalaryStats.to_dict_list` but the key
+        """
+        summary = self._get_stats(numpy.zeros(len(self._eids), dtype=numpy.int64), percentiles).to_dict_list()
+        if summary:
+            del summary[0]['key']
+            return summary[0]
+
+        return {'headcount': 0, 'missing_count': 0, 'total': 0, 'mean': None,
+                'percentiles': {percentile: None for percentile in percentiles}}
+
+    def get_stats_by_manager(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> SalaryStats:
+        """
+        :param percentiles: percentiles in [0, 100]
+        :return: the statistics of the direct members of every manager, keyed by id of the manager
+        """
+        has_managers = self._manager_rows >= 0
+        return self._get_stats(self._eids[self._manager_rows[has_managers]], percentiles, has_managers)
+
+    def get_stats_by_depth(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> SalaryStats:
+        """
+        :param percentiles: percentiles in [0, 100]
+        :return: the statistics of every level of the hierarchy, keyed by depth, see `get_depths`
+        """
+        return self._get_stats(self.get_depths(), percentiles)
+
+    def _get_stats(self, keys, percentiles: Sequence[float], row_mask=None) -> SalaryStats:
+        salaries = self._salaries if row_mask is None else self._salaries[row_mask]
+        has_salaries = self._has_salaries if row_mask is None else self._has_salaries[row_mask]
+        percentile_array = numpy.asarray(percentiles, dtype=numpy.float64)
+        if ((percentile_array < 0) | (percentile_array > 100)).any():
+            raise ValueError(f"percentiles must be in [0, 100]: {list(percentiles)}")
+
+        # sort the rows by key, and then by salary, so every group is a slice with its salaries in ascending order, the
+        # null salaries are moved to the end of the group
+        order = numpy.lexsort((salaries, ~has_salaries, keys))
+        sorted_keys = keys[order]
+        group_keys, starts, headcounts = numpy.unique(sorted_keys, return_index=True, return_counts=True)
+        if not len(group_keys):
+            empty = numpy.zeros(0, dtype=numpy.int64)
+            return SalaryStats(empty, empty, empty, empty, numpy.zeros(0),
+                               numpy.zeros((0, len(percentile_array))), percentiles)
+
+        sorted_salaries = salaries[order]
+        totals = numpy.add.reduceat(sorted_salaries.astype(object) if self._may_overflow else sorted_salaries, starts)
+        salary_counts = numpy.add.reduceat(has_salaries[order].astype(numpy.int64), starts)
+
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            means = numpy.where(salary_counts > 0, totals.astype(numpy.float64) / salary_counts, numpy.nan)
+
+        # the same linear interpolation as `numpy.percentile`, between the two closest salaries of every group
+        positions = (numpy.maximum(salary_counts, 1) - 1)[:, None] * (percentile_array / 100)[None, :]
+        lower = numpy.floor(positions).astype(numpy.int64)
+        upper = numpy.ceil(positions).astype(numpy.int64)
+        lower_values = sorted_salaries[starts[:, None] + lower].astype(numpy.float64)
+        upper_values = sorted_salaries[starts[:, None] + upper].astype(numpy.float64)
+        percentile_values = lower_values + (upper_values - lower_values) * (positions - lower)
+        percentile_values[salary_counts == 0] = numpy.nan
+
+        return SalaryStats(group_keys, headcounts, headcounts - salary_counts, totals, means, percentile_values,
+                           percentiles)
+
+
+def _to_float(value) -> Optional[float]:
+    return None if numpy.isnan(value) else float(value)
+
+
+def _get_int64_array(values: List[int], field: str):
+    try:
+        return numpy.array(values, dtype=numpy.int64)
+    except OverflowError:
+        value = next(value for value in values if not INT64_MIN <= value <= INT64_MAX)
+        raise OutOfRangeError(f"{field} is out of the 64-bit range of SalaryAnalytics: {value}") from None
@@ -0,0 +1,236 @@
+import json
+import os
+from collections import deque, namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from conf.employee_definition import Employee, iter_employee_json
+from service.employee_service import (EmployeeMapper, get_employee_list, sort_employee_list,
+                                      validate_employee_json_dict)
+from utils import JSON_LINES_SUFFIX, RESOURCES_DIR, loads_json
+
+# number of bytes of a shard, before it's moved to a line boundary or after a `}`
+SHARD_BYTES = 1 << 22
+# number of bytes read at a time while looking for the `}` before a shard boundary
+_CUT_SCAN_BYTES = 1 << 16
+_WHITESPACE = b' \t\n\r'
+
+# the columns of a validated shard, ids, first names, manager ids and salaries, None if the shard couldn't be validated
+Shard = Optional[Tuple[List[int], List[str], List[Optional[int]], List[Optional[int]]]]
+
+
+class _ShardRecord(namedtuple('_ShardRecord', 'id first_name manager salary')):
+    """
+    A validated record merged from a shard, it has the same getters as `EmployeeJson`, so `EmployeeMapper` maps it the
+    same way, without paying for another pydantic model in the main process.
+    """
+    __slots__ = ()
+
+    def get_id(self):
+        return self.id
+
+    def get_first_name(self):
+        return self.first_name
+
+    def get_manager(self):
+        return self.manager
+
+    def get_salary(self):
+        return self.salary
+
+
+class _ShardFailure(Exception):
+    # a shard is invalid or has a duplicate id, the serial path is run to raise the error
+    pass
+
+
+def get_employee_list_by_shards(file_name: str, json_lines: Optional[bool] = None, max_workers: Optional[int] = None,
+                                shard_bytes: int = SHARD_BYTES) -> List[Employee]:
+    """
+    The sharded counterpart of `get_employee_list` for one huge file. The file is split into byte ranges of about
+    `shard_bytes`, and every worker process reads, parses and validates its own range, so nothing but the columns of
+    the validated records is sent back, rather than `EmployeeJson` instances:
+
+        - a JSON Lines file is split at line boundaries, see `_build_shard_from_lines`
+        - a top-level json array is split right after a `}`, see `_build_shard_from_array`. A `}` might be inside a
+          string or a nested object rather than at the end of an element, then the range fails to parse, and the file
+          is loaded serially, so it's only worth it for records without `}` in their values, like the rosters
+
+    The main process merges the shards in order, and then runs the global checks, duplicate id and `validate_hierarchy`
+    with the missing managers, and links and sorts the hierarchy like `get_employee_list`, so the result is identical.
+    If any shard can't be validated, or a duplicate id is found, the file is loaded by `get_employee_list` again to
+    raise exactly the same error as the serial path, so an invalid file costs about twice as much.
+
+    :param file_name: file name
+    :param json_lines: see `utils.iter_json_list_by_file`
+    :param max_workers: number of worker processes, None to use the number of processors
+    :param shard_bytes: number of bytes of a shard
+    :return: sorted List[Employee], the same as `get_employee_list`
+    """
+    if json_lines is None:
+        json_lines = file_name.endswith(JSON_LINES_SUFFIX)
+
+    try:
+        file_size = os.path.getsize(RESOURCES_DIR + file_name)
+    except FileNotFoundError:
+        return get_employee_list(file_name, json_lines)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        if json_lines:
+            argument_iterable = ((file_name, start, start + shard_bytes) for start in range(0, file_size, shard_bytes))
+            shard_iterator = _map_in_order(executor, _build_shard_from_lines, argument_iterable, max_workers * 2)
+        else:
+            cut_list = _get_array_cut_list(file_name, file_size, shard_bytes)
+            argument_iterable = ((file_name, start, end, file_size) for start, end in zip(cut_list, cut_list[1:]))
+            shard_iterator = _map_in_order(executor, _build_shard_from_array, argument_iterable, max_workers * 2)
+        employee_json_dict = _merge_shards(shard_iterator)
+    except _ShardFailure:
+        return get_employee_list(file_name, json_lines)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    validate_employee_json_dict(employee_json_dict)
+    employee_list = EmployeeMapper().map_to_employee_list(employee_json_dict)
+    sort_employee_list(employee_list)
+
+    return employee_list
+
+
+def _map_in_order(executor: Executor, function: Callable, argument_iterable: Iterable, window: int) -> Iterator:
+    """
+    Like `Executor.map`, but at most `window` shards are submitted ahead of the one being merged, so the shards are
+    never all parsed and queued in memory at once.
+    """
+    pending = deque()
+    for arguments in argument_iterable:
+        pending.append(executor.submit(function, *arguments))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _merge_shards(shard_iterable: Iterable) -> Dict[int, _ShardRecord]:
+    employee_json_dict: Dict[int, _ShardRecord] = {}
+    for shard in shard_iterable:
+        if shard is None:
+            raise _ShardFailure()
+
+        size = len(employee_json_dict)
+        employee_json_dict.update(zip(shard[0], map(_ShardRecord, *shard)))
+        if len(employee_json_dict) != size + len(shard[0]):
+            raise _ShardFailure()
+
+    return employee_json_dict
+
+
+def _build_shard_from_lines(file_name: str, start: int, end: int) -> Shard:
+    """
+    Parse and validate the lines starting in the byte range [start, end) of a JSON Lines file. A line cut by `start`
+    belongs to the previous range.
+    """
+    record_list = []
+    try:
+        with open(RESOURCES_DIR + file_name, 'rb') as file:
+            if start:
+                file.seek(start - 1)
+                if file.read(1) != b'\n':
+                    file.readline()
+
+            while file.tell() < end:
+                line = file.readline()
+                if not line:
+                    break
+                # a lone carriage return splits the line in text mode, leave it to the serial path
+                if b'\r' in line.rstrip(b'\r\n'):
+                    return None
+                if line.strip():
+                    record_list.append(json.loads(line.decode('utf-8')))
+    except Exception:
+        # e.g. JSONDecodeError or UnicodeDecodeError, the serial path raises it again
+        return None
+
+    return _build_shard_from_records(record_list)
+
+
+def _get_array_cut_list(file_name: str, file_size: int, shard_bytes: int) -> List[int]:
+    """
+    :return: the boundaries of the shards of a top-level json array, 0, the position right after the last `}` before
+        every multiple of `shard_bytes`, and the file size, in ascending order without duplicates
+    """
+    cut_list = [0]
+    with open(RESOURCES_DIR + file_name, 'rb') as file:
+        for position in range(shard_bytes, file_size, shard_bytes):
+            cut = _find_cut(file, position, cut_list[-1])
+            if cut > cut_list[-1]:
+                cut_list.append(cut)
+    cut_list.append(file_size)
+    return cut_list
+
+
+def _find_cut(file: BinaryIO, position: int, lower: int) -> int:
+    # scan backward from `position` for a `}`, but never before the previous cut, so the file is scanned once at most
+    end = position
+    while end > lower:
+        start = max(end - _CUT_SCAN_BYTES, lower)
+        file.seek(start)
+        index = file.read(end - start).rfind(b'}')
+        if index >= 0:
+            return start + index + 1
+        end = start
+    return lower
+
+
+def _build_shard_from_array(file_name: str, start: int, end: int, file_size: int) -> Shard:
+    """
+    Parse and validate the byte range [start, end) of a top-level json array, see `_get_array_cut_list`. The range
+    starts with `[` if it's the first one, or with the `,` after the previous range, and ends with `]` if it's the last
+    one, which might be nothing but the `]`. The elements in between are parsed at once as `[` + elements + `]` by
+    `loads_json`. Since the first range starts at an element and every range ends at a `}`, which closes a value
+    without any lookahead, the elements parse only if the range ends at an element boundary, and so does the next
+    range start at one.
+    """
+    try:
+        with open(RESOURCES_DIR + file_name, 'rb') as file:
+            file.seek(start)
+            data = file.read(end - start).lstrip(_WHITESPACE)
+
+        has_comma = start > 0 and data.startswith(b',')
+        if data.startswith(b'[' if start == 0 else b','):
+            data = data[1:]
+        elif not (end == file_size and data.startswith(b']')):
+            # only the last range might have nothing but the closing `]`
+            return None
+        if end == file_size:
+            data = data.rstrip(_WHITESPACE)
+            if not data.endswith(b']'):
+                return None
+            data = data[:-1]
+        # a `,` must be followed by an element, e.g. `[{"id": 1},]` is invalid
+        if has_comma and not data.strip(_WHITESPACE):
+            return None
+
+        record_list = loads_json(b'[' + data + b']')
+    except Exception:
+        # e.g. JSONDecodeError, or a range cut inside a string, the serial path raises the error if there's any
+        return None
+
+    return _build_shard_from_records(record_list)
+
+
+def _build_shard_from_records(record_list: List[dict]) -> Shard:
+    id_list, first_name_list, manager_list, salary_list = [], [], [], []
+    try:
+        for employee_json in iter_employee_json(record_list):
+            id_list.append(employee_json.get_id())
+            first_name_list.append(employee_json.get_first_name())
+            manager_list.append(employee_json.get_manager())
+            salary_list.append(employee_json.get_salary())
+    except Exception:
+        # e.g. ValidationError, the serial path raises it again
+        return None
+
+    return id_list, first_name_list, manager_list, salary_list
@@ -0,0 +1,169 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from typing import List, Optional
+
+from conf.employee_table import EmployeeTable, EmployeeView
+from service.employee_service import get_employee_table, sort_employee_list
+from utils import CACHE_DIR, RESOURCES_DIR
+
+SNAPSHOT_SUFFIX = '.snapshot'
+DEFAULT_MAX_BYTES = 1 << 30
+
+# bumped whenever the layout or the order of the stored rows changes, so an older snapshot is rebuilt
+_MAGIC = b'IMNSNAP2'
+# magic, content digest, size and mtime of the source file, row count of the order
+_HEADER = struct.Struct('=8s32sqqq')
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+class SnapshotCache:
+    """
+    A persistent on-disk cache of the hierarchies loaded by `get_employee_table_list`. Every resource file has one
+    snapshot file named by the hash of its absolute path, which contains:
+
+        - a header of the size, mtime and content digest of the resource file when it was loaded
+        - the rows of `EmployeeTable` in the order of `get_employee_order_key`
+        - the `EmployeeTable` in the format of `EmployeeTable.to_bytes`
+
+    A snapshot is valid if the size and mtime of the resource file are unchanged, or if only the mtime is changed but
+    the content digest is still the same. The snapshot is memory-mapped and the table reads its columns from the mapped
+    file directly, so a hit doesn't parse, validate or copy anything. The snapshots are evicted in least recently used
+    order once their total size exceeds `max_bytes`.
+
+    The cache is only an optimization, if a snapshot can't be written, touched or evicted, e.g. the cache directory is
+    read-only or a snapshot is removed by another process meanwhile, the loaded hierarchy is returned all the same.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+
+    def get_employee_list(self, file_name: str, json_lines: Optional[bool] = None) -> List[EmployeeView]:
+        """
+        The cached counterpart of `get_employee_table_list`, the same errors are raised if the resource file has to be
+        loaded and it's invalid.
+
+        :param file_name: file name
+        :param json_lines: see `utils.iter_json_list_by_file`
+        :return: sorted List[EmployeeView]
+        """
+        source_path = os.path.abspath(RESOURCES_DIR + file_name)
+        source_stat = os.stat(source_path)
+        snapshot_path = self.get_snapshot_path(source_path)
+
+        employee_list = self._load(snapshot_path, source_path, source_stat)
+        if employee_list is not None:
+            return employee_list
+
+        digest = _get_digest(source_path)
+        employee_table = get_employee_table(file_name, json_lines)
+        employee_list = employee_table.get_employee_list()
+        sort_employee_list(employee_list)
+
+        # the resource file might be changed during the loading, and then it's not worth storing
+        if _is_same_file(source_stat, os.stat(source_path)):
+            order = array('q', (employee.get_row() for employee in employee_list))
+            try:
+                self._store(snapshot_path, digest, source_stat, order, employee_table)
+                self._evict()
+            except OSError:
+                pass
+
+        return employee_list
+
+    def get_snapshot_path(self, source_path: str) -> str:
+        name = hashlib.sha256(os.path.abspath(source_path).encode('utf-8')).hexdigest()
+        return os.path.join(self._cache_dir, name + SNAPSHOT_SUFFIX)
+
+    def _load(self, snapshot_path: str, source_path: str, source_stat: os.stat_result) -> Optional[List[EmployeeView]]:
+        try:
+            with open(snapshot_path, 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # e.g. FileNotFoundError, or ValueError raised while mapping an empty file
+            return None
+
+        if len(buffer) < _HEADER.size:
+            buffer.close()
+            return None
+
+        magic, digest, size, mtime_ns, order_length = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or size != source_stat.st_size:
+            buffer.close()
+            return None
+
+        if mtime_ns != source_stat.st_mtime_ns and digest != _get_digest(source_path):
+            buffer.close()
+            return None
+
+        try:
+            if mtime_ns != source_stat.st_mtime_ns:
+                # the content is the same, keep the snapshot valid for the new mtime
+                self._store_header(snapshot_path, digest, source_stat, order_length)
+            # the snapshot is the most recently used one now
+            os.utime(snapshot_path)
+        except OSError:
+            # the mapped snapshot is still valid even if it can't be updated, e.g. it's evicted meanwhile
+            pass
+        view = memoryview(buffer)
+        offset = _HEADER.size + order_length * 8
+        order = view[_HEADER.size:offset].cast('q')
+        employee_table = EmployeeTable.from_buffer(view[offset:])
+        return [EmployeeView(employee_table, row) for row in order]
+
+    def _store(self, snapshot_path: str, digest: bytes, source_stat: os.stat_result, order: array,
+               employee_table: EmployeeTable):
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+        # write to a temporary file first, so a reader never maps a partially written snapshot
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as file:
+                file.write(_HEADER.pack(_MAGIC, digest, source_stat.st_size, source_stat.st_mtime_ns, len(order)))
+                file.write(bytes(order))
+                file.write(employee_table.to_bytes())
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _store_header(self, snapshot_path: str, digest: bytes, source_stat: os.stat_result, order_length: int):
+        with open(snapshot_path, 'r+b') as file:
+            file.write(_HEADER.pack(_MAGIC, digest, source_stat.st_size, source_stat.st_mtime_ns, order_length))
+
+    def _evict(self):
+        snapshot_list = []
+        for entry in os.scandir(self._cache_dir):
+            if entry.name.endswith(SNAPSHOT_SUFFIX):
+                try:
+                    entry_stat = entry.stat()
+                except FileNotFoundError:
+                    # evicted by another process during the scan
+                    continue
+                snapshot_list.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in snapshot_list)
+        for _, size, path in sorted(snapshot_list):
+            if total_bytes <= self._max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+
+def _get_digest(source_path: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=32)
+    with open(source_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _is_same_file(stat: os.stat_result, other_stat: os.stat_result) -> bool:
+    return stat.st_size == other_stat.st_size and stat.st_mtime_ns == other_stat.st_mtime_ns
@@ -1,24 +1,353 @@
+import codecs
+import io
 import json
+import mmap
 import os
+import re
+import sys
 from json import JSONDecodeError
+from typing import Callable, Iterable, Iterator, Optional
+
+from instrumentation import measure_stage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 SOURCE_ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 RESOURCES_DIR = os.path.join(SOURCE_ROOT_DIR, '../resources/')
+CACHE_DIR = os.path.join(SOURCE_ROOT_DIR, '../.cache/')
+
+JSON_LINES_SUFFIX = '.jsonl'
+CHUNK_SIZE = 1 << 16
+# files from this size on are memory-mapped if `use_mmap` is None
+MMAP_THRESHOLD = 1 << 26
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# the rest of a number, a decoded value followed by only these up to the end of the buffer might be cut, e.g. `1.`
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*')
+_INCOMPLETE = object()
+
+# orjson is strict json, so it never accepts a document rejected by `json`, `json` is used if orjson isn't installed
+JSON_BACKEND = 'orjson' if orjson else 'json'
+# orjson turns an integer out of 64 bits into float, a document with such a long run of digits is left to `json`, the
+# runs are found by mapping every digit to 0 and anything else to a space, which is much faster than a regex
+_DIGIT_TABLE = bytes(ord('0') if chr(byte).isdigit() and byte < 128 else ord(' ') for byte in range(256))
+_LONG_DIGITS = b'0' * 19
+_DIGIT_SCAN_SIZE = 1 << 20
 
 
-def get_json_list_by_file(file_name: str):
+def get_json_list_by_file(file_name: str, use_mmap: Optional[bool] = None):
     """
-    Get json list from resource. It'll find the file from `/resources/` path by the input file name. Noted that it might
-    raise `JSONDecodeError` and `FileNotFoundError`.
+    Get json list from resource. It'll find the file from `/resources/` path by the input file name. The file is read
+    as bytes at once and closed, and then parsed by `loads_json`. With `use_mmap`, the file is memory-mapped instead,
+    and orjson parses the mapped pages directly, so neither a copy of the bytes nor a decoded string is kept, and the
+    pages are shared with the other processes loading the same file. Noted that it might raise `JSONDecodeError` and
+    `FileNotFoundError`, which are printed to stderr as well, so stdout is left to the reports.
 
     :param file_name: file name
+    :param use_mmap: True to memory-map the file, None to map it only if orjson is installed and the file size is
+        `MMAP_THRESHOLD` or more, since `json` has to copy the mapped bytes anyway
     :return:
     """
     try:
-        return json.load(open(RESOURCES_DIR + file_name))
+        path = RESOURCES_DIR + file_name
+        if _is_mapped(path, use_mmap, default=bool(orjson)):
+            with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return loads_json(mapped)
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        return loads_json(data)
+    except JSONDecodeError as err:
+        print(f"error occurs while parsing json file. {err}", file=sys.stderr)
+        raise
+    except FileNotFoundError as err:
+        print(f"file not found, please check the data path. {err}", file=sys.stderr)
+        raise
+
+
+def loads_json(data):
+    """
+    Parse utf-8 encoded json by `JSON_BACKEND`. If the backend fails, the data is parsed by `json` of the standard
+    library again, which is the one deciding the result. Therefore, the backend only makes valid documents faster,
+    while an invalid one raises exactly the same `JSONDecodeError` as `json.load` of a text file, and a document only
+    accepted by `json`, e.g. NaN, is still accepted. A document with 19 or more digits in a row is parsed by `json`
+    directly, since orjson doesn't keep the integers out of 64 bits as `int`.
+
+    :param data: utf-8 encoded json, bytes or `mmap.mmap`
+    :return: parsed json
+    """
+    if orjson and not _has_long_digits(data):
+        with memoryview(data) as view:
+            try:
+                return orjson.loads(view)
+            except orjson.JSONDecodeError:
+                pass
+
+    # decode like a text file, so the positions in the error are the same as `json.load(open(file_name))`
+    return json.load(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'))
+
+
+def iter_json_list_by_file(file_name: str, json_lines: Optional[bool] = None, chunk_size: int = CHUNK_SIZE,
+                           use_mmap: Optional[bool] = None) -> Iterator[dict]:
+    """
+    Iterate json records from resource one at a time. Unlike `get_json_list_by_file`, the file is read in chunks of
+    `chunk_size` characters and only the records of one chunk are decoded at a time, so the whole top-level array never
+    has to be materialized. If `json_lines` is None, files ending with `.jsonl` are read as JSON Lines, one record per
+    line. Both the batches of a chunk and the lines are parsed by `JSON_BACKEND`, see `_loads_record`. With
+    `use_mmap`, the chunks and the lines are decoded from the memory-mapped file instead of being read, so the pages
+    are shared with the other processes loading the same file, and the lines are split on the same newlines as a text
+    file, see `_iter_universal_lines`. Noted that it might raise `JSONDecodeError` and
+    `FileNotFoundError` while iterating, which are printed to stderr as well.
+
+    :param file_name: file name
+    :param json_lines: True for JSON Lines, False for a top-level json array, None to decide by the file suffix
+    :param chunk_size: number of characters read from the file at a time
+    :param use_mmap: True to memory-map the file, None to map it only if the file size is `MMAP_THRESHOLD` or more
+    :return: iterator of json records
+    """
+    if json_lines is None:
+        json_lines = file_name.endswith(JSON_LINES_SUFFIX)
+
+    read_stage = measure_stage('read')
+    try:
+        path = RESOURCES_DIR + file_name
+        if _is_mapped(path, use_mmap, default=True):
+            with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if json_lines:
+                    lines = iter(read_stage.wrap(mapped.readline), b'')
+                    yield from _iter_json_lines(_iter_universal_lines(lines))
+                else:
+                    yield from _iter_json_array(read_stage.wrap(_MappedReader(mapped).read), chunk_size)
+            return
+
+        with open(path, encoding='utf-8') as file:
+            if json_lines:
+                yield from _iter_json_lines(iter(read_stage.wrap(file.readline), ''))
+            else:
+                yield from _iter_json_array(read_stage.wrap(file.read), chunk_size)
     except JSONDecodeError as err:
-        print(f"error occurs while parsing json file. {err}")
+        print(f"error occurs while parsing json file. {err}", file=sys.stderr)
         raise
     except FileNotFoundError as err:
-        print(f"file not found, please check the data path. {err}")
+        print(f"file not found, please check the data path. {err}", file=sys.stderr)
         raise
+    finally:
+        read_stage.close()
+
+
+class _MappedReader:
+    """
+    `read` of a text file on top of a memory-mapped file, the bytes are decoded chunk by chunk, so a character cut by
+    the end of a chunk is completed by the next one.
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+        self._position = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def read(self, size: int) -> str:
+        while True:
+            chunk = self._mapped[self._position:self._position + size]
+            self._position += len(chunk)
+            text = self._decoder.decode(chunk, final=not chunk)
+            # an empty string means the end of the file, so keep reading if the chunk is only a part of a character
+            if text or not chunk:
+                return text
+
+
+def _iter_universal_lines(lines: Iterable[bytes]) -> Iterator[str]:
+    """
+    `mmap.readline` ends a line at a line feed only, but a file opened in text mode ends a line at any universal
+    newline, `\r\n`, `\r` or `\n`, and translates it to `\n`. The lines are split and translated in the same way here,
+    so the mapped file has the same records and the same error positions as the text file. A carriage return or a line
+    feed is never a part of a multibyte character in utf-8, so every line can be decoded on its own.
+    """
+    for line in lines:
+        text = line.decode('utf-8')
+        if '\r' not in text:
+            yield text
+            continue
+
+        *piece_list, last_piece = text.replace('\r\n', '\n').split('\r')
+        for piece in piece_list:
+            yield piece + '\n'
+        if last_piece:
+            yield last_piece
+
+
+def _is_mapped(path: str, use_mmap: Optional[bool], default: bool) -> bool:
+    size = os.stat(path).st_size
+    if use_mmap is None:
+        use_mmap = default and size >= MMAP_THRESHOLD
+    # an empty file can't be mapped
+    return use_mmap and size > 0
+
+
+def _has_long_digits(data) -> bool:
+    # scan by chunks, so a mapped file is never copied as a whole, the chunks overlap in case a run is cut
+    overlap = len(_LONG_DIGITS) - 1
+    for start in range(0, len(data), _DIGIT_SCAN_SIZE):
+        chunk = bytes(data[max(start - overlap, 0):start + _DIGIT_SCAN_SIZE])
+        if _LONG_DIGITS in chunk.translate(_DIGIT_TABLE):
+            return True
+    return False
+
+
+def _iter_json_lines(lines: Iterable[str]) -> Iterator:
+    # characters of the lines before the current one, so an error is reported at its position in the file
+    consumed = 0
+    for line_index, line in enumerate(lines):
+        if line.strip():
+            try:
+                record = _loads_record(line)
+            except JSONDecodeError as err:
+                raise _get_file_error(err, consumed, line_index, 0) from None
+            yield record
+        consumed += len(line)
+
+
+def _loads_record(text: str):
+    """
+    Parse a piece of json text, e.g. a line of JSON Lines or a batch of array elements, by `JSON_BACKEND` in the same
+    way as `loads_json`: orjson is skipped if the text has 19 or more digits in a row, and if it fails, the text is
+    parsed by `json` again, which decides the result and the error.
+    """
+    if orjson and _LONG_DIGITS not in text.encode('utf-8').translate(_DIGIT_TABLE):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+
+    return json.loads(text)
+
+
+def _get_file_error(err: JSONDecodeError, consumed: int, consumed_lines: int, column: int) -> JSONDecodeError:
+    """
+    :param err: error of a piece of the file
+    :param consumed: number of characters before the piece
+    :param consumed_lines: number of line feeds before the piece
+    :param column: number of characters between the last line feed and the piece
+    :return: the same error with the positions in the whole file, `doc` is still the piece
+    """
+    lineno = consumed_lines + err.lineno
+    colno = err.colno + column if err.lineno == 1 else err.colno
+    pos = consumed + err.pos
+
+    file_error = JSONDecodeError.__new__(JSONDecodeError)
+    ValueError.__init__(file_error, '%s: line %d column %d (char %d)' % (err.msg, lineno, colno, pos))
+    file_error.msg, file_error.doc, file_error.pos, file_error.lineno, file_error.colno = \
+        err.msg, err.doc, pos, lineno, colno
+    return file_error
+
+
+def _iter_json_array(read: Callable[[int], str], chunk_size: int) -> Iterator:
+    """
+    Incremental parser for a top-level json array. The buffer only keeps the characters which haven't been consumed
+    yet, and the elements are parsed in batches: every complete element up to the last `}` in the buffer is parsed at
+    once by `_loads_record` as `[` + batch + `]`, which is one call of orjson or `json` rather than one per element.
+    The batch starts at an element boundary and ends at a `}`, which closes a value without any lookahead, so once it
+    parses, it's exactly the elements of the whole document, a cut inside an element, e.g. a string, doesn't parse.
+
+    If a batch can't be parsed, e.g. the cut is inside a string, or the elements aren't objects, or the json is invalid,
+    the elements of the same range are decoded one by one by `json.JSONDecoder`, with the array punctuation in between
+    scanned here, so an invalid document raises the same `JSONDecodeError` as `json.load`, with the positions in the
+    file. If an element is cut by the end of the buffer, the read size doubles until the element fits, so a huge
+    element costs linear time rather than quadratic.
+
+    :param read: `read` of a text file or alike
+    :param chunk_size: number of characters read at a time
+    :return: iterator of the array elements
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    read_size = chunk_size
+    expecting = '['
+    # characters and line feeds dropped from the front of the buffer, and the column the buffer starts at
+    consumed = consumed_lines = column = 0
+    # the elements are decoded one by one up to this position in the file, after a batch failed
+    unbatched_end = -1
+
+    def read_more():
+        nonlocal buffer, position, eof, consumed, consumed_lines, column
+        line_count = buffer.count('\n', 0, position)
+        if line_count:
+            consumed_lines += line_count
+            column = position - buffer.rfind('\n', 0, position) - 1
+        else:
+            column += position
+        consumed += position
+
+        chunk = read(read_size)
+        buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+
+    def get_error(message: str) -> JSONDecodeError:
+        return _get_file_error(JSONDecodeError(message, buffer, position), consumed, consumed_lines, column)
+
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                if expecting == 'end':
+                    return
+                raise get_error("Expecting ',' delimiter" if expecting == ',' else 'Expecting value')
+
+            read_more()
+            continue
+
+        char = buffer[position]
+        if expecting == '[':
+            if char != '[':
+                raise get_error("Expecting '['")
+            position += 1
+            expecting = 'first'
+        elif expecting == 'first' and char == ']':
+            position += 1
+            expecting = 'end'
+        elif expecting in ('first', 'value'):
+            if consumed + position > unbatched_end:
+                end = buffer.rfind('}', position) + 1
+                if end:
+                    try:
+                        value_list = _loads_record('[' + buffer[position:end] + ']')
+                    except JSONDecodeError:
+                        unbatched_end = consumed + end
+                    else:
+                        position = end
+                        expecting = ','
+                        yield from value_list
+                        continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except JSONDecodeError as err:
+                if eof:
+                    raise _get_file_error(err, consumed, consumed_lines, column) from None
+                value, end = _INCOMPLETE, len(buffer)
+
+            # a value followed by nothing but the characters of a number up to the end of the buffer might be a cut
+            # number, e.g. `1` of `1.5` or `-7` of `-7e2`, read more and decode it again
+            if value is _INCOMPLETE or (not eof and _NUMBER_TAIL.fullmatch(buffer, end)):
+                read_more()
+                read_size *= 2
+                continue
+
+            read_size = chunk_size
+            position = end
+            expecting = ','
+            yield value
+        elif expecting == ',':
+            if char == ',':
+                expecting = 'value'
+            elif char == ']':
+                expecting = 'end'
+            else:
+                raise get_error("Expecting ',' delimiter")
+            position += 1
+        else:
+            raise get_error('Extra data')
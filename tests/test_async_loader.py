@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.service.async_loader import AsyncEmployeeLoader
+from src.service.employee_service import get_employee_list, get_employee_table_list
+
+
+def test_get_employee_list():
+    async def load():
+        return await AsyncEmployeeLoader().get_employee_list('test/employees-test.json')
+
+    employee_list = asyncio.run(load())
+    assert [employee.get_eid() for employee in employee_list] == \
+           [employee.get_eid() for employee in get_employee_list('test/employees-test.json')]
+
+
+def test_get_employee_list_with_error():
+    async def load():
+        return await AsyncEmployeeLoader(load=get_employee_table_list).get_employee_list('test/no_file.json')
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(load())
+
+
+def test_concurrent_requests_of_same_file_share_one_load():
+    call_list = []
+    release = threading.Event()
+
+    def load(file_name, json_lines):
+        call_list.append(file_name)
+        release.wait(5)
+        return [file_name]
+
+    async def load_all():
+        loader = AsyncEmployeeLoader(load=load)
+        task_list = [asyncio.ensure_future(loader.get_employee_list(file_name))
+                     for file_name in ['a.json'] * 10 + ['b.json'] * 5]
+        await asyncio.sleep(0.05)
+        assert loader.get_in_flight_count() == 2
+        release.set()
+        result_list = await asyncio.gather(*task_list)
+        assert loader.get_in_flight_count() == 0
+        return result_list
+
+    result_list = asyncio.run(load_all())
+    assert sorted(call_list) == ['a.json', 'b.json']
+    assert result_list == [['a.json']] * 10 + [['b.json']] * 5
+    assert result_list[0] is result_list[9]
+
+
+def test_max_concurrency():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def load(file_name, json_lines):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        threading.Event().wait(0.02)
+        with lock:
+            running[0] -= 1
+        return file_name
+
+    async def load_all():
+        loader = AsyncEmployeeLoader(max_concurrency=2, load=load)
+        return await asyncio.gather(*(loader.get_employee_list(f"{index}.json") for index in range(6)))
+
+    assert asyncio.run(load_all()) == [f"{index}.json" for index in range(6)]
+    assert running[1] == 2
+
+
+def test_cancelled_request_does_not_cancel_shared_load():
+    release = threading.Event()
+
+    async def load_all():
+        loader = AsyncEmployeeLoader(load=lambda file_name, json_lines: release.wait(5) and file_name)
+        first = asyncio.ensure_future(loader.get_employee_list('a.json'))
+        second = asyncio.ensure_future(loader.get_employee_list('a.json'))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        release.set()
+        return await second
+
+    assert asyncio.run(load_all()) == 'a.json'
+
+
+def test_invalid_max_concurrency():
+    with pytest.raises(ValueError, match='max_concurrency must be positive: 0'):
+        AsyncEmployeeLoader(max_concurrency=0)
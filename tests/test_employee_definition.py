@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
-from src.conf.employee_definition import Employee, Manager
+from src.conf.employee_definition import Employee, EmployeeJson, Manager, iter_employee_json
 from test_utils import get_employee_json
 
 
@@ -35,6 +35,73 @@ def test_employee_get_member_list_with_five_members_and_sorted_by_name():
     _validate_employee_and_manager_available(member_list[4], 6, 'Fox', 3125)
 
 
+def test_manager_register_same_member_twice():
+    manager = Manager(Employee(1, 'Allen', 100000))
+    employee = Employee(2, 'Davis', 50000)
+    employee.set_manager(manager)
+    employee.set_manager(manager)
+    manager.register(Employee(2, 'Davis', 60000))
+
+    member_list = manager.get_member_list()
+
+    assert len(member_list) == 1
+    assert member_list[0].get_salary() == 60000
+
+
+def test_manager_get_member_list_cached_until_register():
+    manager = Manager(Employee(1, 'Allen', 100000))
+    Employee(2, 'Davis', 50000).set_manager(manager)
+
+    member_list = manager.get_member_list()
+    assert manager.get_member_list() is member_list
+
+    Employee(3, 'Bill', 12500).set_manager(manager)
+    assert [m.get_first_name() for m in manager.get_member_list()] == ['Bill', 'Davis']
+
+
+def test_manager_promote_in_place():
+    manager = Manager(Employee(1, 'Allen', 100000))
+    employee = Employee(2, 'Davis', 50000)
+    employee.set_manager(manager)
+
+    promoted = Manager.promote(employee)
+    Employee(3, 'Bill', 12500).set_manager(promoted)
+
+    assert promoted is employee
+    assert Manager.promote(promoted) is promoted
+    assert employee.get_class_name() == 'Manager'
+    assert employee.get_manager() is manager
+    assert manager.get_member_list() == [employee]
+    assert [m.get_first_name() for m in employee.get_member_list()] == ['Bill']
+
+
+def test_employee_set_manager_moves_to_new_manager():
+    manager1 = Manager(Employee(1, 'Allen', 100000))
+    manager2 = Manager(Employee(2, 'Bill', 100000))
+    employee = Employee(3, 'Davis', 50000)
+
+    employee.set_manager(manager1)
+    employee.set_manager(manager2)
+    assert manager1.get_member_list() == []
+    assert manager2.get_member_list() == [employee]
+
+    employee.remove_manager()
+    assert not employee.has_manager()
+    assert manager2.get_member_list() == []
+
+    demoted = Manager.demote(manager2)
+    assert demoted is manager2
+    assert demoted.get_class_name() == 'Employee'
+
+
+def test_manager_demote_with_members():
+    manager = Manager(Employee(1, 'Allen', 100000))
+    Employee(2, 'Davis', 50000).set_manager(manager)
+
+    with pytest.raises(ValueError, match='manager still has members: 1'):
+        Manager.demote(manager)
+
+
 def test_employee_json_with_none_id():
     with pytest.raises(ValidationError) as validation_error:
         get_employee_json(None, 'Allen', None, None)
@@ -57,6 +124,35 @@ def test_employee_json_with_none_first_name():
     ]
 
 
+def test_iter_employee_json_same_as_employee_json():
+    employee_json_data_list = [
+        {'id': 1, 'first_name': 'Allen', 'manager': None, 'salary': 100},
+        {'id': 2, 'first_name': 'Bill', 'manager': 1},
+        {'id': '3', 'first_name': 'Carter', 'manager': 1.0, 'salary': True},
+        {'id': 4, 'first_name': 'Davis', 'salary': None, 'title': 'ignored'},
+    ]
+
+    for batch_size in (1, 3, 10):
+        employee_json_list = list(iter_employee_json(employee_json_data_list, batch_size))
+        assert employee_json_list == [EmployeeJson(**data) for data in employee_json_data_list]
+        assert employee_json_list[2].get_id() == 3
+
+
+def test_iter_employee_json_raises_when_reaching_invalid_record():
+    employee_json_iterator = iter_employee_json([
+        {'id': 1, 'first_name': 'Allen'},
+        {'id': 2, 'first_name': 'Bill\nCarter'},
+    ])
+
+    assert next(employee_json_iterator).get_first_name() == 'Allen'
+    with pytest.raises(ValidationError) as validation_error:
+        next(employee_json_iterator)
+
+    assert validation_error.value.errors() == [
+        {'loc': ('first_name',), 'msg': 'first_name must in [A-Za-z]', 'type': 'value_error'}
+    ]
+
+
 def _validate_employee_and_manager_available(employee: Employee, eid: int, first_name: str, salary: int):
     assert employee.get_eid() == eid
     assert employee.get_first_name() == first_name
@@ -0,0 +1,91 @@
+import io
+import json
+import os
+
+import pytest
+
+from src.employee_printer import (EXIT_FILE_NOT_FOUND, EXIT_INVALID_DATA, EXIT_JSON_DECODE_ERROR, EXIT_OK,
+                                  EXIT_UNEXPECTED_ERROR, main)
+from src.service.snapshot_cache import SnapshotCache
+from src.utils import RESOURCES_DIR
+
+
+@pytest.fixture(autouse=True)
+def snapshot_cache(tmp_path, monkeypatch):
+    # the snapshots are written to a temporary directory rather than `/.cache/` of the project
+    cache = SnapshotCache(str(tmp_path / 'cache'))
+    monkeypatch.setattr('src.employee_printer.snapshot_cache', cache)
+    return cache
+
+
+def test_main_batch_mode(capsys):
+    assert main(['test/employees-test.json', '--format', 'csv']) == EXIT_OK
+
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[0] == 'id,first_name,manager,salary,class_name'
+    assert len(captured.out.splitlines()) == 6
+    assert captured.err == ''
+
+
+def test_main_batch_mode_combines_exit_codes(capsys):
+    exit_code = main(['test/no_file.json', 'test/employees-empty.json', 'test/employees-test-no-id.json',
+                      'test/employees-test.json'])
+
+    assert exit_code == EXIT_FILE_NOT_FOUND | EXIT_JSON_DECODE_ERROR | EXIT_INVALID_DATA
+    captured = capsys.readouterr()
+    assert 'file not found: test/no_file.json' in captured.err
+    assert 'the json file has wrong format: test/employees-empty.json' in captured.err
+    assert 'total_salary = 1075000' in captured.out
+
+
+def test_main_batch_mode_from_stdin(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.StringIO('test/employees-test.json\n\ntest/employees-test.jsonl\n'))
+
+    assert main(['--stdin', '--format', 'jsonl']) == EXIT_OK
+    assert len(capsys.readouterr().out.splitlines()) == 10
+
+
+def test_main_interactive_mode_ends_with_input(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.StringIO('test/no_file.json\ntest/employees-test.json\nY\nN\n'))
+
+    assert main([]) == EXIT_OK
+    captured = capsys.readouterr()
+    assert 'file not found: test/no_file.json' in captured.out
+    assert 'the above is test/employees-test.json report' in captured.out
+    assert captured.out.endswith('bye bye\n')
+
+
+def test_main_batch_mode_with_salary_out_of_int64(tmp_path, capsys):
+    record_list = [{'id': 1, 'first_name': 'Allen', 'salary': 2 ** 63}, {'id': 2, 'first_name': 'Bill', 'manager': 1}]
+    (tmp_path / 'employees-wide.json').write_text(json.dumps(record_list))
+    # file name relative to `/resources/` path
+    file_name = os.path.relpath(tmp_path / 'employees-wide.json', RESOURCES_DIR)
+
+    assert main([file_name]) == EXIT_OK
+    captured = capsys.readouterr()
+    assert 'Employees of Allen\n\tBill\n' in captured.out
+    assert f"total_salary = {2 ** 63}" in captured.out
+    assert captured.err == ''
+
+
+def test_main_batch_mode_goes_on_after_unexpected_error(tmp_path, capsys, snapshot_cache):
+    # the records aren't objects, pydantic raises TypeError rather than ValidationError
+    (tmp_path / 'employees-not-object.json').write_text('[1, 2]')
+    file_name = os.path.relpath(tmp_path / 'employees-not-object.json', RESOURCES_DIR)
+
+    assert main([file_name, 'test/employees-test.json', 'test/no_file.json']) == \
+           EXIT_UNEXPECTED_ERROR | EXIT_FILE_NOT_FOUND
+    captured = capsys.readouterr()
+    assert f"unexpected error of {file_name}: TypeError" in captured.err
+    assert 'total_salary = 1075000' in captured.out
+    assert os.listdir(str(tmp_path / 'cache'))
+
+
+def test_main_batch_mode_keeps_stdout_to_reports(capsys):
+    assert main(['test/employees-empty.json', 'test/no_file.json', 'test/employees-test.json', '--format', 'jsonl']) \
+           == EXIT_JSON_DECODE_ERROR | EXIT_FILE_NOT_FOUND
+
+    captured = capsys.readouterr()
+    # every line is a record of the valid file, the diagnostics of the loaders are written to stderr
+    assert [json.loads(line)['id'] for line in captured.out.splitlines()] == [5, 1, 3, 4, 2]
+    assert 'error occurs while parsing json file' in captured.err
@@ -1,10 +1,16 @@
+import csv
+import io
+import json
+import random
 from json import JSONDecodeError
 
 import pytest
 from pydantic import ValidationError
 
 from src.conf.employee_definition import Employee, Manager
-from src.service.employee_service import get_employee_list, get_total_salary, EmployeeMapper
+from src.service.employee_service import apply_employee_delta, get_employee_list, get_employee_mapper, \
+    get_employee_order_key, get_employee_table_list, get_total_salary, iter_employee_list, render_employee_list, \
+    sort_employee_list, EmployeeMapper
 from test_utils import get_employee_json
 
 
@@ -152,6 +158,188 @@ def test_employee_mapper_cache_and_type_transfer():
     assert employee_list[2].get_class_name() == 'Manager'
 
 
+def test_employee_mapper_map_to_manager_keeps_identity():
+    employee_mapper = EmployeeMapper()
+    employee_json1 = get_employee_json(1, 'A', 2, 100)
+    employee_json2 = get_employee_json(2, 'B', None, 100)
+
+    employee1 = employee_mapper.map_to_employee(employee_json1)
+    employee1.set_manager(employee_mapper.map_to_manager(employee_json2))
+    manager1 = employee_mapper.map_to_manager(employee_json1)
+
+    assert manager1 is employee1
+    assert manager1.get_class_name() == 'Manager'
+    assert employee_mapper.map_to_employee(employee_json2).get_member_list() == [manager1]
+
+
 def test_total_salary():
     employee_list = [Employee(1, 'A', 100), Employee(2, 'B', 200), Manager(Employee(3, 'C', 300))]
     assert get_total_salary(employee_list) == 600
+
+
+def test_get_employee_list_from_json_lines():
+    employee_list = get_employee_list('/test/employees-test.jsonl')
+    assert [e.get_first_name() for e in employee_list] == ['Joy', 'Ted', 'David', 'Michael', 'Peter']
+    assert get_total_salary(employee_list) == 1075000
+
+
+def test_iter_employee_list_same_order_as_get_employee_list():
+    for file_name in ('employees1.json', 'employees2.json', '/test/employees-test.json'):
+        expected = [e.get_eid() for e in get_employee_list(file_name)]
+        assert [e.get_eid() for e in iter_employee_list(file_name)] == expected
+
+    employee_iterator = iter_employee_list('/test/employees-test.json')
+    assert [next(employee_iterator).get_first_name() for _ in range(2)] == ['Joy', 'Ted']
+
+
+def test_get_employee_table_list_same_as_get_employee_list():
+    for file_name in ('employees1.json', 'employees2.json', '/test/employees-test.json'):
+        employee_list = get_employee_list(file_name)
+        employee_table_list = get_employee_table_list(file_name)
+
+        assert len(employee_table_list) == len(employee_list)
+        for employee, view in zip(employee_list, employee_table_list):
+            assert view.get_eid() == employee.get_eid()
+            assert view.get_first_name() == employee.get_first_name()
+            assert view.get_salary() == employee.get_salary()
+            assert view.get_class_name() == employee.get_class_name()
+            assert view.has_manager() == employee.has_manager()
+            if employee.get_class_name() == 'Manager':
+                assert [m.get_eid() for m in view.get_member_list()] == \
+                       [m.get_eid() for m in employee.get_member_list()]
+
+        assert get_total_salary(employee_table_list) == get_total_salary(employee_list)
+
+
+def test_get_employee_table_list_with_manager_not_found():
+    with pytest.raises(ValueError, match='can\'t find the manager with id: 3'):
+        get_employee_table_list('/test/employees-test-manager-not-found.json')
+
+
+def test_apply_employee_delta_same_as_loading_result():
+    employee_mapper = get_employee_mapper('/test/employees-test.json')
+    apply_employee_delta(employee_mapper, '/test/employees-test-delta.json')
+
+    employee_list = sorted(employee_mapper.get_employee_list(), key=get_employee_order_key)
+    expected_list = get_employee_list('/test/employees-test-delta-result.json')
+
+    assert [e.get_eid() for e in employee_list] == [e.get_eid() for e in expected_list]
+    for employee, expected in zip(employee_list, expected_list):
+        assert employee.get_first_name() == expected.get_first_name()
+        assert employee.get_salary() == expected.get_salary()
+        assert employee.get_class_name() == expected.get_class_name()
+        assert employee.has_manager() == expected.has_manager()
+        if expected.get_class_name() == 'Manager':
+            assert [m.get_eid() for m in employee.get_member_list()] == \
+                   [m.get_eid() for m in expected.get_member_list()]
+
+
+def test_apply_employee_delta_with_manager_not_found():
+    employee_mapper = get_employee_mapper('/test/employees-test.json')
+
+    # Peter and Michael are left behind by Ted
+    with pytest.raises(ValueError, match='can\'t find the manager with id: 1'):
+        apply_employee_delta(employee_mapper, '/test/employees-test-delta-manager-not-found.json')
+
+    employee_list = employee_mapper.get_employee_list()
+    assert len(employee_list) == 5
+    assert [m.get_first_name() for m in employee_list[0].get_member_list()] == ['David', 'Michael', 'Peter']
+
+
+def test_employee_mapper_apply_delta_demotes_manager_without_members():
+    employee_mapper = EmployeeMapper()
+    employee_mapper.map_to_employee_list({
+        1: get_employee_json(1, 'A', None, 100),
+        2: get_employee_json(2, 'B', 1, 100),
+    })
+
+    with pytest.raises(ValueError, match='found duplicate id: 2'):
+        employee_mapper.apply_delta([get_employee_json(2, 'B', None, 100)], [], [])
+    with pytest.raises(ValueError, match='can\'t find the employee with id: 3'):
+        employee_mapper.apply_delta([], [get_employee_json(3, 'C', None, 100)], [])
+
+    employee_mapper.apply_delta([], [], [get_employee_json(2, 'B', 1, 100)])
+
+    employee_list = employee_mapper.get_employee_list()
+    assert len(employee_list) == 1
+    assert employee_list[0].get_class_name() == 'Employee'
+
+
+def test_employee_mapper_apply_delta_keeps_order_of_same_names():
+    employee_mapper = EmployeeMapper()
+    employee_mapper.map_to_employee_list({
+        1: get_employee_json(1, 'A', None, 100),
+        2: get_employee_json(2, 'Bob', 1, 100),
+        3: get_employee_json(3, 'Bob', 1, 100),
+        4: get_employee_json(4, 'Al', 1, 100),
+    })
+    manager = employee_mapper.get_employee_list()[0]
+
+    # a salary change doesn't move Bob 2 after Bob 3
+    employee_mapper.apply_delta([], [get_employee_json(2, 'Bob', 1, 200)], [])
+    assert [m.get_eid() for m in manager.get_member_list()] == [4, 2, 3]
+
+    # a renamed member is moved after the members with the same name, the ties follow the order of the delta
+    employee_mapper.apply_delta([], [get_employee_json(4, 'Bob', 1, 100), get_employee_json(2, 'Bob', 1, 300)], [])
+    assert [m.get_eid() for m in manager.get_member_list()] == [2, 3, 4]
+    employee_mapper.apply_delta([], [get_employee_json(3, 'Al', 1, 100), get_employee_json(4, 'Al', 1, 100)], [])
+    assert [m.get_eid() for m in manager.get_member_list()] == [3, 4, 2]
+
+
+def test_render_employee_list_same_as_print_info(capsys):
+    employee_list = get_employee_list('employees2.json')
+    for employee in employee_list:
+        employee.print_info()
+        print('----------')
+    print('\ntotal_salary = ' + str(get_total_salary(employee_list)))
+    expected = capsys.readouterr().out
+
+    for report_list in (employee_list, get_employee_table_list('employees2.json')):
+        output = io.StringIO()
+        render_employee_list(report_list, output)
+        assert output.getvalue() == expected
+
+    output = io.StringIO()
+    render_employee_list([], output)
+    assert output.getvalue() == 'input employee list is empty\n'
+
+
+def test_render_employee_list_as_csv_and_json_lines():
+    employee_list = get_employee_list('/test/employees-test.json')
+
+    output = io.StringIO()
+    render_employee_list(employee_list, output, 'csv')
+    row_list = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert len(row_list) == 5
+    assert row_list[1] == {'id': '1', 'first_name': 'Ted', 'manager': '5', 'salary': '50000', 'class_name': 'Manager'}
+
+    output = io.StringIO()
+    render_employee_list(employee_list, output, 'jsonl')
+    record_list = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert record_list[0] == {'id': 5, 'first_name': 'Joy', 'manager': None, 'salary': 1000000, 'class_name': 'Manager'}
+    assert record_list[2]['salary'] is None
+
+    with pytest.raises(ValueError, match='output_format must be one of'):
+        render_employee_list(employee_list, output, 'xml')
+
+
+def test_sort_employee_list_same_as_order_key():
+    randomizer = random.Random(0)
+    employee_list = [Employee(eid, randomizer.choice(['Zoe', 'Amy', 'Bob', 'Al', 'al', 'Ámy']), None)
+                     for eid in range(1, 501)]
+    for employee in employee_list[1:]:
+        manager = employee_list[randomizer.randrange(0, employee.get_eid() - 1)]
+        employee.set_manager(Manager.promote(manager))
+    randomizer.shuffle(employee_list)
+
+    expected = sorted(employee_list, key=get_employee_order_key)
+    sort_employee_list(employee_list)
+    assert employee_list == expected
+
+
+def test_employees_share_interned_first_name():
+    first_name = ''.join(['Jo', 'y'])
+    employee_list = get_employee_list('/test/employees-test.json')
+    joy = next(employee for employee in employee_list if employee.get_first_name() == 'Joy')
+
+    assert Employee(10, first_name, 0).get_first_name() is joy.get_first_name()
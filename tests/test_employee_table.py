@@ -0,0 +1,45 @@
+import pytest
+
+from src.conf.employee_table import EmployeeTable, OutOfRangeError
+
+
+def test_employee_table_view():
+    employee_table = EmployeeTable([1, 2, 3, 4], ['Allen', 'Davis', 'Bill', 'Allen'], [None, 1, 1, 3],
+                                   [100, None, 0, 50])
+
+    assert len(employee_table) == 4
+    assert employee_table.get_total_salary() == 150
+
+    allen = employee_table.get_employee(1)
+    assert allen.get_class_name() == 'Manager'
+    assert not allen.has_manager()
+    assert allen.get_manager() is None
+    assert [m.get_first_name() for m in allen.get_member_list()] == ['Bill', 'Davis']
+
+    davis = employee_table.get_employee(2)
+    assert davis.get_class_name() == 'Employee'
+    assert davis.get_salary() is None
+    assert davis.get_manager() == allen
+    assert davis.get_member_list() == []
+
+    bill = employee_table.get_employee(3)
+    assert bill.get_salary() == 0
+    assert [m.get_eid() for m in bill.get_member_list()] == [4]
+
+
+def test_employee_table_get_nonexistent_employee():
+    employee_table = EmployeeTable([1], ['Allen'], [None], [100])
+
+    with pytest.raises(ValueError, match='can\'t find the employee with id: 2'):
+        employee_table.get_employee(2)
+
+
+def test_employee_table_rejects_values_out_of_int64():
+    with pytest.raises(OutOfRangeError, match='id is out of the 64-bit range of EmployeeTable: 9223372036854775808'):
+        EmployeeTable([1, 2 ** 63], ['Allen', 'Bill'], [None, 1], [100, 200])
+    with pytest.raises(OutOfRangeError,
+                       match='salary is out of the 64-bit range of EmployeeTable: -9223372036854775809'):
+        EmployeeTable([1, 2], ['Allen', 'Bill'], [None, 1], [None, -2 ** 63 - 1])
+
+    employee_table = EmployeeTable([2 ** 63 - 1], ['Allen'], [None], [-2 ** 63])
+    assert employee_table.get_employee(2 ** 63 - 1).get_salary() == -2 ** 63
@@ -0,0 +1,73 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from src.service.employee_service import (get_employee_list, get_employee_mapper, get_employee_table,
+                                          get_lazy_employee_hierarchy)
+from src.service.hierarchy_validator import HierarchyError, validate_hierarchy
+from src.utils import RESOURCES_DIR
+from test_utils import get_employee_json
+
+
+def test_get_employee_list_with_cycle():
+    # the service raises `HierarchyError` of `service.hierarchy_validator` rather than `src.service.hierarchy_validator`
+    with pytest.raises(ValueError, match='found invalid hierarchy') as hierarchy_error:
+        get_employee_list('/test/employees-test-cycle.json')
+
+    assert hierarchy_error.value.get_cycle_list() == [[1, 2]]
+    assert hierarchy_error.value.get_self_managed_id_list() == [3]
+    assert hierarchy_error.value.get_unreachable_id_list() == [4]
+
+
+def test_validate_hierarchy_with_deep_chain():
+    size = 100000
+    manager_id_dict = {eid: eid - 1 if eid > 1 else None for eid in range(1, size + 1)}
+    validate_hierarchy(reversed(range(1, size + 1)), manager_id_dict.get)
+
+    manager_id_dict[1] = size
+    with pytest.raises(HierarchyError) as hierarchy_error:
+        validate_hierarchy(range(1, size + 1), manager_id_dict.get)
+
+    assert len(hierarchy_error.value.get_cycle_list()[0]) == size
+
+
+def test_apply_delta_with_cycle():
+    employee_mapper = get_employee_mapper('/test/employees-test.json')
+
+    # Joy is moved under Ted, who is managed by Joy
+    with pytest.raises(ValueError, match='cycles: \\[\\[5, 1\\]\\]'):
+        employee_mapper.apply_delta([], [get_employee_json(5, 'Joy', 1, 1000000)], [])
+
+    joy = [e for e in employee_mapper.get_employee_list() if e.get_eid() == 5][0]
+    assert not joy.has_manager()
+
+
+def test_get_employee_list_with_cycle_and_missing_managers(tmp_path):
+    # 3 and 4 are managed by missing ids, 5 and 6 manage each other
+    record_list = [{'id': 1, 'first_name': 'Joy'}, {'id': 2, 'first_name': 'Max', 'manager': 1},
+                   {'id': 3, 'first_name': 'Ann', 'manager': 8}, {'id': 4, 'first_name': 'Ted', 'manager': 9},
+                   {'id': 5, 'first_name': 'Ray', 'manager': 6}, {'id': 6, 'first_name': 'Sam', 'manager': 5},
+                   {'id': 7, 'first_name': 'Zoe', 'manager': 8}]
+    path = tmp_path / 'roster.json'
+    path.write_text(json.dumps(record_list), encoding='utf-8')
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+
+    for load in (get_employee_list, get_employee_table, get_lazy_employee_hierarchy):
+        with pytest.raises(ValueError, match='cycles: \\[\\[5, 6\\]\\]') as hierarchy_error:
+            load(file_name)
+
+        assert hierarchy_error.value.get_missing_manager_id_list() == [8, 9]
+        assert str(hierarchy_error.value).endswith("can't find the manager with id: 8, 9")
+
+
+def test_validate_hierarchy_with_missing_managers_only():
+    manager_id_dict = {1: None, 2: 1, 3: 7, 4: 3}
+    with pytest.raises(HierarchyError, match='^can\'t find the manager with id: 7$') as hierarchy_error:
+        validate_hierarchy(manager_id_dict, manager_id_dict.get, manager_id_dict.__contains__)
+
+    assert hierarchy_error.value.get_unreachable_id_list() == []
+    assert pickle.loads(pickle.dumps(hierarchy_error.value)).get_missing_manager_id_list() == [7]
+    # without `has_eid`, every manager id is assumed to be found
+    validate_hierarchy([1, 2], manager_id_dict.get)
@@ -0,0 +1,140 @@
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from src.service.employee_service import get_employee_list
+from src.service.hierarchy_watcher import HierarchyWatcher
+from src.utils import RESOURCES_DIR
+
+
+@pytest.fixture
+def watched_dir(tmp_path):
+    shutil.copyfile(RESOURCES_DIR + 'test/employees-test.json', tmp_path / 'a.json')
+    shutil.copyfile(RESOURCES_DIR + 'employees1.json', tmp_path / 'b.json')
+    # file names relative to `/resources/` path, which is what the loaders expect
+    return os.path.relpath(tmp_path, RESOURCES_DIR)
+
+
+def _replace_file(watched_dir: str, name: str, source_file_name: str, mtime_ns: int):
+    path = os.path.join(RESOURCES_DIR, watched_dir, name)
+    shutil.copyfile(RESOURCES_DIR + source_file_name, path)
+    # the mtime is set explicitly, so the change is seen even within the resolution of the file system
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_hierarchy_watcher_reloads_changed_files_only(watched_dir):
+    watcher = HierarchyWatcher(watched_dir)
+    a_file_name, b_file_name = os.path.join(watched_dir, 'a.json'), os.path.join(watched_dir, 'b.json')
+
+    assert watcher.refresh() == [a_file_name, b_file_name]
+    assert watcher.get_file_list() == [a_file_name, b_file_name]
+    assert len(watcher.get_employee_list(a_file_name)) == 5
+    b_employee_list = watcher.get_employee_list(b_file_name)
+
+    assert watcher.refresh() == []
+    assert watcher.get_employee_list(b_file_name) is b_employee_list
+
+    _replace_file(watched_dir, 'a.json', 'employees2.json', 10 ** 9)
+    assert watcher.refresh() == [a_file_name]
+    assert [e.get_eid() for e in watcher.get_employee_list(a_file_name)] == \
+           [e.get_eid() for e in get_employee_list('employees2.json')]
+    assert watcher.get_version(a_file_name) == 2
+    assert watcher.get_employee_list(b_file_name) is b_employee_list
+
+    os.remove(os.path.join(RESOURCES_DIR, b_file_name))
+    assert watcher.refresh() == []
+    assert watcher.get_file_list() == [a_file_name]
+    with pytest.raises(FileNotFoundError, match='file isn\'t loaded'):
+        watcher.get_employee_list(b_file_name)
+
+
+def test_hierarchy_watcher_keeps_previous_version_of_invalid_file(watched_dir):
+    watcher = HierarchyWatcher(watched_dir)
+    a_file_name = os.path.join(watched_dir, 'a.json')
+    watcher.refresh()
+    employee_list = watcher.get_employee_list(a_file_name)
+
+    _replace_file(watched_dir, 'a.json', 'test/employees-test-duplicate-id.json', 10 ** 9)
+    assert watcher.refresh() == [a_file_name]
+    assert watcher.get_employee_list(a_file_name) is employee_list
+    assert watcher.get_version(a_file_name) == 1
+    assert str(watcher.get_error(a_file_name)) == 'found duplicate id: 1'
+
+    # not loaded again until it's changed
+    assert watcher.refresh() == []
+
+    _replace_file(watched_dir, 'a.json', 'employees2.json', 2 * 10 ** 9)
+    watcher.refresh()
+    assert watcher.get_error(a_file_name) is None
+    assert watcher.get_version(a_file_name) == 2
+
+
+def test_hierarchy_watcher_never_loaded_file_raises_its_error(watched_dir):
+    _replace_file(watched_dir, 'a.json', 'test/employees-test-manager-not-found.json', 10 ** 9)
+    watcher = HierarchyWatcher(watched_dir)
+    a_file_name = os.path.join(watched_dir, 'a.json')
+    watcher.refresh()
+
+    assert watcher.get_file_list() == [os.path.join(watched_dir, 'b.json')]
+    with pytest.raises(ValueError, match='can\'t find the manager with id: 3'):
+        watcher.get_employee_list(a_file_name)
+
+
+def test_hierarchy_watcher_serves_previous_version_during_reload(watched_dir):
+    a_file_name = os.path.join(watched_dir, 'a.json')
+    loading_event, release_event = threading.Event(), threading.Event()
+
+    def load(file_name):
+        if file_name == a_file_name and loading_event.is_set():
+            release_event.wait(5)
+        employee_list = get_employee_list(file_name)
+        loading_event.set()
+        return employee_list
+
+    with HierarchyWatcher(watched_dir, interval=0.01, load=load) as watcher:
+        _wait_for(lambda: watcher.get_version(a_file_name) == 1)
+        employee_list = watcher.get_employee_list(a_file_name)
+
+        _replace_file(watched_dir, 'a.json', 'employees2.json', 10 ** 9)
+        time.sleep(0.1)
+        # the reload is blocked, the readers get the previous version meanwhile
+        assert watcher.get_employee_list(a_file_name) is employee_list
+
+        release_event.set()
+        _wait_for(lambda: watcher.get_version(a_file_name) == 2)
+        assert len(watcher.get_employee_list(a_file_name)) == len(get_employee_list('employees2.json'))
+
+
+def test_hierarchy_watcher_keeps_polling_after_any_error(watched_dir):
+    a_file_name, b_file_name = os.path.join(watched_dir, 'a.json'), os.path.join(watched_dir, 'b.json')
+
+    with HierarchyWatcher(watched_dir, interval=0.01) as watcher:
+        _wait_for(lambda: watcher.get_version(b_file_name) == 1)
+
+        # the records aren't objects, pydantic raises TypeError rather than ValidationError
+        a_path = os.path.join(RESOURCES_DIR, a_file_name)
+        with open(a_path, 'w', encoding='utf-8') as file:
+            file.write('[1, 2]')
+        os.utime(a_path, ns=(10 ** 9, 10 ** 9))
+        _wait_for(lambda: isinstance(watcher.get_error(a_file_name), TypeError))
+        assert watcher._thread.is_alive()
+
+        _replace_file(watched_dir, 'b.json', 'employees2.json', 10 ** 9)
+        _wait_for(lambda: watcher.get_version(b_file_name) == 2)
+        assert watcher.get_version(a_file_name) == 1
+
+
+def test_hierarchy_watcher_start_twice():
+    with HierarchyWatcher('no_dir', interval=0.01) as watcher:
+        with pytest.raises(ValueError, match='watcher has been started'):
+            watcher.start()
+
+
+def _wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+# the service measures its stages by `instrumentation` rather than `src.instrumentation`
+from instrumentation import StageSpan, instrument, is_enabled, iter_stage, measure_stage
+from src.service.employee_service import get_employee_list, get_employee_table_list
+
+
+def test_get_employee_list_with_instrumentation():
+    span_list = []
+    with instrument(span_list.append, trace_memory=True):
+        employee_list = get_employee_list('test/employees-test.json')
+
+    assert [span.get_name() for span in span_list] == ['read', 'parse', 'validate', 'dedupe', 'hierarchy', 'map',
+                                                       'link_managers', 'sort']
+    assert [span.get_count() for span in span_list[1:]] == [5, 5, 5, 5, 5, 4, 5]
+    assert all(span.get_seconds() >= 0 and span.get_peak_bytes() >= 0 for span in span_list)
+
+    assert not is_enabled()
+    assert [employee.get_eid() for employee in employee_list] == \
+           [employee.get_eid() for employee in get_employee_list('test/employees-test.json')]
+
+
+def test_get_employee_table_list_with_instrumentation():
+    span_list = []
+    with instrument(span_list.append):
+        get_employee_table_list('test/employees-test.jsonl')
+
+    assert [span.get_name() for span in span_list] == ['read', 'parse', 'validate', 'dedupe', 'hierarchy', 'map']
+    assert all(span.get_peak_bytes() is None for span in span_list)
+
+
+def test_instrumentation_reports_failed_stage():
+    span_list = []
+    with instrument(span_list.append):
+        with pytest.raises(ValueError, match='found duplicate id: 1'):
+            get_employee_list('test/employees-test-duplicate-id.json')
+
+    assert 'dedupe' in [span.get_name() for span in span_list]
+
+
+def test_nested_stages_exclude_each_other():
+    span_list = []
+    with instrument(span_list.append):
+        def slow_iterable():
+            for value in range(3):
+                with measure_stage('inner'):
+                    time.sleep(0.01)
+                yield value
+
+        with measure_stage('outer'):
+            assert list(iter_stage('middle', slow_iterable())) == [0, 1, 2]
+
+    span_dict = {span.get_name(): span for span in span_list}
+    assert span_dict['inner'].get_seconds() >= 0.01
+    assert span_dict['middle'].get_count() == 3
+    assert span_dict['middle'].get_seconds() < 0.01
+    assert span_dict['outer'].get_seconds() < 0.01
+
+
+def test_disabled_instrumentation():
+    iterable = [1, 2]
+    assert iter_stage('stage', iterable) is iterable
+    assert measure_stage('stage').wrap(len) is len
+
+    with measure_stage('stage') as stage:
+        stage.add_count(1)
+
+
+def test_stage_span_to_dict():
+    assert StageSpan('read', 1.5, 3, None).to_dict() == {'stage': 'read', 'seconds': 1.5, 'count': 3,
+                                                         'peak_bytes': None}
@@ -0,0 +1,112 @@
+import json
+import os
+
+import pytest
+
+from src.conf.employee_table import EmployeeTable
+from src.conf.lazy_hierarchy import LazyEmployeeHierarchy
+from src.service.employee_service import get_employee_list, get_lazy_employee_hierarchy, get_total_salary, \
+    sort_employee_list
+from src.utils import RESOURCES_DIR
+
+
+def test_lazy_hierarchy_total_salary_without_instances():
+    hierarchy = get_lazy_employee_hierarchy('employees2.json')
+
+    assert len(hierarchy) == 8
+    assert hierarchy.get_total_salary() == get_total_salary(get_employee_list('employees2.json'))
+    assert hierarchy.get_member_count(4) == 3
+    assert hierarchy.get_member_count(9) == 0
+    assert hierarchy.get_materialized_count() == 0
+
+
+def test_lazy_hierarchy_creates_accessed_instances_only():
+    hierarchy = get_lazy_employee_hierarchy('employees2.json')
+
+    kb = hierarchy.get_employee(3)
+    # KB, Hom and Steve up to the top
+    assert hierarchy.get_materialized_count() == 3
+    assert kb.get_class_name() == 'Employee'
+    assert kb.get_manager() is hierarchy.get_employee(4)
+
+    hom = kb.get_manager()
+    # `Manager` of the `conf` package, which the hierarchy imports, see `pytest.ini`
+    assert any(cls.__name__ == 'Manager' for cls in type(hom).__mro__)
+    assert hom.get_class_name() == 'Manager'
+    assert hom.get_manager().get_first_name() == 'Steve'
+    assert hierarchy.get_materialized_count() == 3
+
+    assert [m.get_first_name() for m in hom.get_member_list()] == ['Duncan', 'Gina', 'KB']
+    assert hom.get_member_list()[2] is kb
+    assert hierarchy.get_materialized_count() == 5
+
+
+def test_lazy_hierarchy_same_as_get_employee_list():
+    for file_name in ('employees1.json', 'employees2.json', '/test/employees-test.json'):
+        expected_list = get_employee_list(file_name)
+        employee_list = get_lazy_employee_hierarchy(file_name).get_employee_list()
+        sort_employee_list(employee_list)
+
+        assert [e.get_eid() for e in employee_list] == [e.get_eid() for e in expected_list]
+        for employee, expected in zip(employee_list, expected_list):
+            assert employee.get_first_name() == expected.get_first_name()
+            assert employee.get_salary() == expected.get_salary()
+            assert employee.get_class_name() == expected.get_class_name()
+            assert employee.has_manager() == expected.has_manager()
+            if expected.get_class_name() == 'Manager':
+                assert [m.get_eid() for m in employee.get_member_list()] == \
+                       [m.get_eid() for m in expected.get_member_list()]
+
+
+def test_lazy_hierarchy_same_order_of_ties_as_get_employee_list(tmp_path):
+    # 4 and 2 are both Bob managed by 1, 4 comes first in the file, but 2 is referred to as a manager first
+    record_list = [{'id': 3, 'first_name': 'Zed', 'manager': 2}, {'id': 4, 'first_name': 'Bob', 'manager': 1},
+                   {'id': 5, 'first_name': 'Al', 'manager': 4}, {'id': 2, 'first_name': 'Bob', 'manager': 1},
+                   {'id': 1, 'first_name': 'Max'}]
+    (tmp_path / 'employees-ties.json').write_text(json.dumps(record_list))
+    # file name relative to `/resources/` path
+    file_name = os.path.relpath(tmp_path / 'employees-ties.json', RESOURCES_DIR)
+
+    employee_list = get_lazy_employee_hierarchy(file_name).get_employee_list()
+    sort_employee_list(employee_list)
+
+    assert [e.get_eid() for e in employee_list] == [e.get_eid() for e in get_employee_list(file_name)] == \
+           [1, 2, 4, 5, 3]
+
+
+def test_lazy_manager_set_manager_moves_member():
+    hierarchy = get_lazy_employee_hierarchy('employees2.json')
+
+    rick = hierarchy.get_employee(6)
+    hom = hierarchy.get_employee(4)
+    rick.set_manager(hom)
+
+    assert [m.get_first_name() for m in hierarchy.get_employee(2).get_member_list()] == ['Michael']
+    assert [m.get_first_name() for m in hom.get_member_list()] == ['Duncan', 'Gina', 'KB', 'Rick']
+
+
+def test_lazy_hierarchy_deep_chain():
+    size = 5000
+    hierarchy = LazyEmployeeHierarchy(EmployeeTable(list(range(1, size + 1)), ['A'] * size,
+                                                    [None] + list(range(1, size)), [1] * size))
+
+    bottom = hierarchy.get_employee(size)
+    assert hierarchy.get_materialized_count() == size
+    assert bottom.get_manager().get_eid() == size - 1
+    assert hierarchy.get_total_salary() == size
+
+
+def test_lazy_hierarchy_get_nonexistent_employee():
+    hierarchy = get_lazy_employee_hierarchy('employees2.json')
+
+    with pytest.raises(ValueError, match='can\'t find the employee with id: 7'):
+        hierarchy.get_employee(7)
+
+
+def test_lazy_hierarchy_same_errors_as_get_employee_list():
+    with pytest.raises(ValueError, match='found duplicate id: 1'):
+        get_lazy_employee_hierarchy('/test/employees-test-duplicate-id.json')
+    with pytest.raises(ValueError, match='can\'t find the manager with id: 3'):
+        get_lazy_employee_hierarchy('/test/employees-test-manager-not-found.json')
+    with pytest.raises(ValueError, match='cycles: \\[\\[1, 2\\]\\]'):
+        get_lazy_employee_hierarchy('/test/employees-test-cycle.json')
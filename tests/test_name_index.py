@@ -0,0 +1,38 @@
+from src.conf.name_table import NameTable
+from src.service.employee_service import get_employee_list, get_employee_table_list
+from src.service.name_index import FirstNameIndex
+
+
+def test_first_name_index_queries():
+    first_name_index = FirstNameIndex(get_employee_list('employees2.json'))
+
+    assert len(first_name_index) == 8
+    assert first_name_index.get_id_list('Ned') == [2]
+    assert first_name_index.get_id_list('ned') == []
+    assert first_name_index.get_prefix_name_list('') == ['Duncan', 'Gina', 'Hom', 'KB', 'Michael', 'Ned', 'Rick',
+                                                         'Steve']
+    assert first_name_index.get_prefix_id_list('') == [1, 2, 3, 4, 5, 6, 9, 10]
+    assert first_name_index.get_prefix_name_list('Zed') == []
+
+
+def test_first_name_index_with_repeated_names():
+    first_name_index = FirstNameIndex(get_employee_table_list('/test/employees-test.json'))
+    employee_list = get_employee_list('/test/employees-test.json')
+
+    for employee in employee_list:
+        assert employee.get_eid() in first_name_index.get_id_list(employee.get_first_name())
+        assert employee.get_eid() in first_name_index.get_prefix_id_list(employee.get_first_name()[:1])
+    assert first_name_index.get_prefix_id_list('J') == sorted(
+        employee.get_eid() for employee in employee_list if employee.get_first_name().startswith('J'))
+
+
+def test_name_table_ranks():
+    name_table = NameTable()
+    name = name_table.intern(''.join(['Bo', 'b']))
+
+    assert name_table.intern('Bob') is name
+    assert name_table.get_rank_dict() == {'Bob': 0}
+
+    name_table.intern_all(['Amy', 'Zoe', 'Bob'])
+    assert len(name_table) == 3
+    assert name_table.get_rank_dict() == {'Amy': 0, 'Bob': 1, 'Zoe': 2}
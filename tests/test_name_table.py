@@ -0,0 +1,45 @@
+import sys
+import threading
+
+from src.conf.name_table import NameTable
+
+
+def test_name_table_intern_and_rank():
+    name_table = NameTable()
+    name = ''.join(['Al', 'len'])
+
+    assert name_table.intern(name) is name
+    assert name_table.intern('Allen') is name
+    name_table.intern_all(['Bill', 'Allen', 'Adam'])
+
+    assert len(name_table) == 3
+    assert name_table.get_rank_dict() == {'Adam': 0, 'Allen': 1, 'Bill': 2}
+    name_table.intern('Aaron')
+    assert name_table.get_rank_dict()['Aaron'] == 0
+
+
+def test_name_table_never_caches_stale_ranks():
+    name_table = NameTable()
+    # many names make every rank dict take a while, so a name is often interned while one is computed
+    name_table.intern_all('Known' + str(index) for index in range(20000))
+    stop_event = threading.Event()
+
+    def get_ranks():
+        while not stop_event.is_set():
+            name_table.get_rank_dict()
+
+    thread = threading.Thread(target=get_ranks)
+    # switch the threads as often as possible, so a rank dict is often computed while another name is interned
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread.start()
+    try:
+        for index in range(300):
+            name = 'Name' + str(index)
+            name_table.intern(name)
+            # every name interned by this thread must be ranked by any rank dict it gets afterward
+            assert name in name_table.get_rank_dict()
+    finally:
+        stop_event.set()
+        thread.join()
+        sys.setswitchinterval(switch_interval)
@@ -0,0 +1,76 @@
+import json
+import os
+
+import pytest
+
+from src.conf.employee_definition import Employee, Manager
+from src.service.employee_service import get_employee_list, get_employee_table_list, get_lazy_employee_hierarchy
+from src.service.org_index import OrgIndex
+from src.service.snapshot_cache import SnapshotCache
+from src.utils import RESOURCES_DIR
+
+
+def test_org_index_queries():
+    # Steve -> Ned -> (Michael, Rick), Steve -> Hom -> (KB, Duncan, Gina)
+    org_index = OrgIndex(get_employee_list('employees2.json'))
+
+    assert len(org_index) == 8
+    assert org_index.get_headcount(5) == 8
+    assert org_index.get_org_salary(5) == 4800000
+    assert org_index.get_headcount(4) == 4
+    assert org_index.get_org_salary(4) == 1900000
+    assert org_index.get_org_salary(10) == 0
+    assert org_index.get_depth(5) == 0
+    assert org_index.get_depth(9) == 2
+
+    assert org_index.is_under(9, 4)
+    assert org_index.is_under(9, 5)
+    assert not org_index.is_under(9, 2)
+    assert not org_index.is_under(4, 4)
+    assert [e.get_first_name() for e in org_index.get_report_list(4)] == ['Duncan', 'Gina', 'KB']
+    assert org_index.get_report_list(1) == []
+
+
+def test_org_index_from_employee_table_list():
+    employee_list = get_employee_list('/test/employees-test.json')
+    org_index = OrgIndex(employee_list)
+    table_org_index = OrgIndex(get_employee_table_list('/test/employees-test.json'))
+
+    for employee in employee_list:
+        eid = employee.get_eid()
+        assert table_org_index.get_org_salary(eid) == org_index.get_org_salary(eid)
+        assert table_org_index.get_headcount(eid) == org_index.get_headcount(eid)
+        assert table_org_index.get_depth(eid) == org_index.get_depth(eid)
+
+
+def test_org_index_same_order_of_ties_on_every_path(tmp_path):
+    # 4 and 2 are both Bob managed by 1, the record of 4 comes first, but 2 is mapped first as the manager of 3
+    record_list = [{'id': 3, 'first_name': 'Zed', 'manager': 2}, {'id': 4, 'first_name': 'Bob', 'manager': 1},
+                   {'id': 5, 'first_name': 'Al', 'manager': 4}, {'id': 2, 'first_name': 'Bob', 'manager': 1},
+                   {'id': 1, 'first_name': 'Max'}]
+    (tmp_path / 'employees-ties.json').write_text(json.dumps(record_list))
+    # file name relative to `/resources/` path
+    file_name = os.path.relpath(tmp_path / 'employees-ties.json', RESOURCES_DIR)
+    snapshot_cache = SnapshotCache(str(tmp_path / 'cache'))
+
+    for employee_list in (get_employee_list(file_name), get_employee_table_list(file_name),
+                          get_lazy_employee_hierarchy(file_name).get_employee_list(),
+                          snapshot_cache.get_employee_list(file_name), snapshot_cache.get_employee_list(file_name)):
+        top = next(employee for employee in employee_list if employee.get_eid() == 1)
+        assert [m.get_eid() for m in top.get_member_list()] == [4, 2]
+        assert [e.get_eid() for e in OrgIndex(employee_list).get_report_list(1)] == [4, 5, 2, 3]
+
+
+def test_org_index_with_nonexistent_employee():
+    with pytest.raises(ValueError, match='can\'t find the employee with id: 100'):
+        OrgIndex(get_employee_list('employees1.json')).get_headcount(100)
+
+
+def test_org_index_salary_out_of_int64():
+    manager = Manager(Employee(1, 'Allen', 2 ** 63))
+    member = Employee(2, 'Bill', 2 ** 63)
+    member.set_manager(manager)
+    org_index = OrgIndex([manager, member])
+
+    assert org_index.get_org_salary(1) == 2 ** 64
+    assert org_index.get_org_salary(2) == 2 ** 63
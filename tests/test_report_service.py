@@ -0,0 +1,50 @@
+import os
+import shutil
+
+from src.service.report_service import generate_report, generate_reports, get_resource_file_list
+from src.utils import RESOURCES_DIR
+
+
+def test_get_resource_file_list():
+    assert get_resource_file_list('test/employees-test.*') == ['test/employees-test.json', 'test/employees-test.jsonl']
+    assert get_resource_file_list('test') == get_resource_file_list('test/*.json*')
+    assert get_resource_file_list('no_dir') == []
+
+
+def test_generate_reports_in_order_of_file_names():
+    report_list = list(generate_reports('test', max_workers=2))
+
+    assert [report.get_file_name() for report in report_list] == get_resource_file_list('test')
+    report_dict = {report.get_file_name(): report for report in report_list}
+
+    report = report_dict['test/employees-test.json']
+    assert report.is_successful()
+    assert report.get_employee_count() == 5
+    assert report.get_total_salary() == 1075000
+
+    assert report_dict['test/employees-empty-array.json'].get_employee_count() == 0
+    assert report_dict['test/employees-empty.json'].get_error_type() == 'JSONDecodeError'
+    assert report_dict['test/employees-test-no-id.json'].get_error_type() == 'ValidationError'
+    assert report_dict['test/employees-test-duplicate-id.json'].get_error() == \
+           'something went wrong: found duplicate id: 1'
+
+
+def test_generate_report_from_nonexistent_file():
+    report = generate_report('test/no_file.json')
+
+    assert not report.is_successful()
+    assert report.get_error_type() == 'FileNotFoundError'
+    assert report.get_error() == 'file not found: test/no_file.json'
+
+
+def test_generate_reports_go_on_after_unexpected_error(tmp_path):
+    # the records aren't objects, pydantic raises TypeError rather than ValidationError
+    (tmp_path / 'a.json').write_text('[1, 2]')
+    shutil.copyfile(RESOURCES_DIR + 'test/employees-test.json', tmp_path / 'b.json')
+    pattern = os.path.relpath(tmp_path, RESOURCES_DIR)
+
+    report_list = list(generate_reports(pattern, max_workers=2))
+
+    assert [report.get_error_type() for report in report_list] == ['TypeError', None]
+    assert report_list[0].get_error().startswith(f"unexpected error of {os.path.join(pattern, 'a.json')}: TypeError")
+    assert report_list[1].get_total_salary() == 1075000
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from src.conf.employee_definition import Employee, Manager
+from src.conf.employee_table import EmployeeTable
+from src.service.employee_service import get_employee_list, get_lazy_employee_hierarchy, get_total_salary
+
+numpy = pytest.importorskip('numpy')
+
+from src.service.salary_analytics import SalaryAnalytics  # noqa: E402
+
+
+def test_salary_analytics_same_total_as_get_total_salary():
+    for file_name in ('employees1.json', 'employees2.json', '/test/employees-test.json'):
+        employee_list = get_employee_list(file_name)
+        employee_table = get_lazy_employee_hierarchy(file_name).get_employee_table()
+
+        assert SalaryAnalytics.from_employee_list(employee_list).get_total_salary() == get_total_salary(employee_list)
+        assert SalaryAnalytics.from_employee_table(employee_table).get_total_salary() == get_total_salary(employee_list)
+
+
+def test_salary_analytics_stats_by_manager():
+    salary_analytics = SalaryAnalytics.from_employee_list(get_employee_list('employees2.json'))
+
+    assert len(salary_analytics) == 8
+    assert salary_analytics.get_missing_salary_count() == 1
+    assert salary_analytics.get_summary()['total'] == 4800000
+
+    stats_list = salary_analytics.get_stats_by_manager(percentiles=(0, 50, 100)).to_dict_list()
+    assert [stats['key'] for stats in stats_list] == [2, 4, 5]
+    # Hom manages KB, Duncan and Gina, whose salary is null
+    assert stats_list[1] == {'key': 4, 'headcount': 3, 'missing_count': 1, 'total': 1100000, 'mean': 550000.0,
+                             'percentiles': {0: 500000.0, 50: 550000.0, 100: 600000.0}}
+
+
+def test_salary_analytics_stats_by_depth_same_as_loop():
+    rng = random.Random(0)
+    size = 2000
+    manager_eids = [None] + [rng.randrange(1, eid) for eid in range(2, size + 1)]
+    salaries = [None if rng.random() < 0.1 else rng.randrange(1000, 100000) for _ in range(size)]
+    employee_table = EmployeeTable(list(range(1, size + 1)), ['A'] * size, manager_eids, salaries)
+    stats = SalaryAnalytics.from_employee_table(employee_table).get_stats_by_depth(percentiles=(10, 50, 95))
+
+    depth_list = [0]
+    for manager_eid in manager_eids[1:]:
+        depth_list.append(depth_list[manager_eid - 1] + 1)
+
+    assert list(stats.get_keys()) == sorted(set(depth_list))
+    for index, depth in enumerate(stats.get_keys()):
+        salary_list = [salary for salary, d in zip(salaries, depth_list) if d == depth]
+        present_list = [salary for salary in salary_list if salary is not None]
+
+        assert stats.get_headcounts()[index] == len(salary_list)
+        assert stats.get_missing_counts()[index] == len(salary_list) - len(present_list)
+        assert stats.get_totals()[index] == sum(present_list)
+        if present_list:
+            assert stats.get_means()[index] == pytest.approx(sum(present_list) / len(present_list))
+            assert list(stats.get_percentiles()[index]) == pytest.approx(
+                list(numpy.percentile(present_list, [10, 50, 95])))
+        else:
+            assert numpy.isnan(stats.get_means()[index])
+
+
+def test_salary_analytics_depths_of_deep_chain():
+    size = 5000
+    employee_table = EmployeeTable(list(range(1, size + 1)), ['A'] * size, [None] + list(range(1, size)),
+                                   [1] * size)
+
+    assert list(SalaryAnalytics.from_employee_table(employee_table).get_depths()) == list(range(size))
+
+
+def test_salary_analytics_of_empty_list():
+    salary_analytics = SalaryAnalytics.from_employee_list([])
+
+    assert salary_analytics.get_total_salary() == 0
+    assert salary_analytics.get_summary(percentiles=(50,)) == {'headcount': 0, 'missing_count': 0, 'total': 0,
+                                                               'mean': None, 'percentiles': {50: None}}
+    assert len(salary_analytics.get_stats_by_depth()) == 0
+
+
+def test_salary_analytics_with_invalid_percentile():
+    salary_analytics = SalaryAnalytics.from_employee_list(get_employee_list('employees2.json'))
+
+    with pytest.raises(ValueError, match='percentiles must be in \\[0, 100\\]'):
+        salary_analytics.get_stats_by_manager(percentiles=(50, 101))
+
+
+def test_salary_analytics_totals_out_of_int64():
+    large_salary = 2 ** 63 - 1
+    employee_table = EmployeeTable([1, 2, 3, 4], ['A'] * 4, [None, 1, 1, 2], [large_salary, large_salary, 7, None])
+    salary_analytics = SalaryAnalytics.from_employee_table(employee_table)
+
+    # int64 would wrap the totals around silently
+    assert salary_analytics.get_total_salary() == 2 * large_salary + 7
+    assert salary_analytics.get_summary(percentiles=())['total'] == 2 * large_salary + 7
+    stats_list = salary_analytics.get_stats_by_manager(percentiles=()).to_dict_list()
+    assert [(stats['key'], stats['total']) for stats in stats_list] == [(1, large_salary + 7), (2, 0)]
+    assert stats_list[0]['mean'] == pytest.approx((large_salary + 7) / 2)
+    assert [int(total) for total in salary_analytics.get_stats_by_depth().get_totals()] == \
+           [large_salary, large_salary + 7, 0]
+
+
+def test_salary_analytics_from_employee_list_out_of_int64():
+    manager = Manager(Employee(1, 'Allen', 2 ** 63))
+    member = Employee(2, 'Bill', 100)
+    member.set_manager(manager)
+
+    # `OutOfRangeError` of the `conf` package, which the analytics imports, see `pytest.ini`
+    with pytest.raises(ValueError, match='salary is out of the 64-bit range of SalaryAnalytics: 9223372036854775808') \
+            as error_info:
+        SalaryAnalytics.from_employee_list([manager, member])
+    assert type(error_info.value).__name__ == 'OutOfRangeError'
+    with pytest.raises(ValueError, match='id is out of the 64-bit range of SalaryAnalytics: -9223372036854775809'):
+        SalaryAnalytics.from_employee_list([Employee(-2 ** 63 - 1, 'Allen', 100)])
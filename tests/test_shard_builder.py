@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from src.service.employee_service import get_employee_list
+from src.service.shard_builder import (_build_shard_from_array, _build_shard_from_lines, _get_array_cut_list,
+                                       get_employee_list_by_shards)
+from src.utils import RESOURCES_DIR
+
+
+def get_hierarchy(employee_list):
+    return [(employee.get_eid(), employee.get_first_name(), employee.get_salary(), employee.get_class_name(),
+             employee.get_manager().get_eid() if employee.has_manager() else None) for employee in employee_list]
+
+
+@pytest.mark.parametrize('file_name', ['employees1.json', 'test/employees-test.json', 'test/employees-test.jsonl',
+                                       'test/employees-empty-array.json'])
+def test_get_employee_list_by_shards_same_as_serial(file_name):
+    employee_list = get_employee_list_by_shards(file_name, max_workers=2, shard_bytes=64)
+    assert get_hierarchy(employee_list) == get_hierarchy(get_employee_list(file_name))
+
+
+@pytest.mark.parametrize('file_name', ['employees3-wrong-format.json', 'employees5-manager-not-found.json',
+                                       'test/employees-empty.json', 'test/employees-test-cycle.json',
+                                       'test/employees-test-duplicate-id.json', 'test/no_file.json'])
+def test_get_employee_list_by_shards_raises_same_error_as_serial(file_name):
+    with pytest.raises(Exception) as expected:
+        get_employee_list(file_name)
+
+    with pytest.raises(Exception) as actual:
+        get_employee_list_by_shards(file_name, max_workers=2, shard_bytes=64)
+
+    assert (type(actual.value), str(actual.value)) == (type(expected.value), str(expected.value))
+
+
+def test_build_shard_from_lines_covers_every_line_once():
+    expected = _build_shard_from_lines('test/employees-test.jsonl', 0, 1 << 20)
+    for shard_bytes in (1, 2, 7, 64, 100):
+        id_list = []
+        for start in range(0, 1024, shard_bytes):
+            id_list.extend(_build_shard_from_lines('test/employees-test.jsonl', start, start + shard_bytes)[0])
+        assert id_list == expected[0] == [1, 2, 3, 4, 5]
+
+
+def test_build_shard_from_array_covers_every_record_once():
+    file_name = 'test/employees-test.json'
+    file_size = os.path.getsize(RESOURCES_DIR + file_name)
+    for shard_bytes in (1, 2, 7, 64, 100, 1 << 20):
+        cut_list = _get_array_cut_list(file_name, file_size, shard_bytes)
+        assert cut_list[0] == 0 and cut_list[-1] == file_size
+
+        id_list = []
+        for start, end in zip(cut_list, cut_list[1:]):
+            id_list.extend(_build_shard_from_array(file_name, start, end, file_size)[0])
+        assert id_list == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize('data', [b'[{"id": 1, "first_name": "Joy"},]', b'[{"id": 1, "first_name": "Joy"}',
+                                  b'[{"id": 1, "first_name": "Joy"}] []', b'[{"id": 1, "first_name": "J}oy"}]'])
+def test_build_shard_from_array_with_invalid_range(data, tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_bytes(data)
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+    cut_list = _get_array_cut_list(file_name, len(data), 8)
+
+    assert None in [_build_shard_from_array(file_name, start, end, len(data))
+                    for start, end in zip(cut_list, cut_list[1:])]
@@ -0,0 +1,88 @@
+import os
+import shutil
+
+import pytest
+
+from src.service.employee_service import get_employee_table_list
+from src.service.snapshot_cache import SnapshotCache
+from src.utils import RESOURCES_DIR
+
+TEMP_FILE_NAME = 'employees-test-snapshot.json'
+
+
+@pytest.fixture
+def snapshot_cache(tmp_path):
+    return SnapshotCache(str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def temp_file_name(tmp_path):
+    # the copy is in a temporary directory rather than the source tree, its name is relative to `/resources/` path
+    (tmp_path / 'source').mkdir()
+    shutil.copyfile(RESOURCES_DIR + 'test/employees-test.json', tmp_path / 'source' / TEMP_FILE_NAME)
+    return os.path.relpath(tmp_path / 'source' / TEMP_FILE_NAME, RESOURCES_DIR)
+
+
+def test_snapshot_cache_hit_same_as_loading(snapshot_cache, temp_file_name):
+    loaded_list = snapshot_cache.get_employee_list(temp_file_name)
+    snapshot_path = snapshot_cache.get_snapshot_path(RESOURCES_DIR + temp_file_name)
+    assert os.path.exists(snapshot_path)
+
+    cached_list = snapshot_cache.get_employee_list(temp_file_name)
+    _validate_same_employee_list(cached_list, loaded_list)
+    _validate_same_employee_list(cached_list, get_employee_table_list('test/employees-test.json'))
+    assert [m.get_first_name() for m in cached_list[1].get_member_list()] == ['David', 'Michael', 'Peter']
+
+
+def test_snapshot_cache_reload_changed_file(snapshot_cache, temp_file_name):
+    snapshot_cache.get_employee_list(temp_file_name)
+
+    # touch only, the content digest is the same
+    os.utime(RESOURCES_DIR + temp_file_name, ns=(0, 0))
+    assert len(snapshot_cache.get_employee_list(temp_file_name)) == 5
+
+    shutil.copyfile(RESOURCES_DIR + 'employees1.json', RESOURCES_DIR + temp_file_name)
+    _validate_same_employee_list(snapshot_cache.get_employee_list(temp_file_name),
+                                 get_employee_table_list('employees1.json'))
+
+
+def test_snapshot_cache_evict_least_recently_used(tmp_path):
+    snapshot_cache = SnapshotCache(str(tmp_path), max_bytes=1)
+    snapshot_cache.get_employee_list('test/employees-test.json')
+
+    assert not os.listdir(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        snapshot_cache.get_employee_list('test/no_file.json')
+
+
+def test_snapshot_cache_unwritable_directory(tmp_path, temp_file_name):
+    # a file rather than a directory, so nothing can be written in it
+    (tmp_path / 'not-dir').write_bytes(b'')
+    snapshot_cache = SnapshotCache(str(tmp_path / 'not-dir' / 'cache'))
+
+    for _ in range(2):
+        _validate_same_employee_list(snapshot_cache.get_employee_list(temp_file_name),
+                                     get_employee_table_list('test/employees-test.json'))
+
+
+def test_snapshot_cache_snapshot_evicted_by_another_process(snapshot_cache, temp_file_name, monkeypatch):
+    snapshot_cache.get_employee_list(temp_file_name)
+    os.utime(RESOURCES_DIR + temp_file_name, ns=(0, 0))
+
+    def remove_then_utime(path, *args, **kwargs):
+        os.remove(path)
+        return utime(path, *args, **kwargs)
+
+    utime = os.utime
+    monkeypatch.setattr('src.service.snapshot_cache.os.utime', remove_then_utime)
+    assert len(snapshot_cache.get_employee_list(temp_file_name)) == 5
+
+
+def _validate_same_employee_list(employee_list, other_list):
+    assert len(employee_list) == len(other_list)
+    for employee, other in zip(employee_list, other_list):
+        assert employee.get_eid() == other.get_eid()
+        assert employee.get_first_name() == other.get_first_name()
+        assert employee.get_salary() == other.get_salary()
+        assert employee.get_class_name() == other.get_class_name()
+        assert [m.get_eid() for m in employee.get_member_list()] == [m.get_eid() for m in other.get_member_list()]
@@ -1,4 +1,12 @@
+import json
+import os
+from json import JSONDecodeError
+
+import pytest
+
 from src.conf.employee_definition import EmployeeJson
+from src.utils import (CHUNK_SIZE, RESOURCES_DIR, _iter_json_array, get_json_list_by_file, iter_json_list_by_file,
+                       loads_json)
 
 
 def get_employee_json(a_id, a_first_name, a_manager, a_salary):
@@ -12,3 +20,204 @@ def get_employee_json(a_id, a_first_name, a_manager, a_salary):
     :return:
     """
     return EmployeeJson(id=a_id, first_name=a_first_name, manager=a_manager, salary=a_salary)
+
+
+def test_iter_json_list_by_file_same_as_json_load():
+    for file_name in ('employees1.json', 'employees2.json', '/test/employees-test.json'):
+        expected = json.load(open(RESOURCES_DIR + file_name))
+        for chunk_size in (1, 7, CHUNK_SIZE):
+            assert list(iter_json_list_by_file(file_name, chunk_size=chunk_size)) == expected
+
+
+def test_iter_json_list_by_file_with_json_lines():
+    expected = json.load(open(RESOURCES_DIR + '/test/employees-test.json'))
+    assert list(iter_json_list_by_file('/test/employees-test.jsonl')) == expected
+
+
+def test_iter_json_list_by_file_from_empty_array():
+    assert list(iter_json_list_by_file('/test/employees-empty-array.json', chunk_size=1)) == []
+
+
+def test_iter_json_list_by_file_with_wrong_format():
+    with pytest.raises(JSONDecodeError):
+        list(iter_json_list_by_file('/test/employees-empty.json'))
+
+    with pytest.raises(FileNotFoundError):
+        list(iter_json_list_by_file('/test/no_file.json'))
+
+
+def test_get_json_list_by_file_same_as_json_load():
+    for file_name in ('employees1.json', 'employees2.json', '/test/employees-test-delta.json'):
+        with open(RESOURCES_DIR + file_name) as file:
+            assert get_json_list_by_file(file_name) == json.load(file)
+
+    with pytest.raises(FileNotFoundError):
+        get_json_list_by_file('/test/no_file.json')
+
+
+@pytest.mark.parametrize('data', [b'', b'[1,]', b'[1]\r\n[2]', b'\xef\xbb\xbf[1]', b'{"id": 1 "first_name": "Joy"}'])
+def test_loads_json_raises_same_error_as_json_load(data, tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_bytes(data)
+    with pytest.raises(JSONDecodeError) as expected, open(path, encoding='utf-8') as file:
+        json.load(file)
+
+    with pytest.raises(JSONDecodeError) as actual:
+        loads_json(data)
+
+    assert (actual.value.msg, actual.value.pos, actual.value.lineno) == \
+           (expected.value.msg, expected.value.pos, expected.value.lineno)
+
+
+def test_loads_json_same_as_json_loads():
+    for data in (b'[NaN, 1.5, -0]', b'[12345678901234567890123]', b'{"a": 1, "a": "\\u00e9"}', b'[]'):
+        assert loads_json(data) == json.loads(data.decode('utf-8'))
+    assert type(loads_json(b'[12345678901234567890123]')[0]) is int
+
+
+def test_json_list_by_file_with_mmap():
+    for file_name in ('employees1.json', '/test/employees-test.json'):
+        expected = get_json_list_by_file(file_name, use_mmap=False)
+        assert get_json_list_by_file(file_name, use_mmap=True) == expected
+        for chunk_size in (1, 7, CHUNK_SIZE):
+            assert list(iter_json_list_by_file(file_name, chunk_size=chunk_size, use_mmap=True)) == expected
+
+    assert list(iter_json_list_by_file('/test/employees-test.jsonl', use_mmap=True)) == \
+           get_json_list_by_file('/test/employees-test.json')
+
+
+def test_json_list_by_file_with_mmap_and_multibyte_characters(tmp_path):
+    path = tmp_path / 'names.json'
+    path.write_text(json.dumps([{'name': 'Zoë'}, {'name': '陳'}], ensure_ascii=False), encoding='utf-8')
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+
+    assert get_json_list_by_file(file_name, use_mmap=True) == [{'name': 'Zoë'}, {'name': '陳'}]
+    assert list(iter_json_list_by_file(file_name, chunk_size=1, use_mmap=True)) == [{'name': 'Zoë'}, {'name': '陳'}]
+
+
+def test_json_list_by_file_with_mmap_and_wrong_format(tmp_path):
+    path = tmp_path / 'cut.json'
+    path.write_bytes(b'[{"id": 1}, {"id"')
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+    with pytest.raises(JSONDecodeError, match="Expecting ':' delimiter"):
+        get_json_list_by_file(file_name, use_mmap=True)
+
+    with pytest.raises(JSONDecodeError):
+        list(iter_json_list_by_file(file_name, use_mmap=True))
+
+    with pytest.raises(JSONDecodeError):
+        get_json_list_by_file('/test/employees-empty.json', use_mmap=True)
+
+    with pytest.raises(JSONDecodeError):
+        list(iter_json_list_by_file('/test/employees-empty.json', use_mmap=True))
+
+    with pytest.raises(FileNotFoundError):
+        list(iter_json_list_by_file('/test/no_file.json', use_mmap=True))
+
+
+@pytest.mark.parametrize('data', [
+    '[\n  {"id": 1, "first_name": "Joy"},\n  {"id": 2, "first_name": "Max"},\n  {"id": 3 "first_name": "Ann"}\n]',
+    '[\n  {"id": 1},\n  {"id": 2},\n  {"id": 3}\n  {"id": 4}\n]',
+    '[{"id": 1}, {"id": 2}, NaN, {"id": 3}, {"id": 4} x]',
+    '[{"id": 1},\n {"id": "\\ud800 }"},\n {"id": 2},]',
+    '\n\n  [{"id": 1}, {"id": 2}] [',
+    '[{"id": 1}, {"id": 2}',
+])
+def test_iter_json_list_by_file_raises_same_error_as_json_load(data, tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text(data, encoding='utf-8')
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+    with pytest.raises(JSONDecodeError) as expected, open(path, encoding='utf-8') as file:
+        json.load(file)
+
+    for chunk_size in (1, 7, CHUNK_SIZE):
+        for use_mmap in (False, True):
+            with pytest.raises(JSONDecodeError) as actual:
+                list(iter_json_list_by_file(file_name, chunk_size=chunk_size, use_mmap=use_mmap))
+
+            assert str(actual.value) == str(expected.value)
+            assert (actual.value.pos, actual.value.lineno, actual.value.colno) == \
+                   (expected.value.pos, expected.value.lineno, expected.value.colno)
+
+
+def test_iter_json_list_by_file_raises_error_at_line_of_json_lines(tmp_path):
+    path = tmp_path / 'data.jsonl'
+    path.write_text('{"id": 1}\n\n{"id": 2}\n{"id": 3,}\n', encoding='utf-8')
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+
+    for use_mmap in (False, True):
+        with pytest.raises(JSONDecodeError, match='line 4 column 10 \\(char 30\\)'):
+            list(iter_json_list_by_file(file_name, use_mmap=use_mmap))
+
+
+@pytest.mark.parametrize('newline', ['\r\n', '\r', '\n'])
+def test_iter_json_list_by_file_with_universal_newlines_of_json_lines(newline, tmp_path):
+    path = tmp_path / 'data.jsonl'
+    # written as bytes, so the newlines aren't translated
+    path.write_bytes(newline.join(['{"id": 1}', '', '{"id": 2,', '"name": "Zoë"}', '{"id": 3,}', '']).encode('utf-8'))
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+
+    with pytest.raises(JSONDecodeError) as expected:
+        list(iter_json_list_by_file(file_name, use_mmap=False))
+    with pytest.raises(JSONDecodeError) as actual:
+        list(iter_json_list_by_file(file_name, use_mmap=True))
+    assert (actual.value.msg, actual.value.pos, actual.value.lineno, actual.value.colno) == \
+           (expected.value.msg, expected.value.pos, expected.value.lineno, expected.value.colno)
+
+    path.write_bytes(newline.join(['{"id": 1}', '', '{"id": 2, "name": "Zoë"}', '{"id": 3}\r\n']).encode('utf-8'))
+    assert list(iter_json_list_by_file(file_name, use_mmap=True)) == \
+           list(iter_json_list_by_file(file_name, use_mmap=False)) == [{'id': 1}, {'id': 2, 'name': 'Zoë'}, {'id': 3}]
+
+
+def test_iter_json_list_by_file_same_as_json_loads_without_batches(tmp_path):
+    # the batches fail to parse, e.g. cut inside a string or elements which aren't objects, the elements are decoded
+    # one by one, and the batches are parsed again after them
+    data = [{'name': 'a } b'}, 1, [2], {'name': '}'}, 'x'] + [{'id': eid} for eid in range(100)]
+    path = tmp_path / 'data.json'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    file_name = os.path.relpath(path, RESOURCES_DIR)
+
+    for chunk_size in (1, 7, 64, CHUNK_SIZE):
+        assert list(iter_json_list_by_file(file_name, chunk_size=chunk_size)) == data
+
+
+@pytest.mark.parametrize('backend', ['orjson', 'json'])
+def test_iter_json_list_by_file_same_as_json_loads_by_backend(backend, tmp_path, monkeypatch):
+    if backend == 'json':
+        monkeypatch.setattr('src.utils.orjson', None)
+    # only `json` keeps an integer out of 64 bits as int, and accepts NaN or a lone surrogate
+    record_list = [{'id': 1, 'salary': 12345678901234567890123}, {'id': 2, 'salary': float('nan')},
+                   {'id': 3, 'first_name': '\ud800'}] + [{'id': eid, 'first_name': 'Zoë'} for eid in range(4, 100)]
+    data = json.dumps(record_list)
+    lines_data = ''.join(json.dumps(record) + '\n' for record in record_list)
+
+    for name, text in (('data.json', data), ('data.jsonl', lines_data)):
+        path = tmp_path / name
+        path.write_text(text, encoding='utf-8', errors='surrogatepass')
+        file_name = os.path.relpath(path, RESOURCES_DIR)
+        for use_mmap in (False, True):
+            actual = list(iter_json_list_by_file(file_name, chunk_size=64, use_mmap=use_mmap))
+            assert json.dumps(actual) == data
+            assert type(actual[0]['salary']) is int
+
+
+@pytest.mark.parametrize('data', ['[1.5]', '[12, 3.25, -7e2, 1E+3, 0.5e-1]', '[{"id": 1}, -0.0, "1.", true, null]',
+                                  '[1.]', '[-]', '[1e]', '[12 3]'])
+def test_iter_json_array_cut_at_every_position(data):
+    try:
+        expected = json.loads(data)
+    except JSONDecodeError as err:
+        expected = (err.msg, err.pos)
+
+    for cut in range(len(data) + 1):
+        # an empty chunk is the end of the file
+        chunk_list = [chunk for chunk in (data[:cut], data[cut:]) if chunk]
+
+        def read(size):
+            return chunk_list.pop(0) if chunk_list else ''
+
+        try:
+            actual = list(_iter_json_array(read, 1))
+        except JSONDecodeError as err:
+            actual = (err.msg, err.pos)
+        assert actual == expected, cut